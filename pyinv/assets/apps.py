@@ -1,6 +1,41 @@
+from typing import Any
+
 from django.apps import AppConfig
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.signals import post_migrate
+
+
+def sync_database_objects(sender: AppConfig, using: str, **kwargs: Any) -> None:
+    """
+    Recreate the indexes and triggers that Django does not know about, after migrating.
+
+    SQLite rebuilds a table to alter it, which drops any index or trigger
+    that is not declared on the model. They are only created once the
+    migration that adds them has been applied, so that unapplying it
+    removes them.
+    """
+    from assets.models import Asset, Node
+    from assets.models.asset_extra_data import sync_extra_data_indexes
+    from assets.models.change_log import (
+        get_logged_tables,
+        restore_change_log_triggers,
+    )
+    from assets.models.search import sync_search_indexes
+
+    connection = connections[using]
+    applied = MigrationRecorder(connection).applied_migrations()
+    if ('assets', '0017_add_asset_extra_data_indexes') in applied:
+        sync_extra_data_indexes(connection, Asset._meta.db_table)
+    if ('assets', '0018_add_search_documents') in applied:
+        sync_search_indexes(connection, [Asset._meta.db_table, Node._meta.db_table])
+    if ('assets', '0019_add_change_log') in applied:
+        restore_change_log_triggers(connection, get_logged_tables())
 
 
 class AssetsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'assets'
+
+    def ready(self) -> None:
+        post_migrate.connect(sync_database_objects, sender=self)
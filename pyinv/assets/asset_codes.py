@@ -1,10 +1,11 @@
 from abc import ABC, abstractmethod
 from enum import Enum
+from functools import lru_cache
 from random import choice
 from re import compile
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
-from damm32 import BadCharacterException, Damm32
+from damm32 import Damm32
 from django.conf import settings
 from django.core.exceptions import ValidationError
 
@@ -24,6 +25,32 @@ class AssetCodeStrategy(ABC):
         """
         return None  # pragma: nocover
 
+    def normalise(self, asset_code: str) -> str:
+        """
+        Normalise an asset code to the form in which it is usually stored.
+        :param asset_code: Asset Code to normalise.
+        """
+        return asset_code.strip()
+
+    def get_corrections(self, asset_code: str) -> Set[str]:
+        """
+        Find the valid asset codes that an invalid one may have been mistyped from.
+        :param asset_code: Asset Code to correct.
+        :returns: Normalised codes that differ by one character, or by two swapped neighbouring characters.
+        """
+        return set()
+
+    @staticmethod
+    def _get_single_edits(word: str, alphabet: Sequence[str]) -> Iterator[str]:
+        """Every word with one character substituted, or two neighbouring characters swapped."""
+        for i, char in enumerate(word):
+            for replacement in alphabet:
+                if replacement != char:
+                    yield word[:i] + replacement + word[i + 1:]
+        for i in range(len(word) - 1):
+            if word[i] != word[i + 1]:
+                yield word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
     @abstractmethod
     def validate(self, asset_code: str) -> None:
         """
@@ -54,22 +81,125 @@ class Damm32AssetCodeStrategy(AssetCodeStrategy):
 
     ASSET_CODE_REGEX = compile(r"^([A-Za-z0-9]{3})-([A-Za-z0-9]{3})-([A-Za-z0-9]{3})$")
 
+    # There are five random characters after the prefix, from an alphabet of 32.
+    KEYSPACE_BITS = 25
+    KEYSPACE_SIZE = 2 ** KEYSPACE_BITS
+
     def __init__(self) -> None:
-        self._d32 = Damm32()
-        self._alphabet = self._d32._alphabet
-        self._default_prefix = settings.DAMM32_ASSET_CODE_DEFAULT_PREFIX
-        self._allowed_prefixes = settings.DAMM32_ASSET_CODE_PREFIXES
+        d32 = Damm32()
+        self._alphabet: List[str] = d32._alphabet
+        self._digits = {char: digit for digit, char in enumerate(self._alphabet)}
+        self._digits.update({char.lower(): digit for char, digit in self._digits.items()})
+
+        # The next check digit for every pair of check digit and digit, so
+        # that checking a code is one lookup per character.
+        self._check_table = [
+            [self._next_check_digit(d32, check_digit, digit) for digit in range(d32.BASE_SIZE)]
+            for check_digit in range(d32.BASE_SIZE)
+        ]
+
+    @staticmethod
+    def _next_check_digit(d32: Damm32, check_digit: int, digit: int) -> int:
+        check_digit = (check_digit ^ digit) << 1
+        return check_digit ^ d32.BIT_MASK if check_digit >= d32.BASE_SIZE else check_digit
+
+    @property
+    def default_prefix(self) -> str:
+        return str(settings.DAMM32_ASSET_CODE_DEFAULT_PREFIX)
+
+    @property
+    def allowed_prefixes(self) -> List[str]:
+        return list(settings.DAMM32_ASSET_CODE_PREFIXES)
 
     def generate_new_code(self) -> Optional[str]:
         """
         Generate a new asset code.
         :returns: New, unused asset code or None if could not generate
         """
-        code = self._default_prefix + "".join(choice(self._alphabet) for _ in range(5))
-        code += self._d32.calculate(code)
+        return self.generate_code_with_prefix(self.default_prefix)
 
+    def generate_code_with_prefix(self, prefix: str) -> str:
+        """
+        Generate a new asset code with the given prefix.
+        :param prefix: Three character prefix of the code.
+        """
+        return self._format_code(prefix + "".join(choice(self._alphabet) for _ in range(5)))
+
+    def generate_code_at_index(self, prefix: str, index: int) -> str:
+        """
+        Generate the asset code at a position in a fixed shuffle of the codes with a prefix.
+
+        Every index below KEYSPACE_SIZE gives a different code, so walking a
+        counter through the indexes never generates the same code twice.
+        :param prefix: Three character prefix of the code.
+        :param index: Position of the code in the shuffle.
+        """
+        if not 0 <= index < self.KEYSPACE_SIZE:
+            raise ValueError(f"Asset code index out of range: {index}")
+
+        # Multiplying by an odd number and xor-ing with a right shift can
+        # each be undone, so together they map the indexes onto themselves.
+        mask = self.KEYSPACE_SIZE - 1
+        index ^= 0x15A4E35
+        index = (index * 0x1B873593) & mask
+        index ^= index >> 13
+        index = (index * 0x0CC9E2D51) & mask
+        index ^= index >> 11
+
+        body = ""
+        for _ in range(5):
+            index, position = divmod(index, len(self._alphabet))
+            body += self._alphabet[position]
+        return self._format_code(prefix + body)
+
+    def _format_code(self, code: str) -> str:
+        return self._group(code + self._alphabet[self._check_digit(code)])
+
+    @staticmethod
+    def _group(code: str) -> str:
         return f"{code[:3]}-{code[3:6]}-{code[6:9]}"
 
+    def _check_digit(self, code: str) -> int:
+        """
+        Calculate the Damm check digit of a code, which is zero if it ends in a valid check digit.
+        :raises KeyError: The code contains a character outside of the alphabet.
+        """
+        check_digit = 0
+        for char in code:
+            check_digit = self._check_table[check_digit][self._digits[char]]
+        return check_digit
+
+    def normalise(self, asset_code: str) -> str:
+        """
+        Normalise an asset code to upper case, with dashes between the groups of characters.
+        :param asset_code: Asset Code to normalise.
+        """
+        asset_code = asset_code.strip().upper()
+        if len(asset_code) == 9 and asset_code.isalnum():
+            return self._group(asset_code)
+        return asset_code
+
+    def get_corrections(self, asset_code: str) -> Set[str]:
+        """
+        Find the valid asset codes that an invalid one may have been mistyped from.
+
+        The Damm check digit catches every single substitution and swap of
+        neighbours, so a valid code has no corrections.
+        :param asset_code: Asset Code to correct.
+        :returns: Normalised codes that differ by one character, or by two swapped neighbouring characters.
+        """
+        match = self.ASSET_CODE_REGEX.match(self.normalise(asset_code))
+        if not match:
+            return set()
+
+        return {
+            self._group(candidate)
+            for candidate in self._get_single_edits("".join(match.groups()), self._alphabet)
+            if candidate[:3] in settings.DAMM32_ASSET_CODE_PREFIXES
+            and all(char in self._digits for char in candidate)
+            and not self._check_digit(candidate)
+        }
+
     def validate(self, asset_code: str) -> None:
         """
         Validate an asset code.
@@ -81,18 +211,18 @@ class Damm32AssetCodeStrategy(AssetCodeStrategy):
         if match:
             e = "".join(match.groups())
             try:
-                if not self._d32.verify(e.upper()):
+                if self._check_digit(e):
                     raise ValidationError(
-                        f"Invalid asset code check digit. {self._d32.calculate(e[:8])}"
+                        f"Invalid asset code check digit. {self._alphabet[self._check_digit(e[:8])]}"
                     )
-            except BadCharacterException:
-                bad_chars = ", ".join({c for c in e if c not in self._alphabet})
+            except KeyError:
+                bad_chars = ", ".join({c for c in e if c not in self._digits})
                 raise ValidationError(
                     f"Invalid characters in code: {bad_chars}",
                 )
 
             # Check that the prefix is allowed by the settings
-            if e[:3] not in self._allowed_prefixes:
+            if e[:3] not in settings.DAMM32_ASSET_CODE_PREFIXES:
                 raise ValidationError(f"Invalid asset code prefix: {e[:3]}")
         else:
             raise ValidationError(f"Invalid asset code format: {asset_code}")
@@ -115,6 +245,10 @@ class StudentRoboticsAssetCodeStrategy(AssetCodeStrategy):
         "G", "H", "J", "K", "L", "M", "N", "P", "Q", "R", "T", "U", "V", "W", "X", "Y",
     ]
     ALPHABET_SET = set(ALPHABET)
+    ALPHABET_INDEX = {char: value for value, char in enumerate(ALPHABET)}
+
+    # The sum of the digits of each value when doubled, in base 32.
+    DOUBLED_DIGIT_SUMS = [sum(divmod(value * 2, 32)) for value in range(32)]
 
     def normalise(self, asset_code: str) -> str:
         asset_code = asset_code.strip().upper()
@@ -123,11 +257,29 @@ class StudentRoboticsAssetCodeStrategy(AssetCodeStrategy):
         else:
             return asset_code
 
+    def get_corrections(self, asset_code: str) -> Set[str]:
+        """
+        Find the valid asset codes that an invalid one may have been mistyped from.
+        :param asset_code: Asset Code to correct.
+        :returns: Normalised codes that differ by one character, or by two swapped neighbouring characters.
+        """
+        asset_code = self.normalise(asset_code)
+        if self.luhn_is_valid(asset_code):
+            return set()
+
+        return {
+            candidate
+            for candidate in self._get_single_edits(asset_code, self.ALPHABET)
+            if self.luhn_is_valid(candidate)
+        }
+
+    def luhn_is_valid(self, asset_code: str) -> bool:
+        return bool(asset_code) and self.ALPHABET_SET.issuperset(asset_code) and self.luhn(asset_code) == 0
+
     def luhn(self, asset_code: str) -> int:
-        base = len(self.ALPHABET)
-        as_vals = [self.ALPHABET.index(c) for c in reversed(asset_code)]
-        total = sum(as_vals[::2]) + sum(sum(divmod(i * 2, base)) for i in as_vals[1::2])
-        return total % base
+        as_vals = [self.ALPHABET_INDEX[c] for c in reversed(asset_code)]
+        total = sum(as_vals[::2]) + sum(self.DOUBLED_DIGIT_SUMS[i] for i in as_vals[1::2])
+        return total % len(self.ALPHABET)
 
     def validate(self, asset_code: str) -> None:
         """
@@ -154,8 +306,14 @@ class AssetCodeType(str, Enum):
     SROBO = "S"
 
     @classmethod
+    @lru_cache(maxsize=None)
     def strategy_mapping(cls) -> Dict['AssetCodeType', AssetCodeStrategy]:
-        """Mapping of code types to strategies."""
+        """
+        Mapping of code types to strategies.
+
+        The strategies are built once and shared, as building their lookup
+        tables is much slower than using them.
+        """
         return {
             AssetCodeType.ARBITRARY: ArbitraryStringAssetCodeStrategy(),
             AssetCodeType.DAMM32: Damm32AssetCodeStrategy(),
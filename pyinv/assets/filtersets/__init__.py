@@ -3,5 +3,13 @@ from .asset_event import AssetEventFilterSet
 from .asset_model import AssetModelFilterSet
 from .changeset import ChangeSetFilterSet
 from .node import NodeFilterSet
+from .search import SearchDocumentFilter
 
-__all__ = ['AssetFilterSet', 'AssetEventFilterSet', 'AssetModelFilterSet', 'ChangeSetFilterSet', 'NodeFilterSet']
+__all__ = [
+    'AssetFilterSet',
+    'AssetEventFilterSet',
+    'AssetModelFilterSet',
+    'ChangeSetFilterSet',
+    'NodeFilterSet',
+    'SearchDocumentFilter',
+]
@@ -2,10 +2,23 @@ import django_filters
 from django.core.exceptions import ValidationError
 from django.db.models import QuerySet
 
-from assets.models import Asset, AssetModel
+from assets.models import Asset, AssetCode, AssetModel
+from assets.models.asset_extra_data import (
+    EXTRA_DATA_KEY_RE,
+    filter_by_extra_data,
+)
 
 
 class AssetFilterSet(django_filters.FilterSet):
+    """
+    Filter assets.
+
+    Any key of the extra data can be filtered by its value, for example
+    ``extra_data__serial=XYZ``, or ``extra_data__power__voltage=12`` for a
+    nested key. Giving the parameter more than once matches any of the values.
+    """
+
+    EXTRA_DATA_PREFIX = 'extra_data__'
 
     asset_code = django_filters.CharFilter(label="Asset Code", method='filter_asset_code')
     has_node = django_filters.BooleanFilter(
@@ -23,15 +36,32 @@ class AssetFilterSet(django_filters.FilterSet):
     is_container = django_filters.BooleanFilter(field_name='asset_model__is_container', label="Is Container")
     created_at = django_filters.DateTimeFromToRangeFilter()
     updated_at = django_filters.DateTimeFromToRangeFilter()
+    extra_data__has_key = django_filters.CharFilter(
+        field_name='extra_data',
+        lookup_expr='has_key',
+        label="Has Extra Data Key",
+    )
 
     def filter_asset_code(self, queryset: QuerySet[AssetModel], name: str, value: str) -> QuerySet[AssetModel]:
-        qs = queryset.filter(assetcode__code=value)
+        asset_codes = AssetCode.objects.filter(normalised_code__in=AssetCode.get_lookup_keys(value))
+        qs = queryset.filter(id__in=asset_codes.values('asset_id'))
         try:
             qs = qs | queryset.filter(id=value)
         except ValidationError:
             pass
         return qs
 
+    def filter_queryset(self, queryset: QuerySet[Asset]) -> QuerySet[Asset]:
+        queryset = super().filter_queryset(queryset)
+        for name in self.data:
+            if not name.startswith(self.EXTRA_DATA_PREFIX) or name in self.filters:
+                continue
+            keys = name[len(self.EXTRA_DATA_PREFIX):].split('__')
+            # Like any other unknown parameter, one that cannot be a key is ignored.
+            if all(EXTRA_DATA_KEY_RE.match(key) for key in keys):
+                queryset = filter_by_extra_data(queryset, keys, self.data.getlist(name))
+        return queryset
+
     class Meta:
         model = Asset
         fields = [
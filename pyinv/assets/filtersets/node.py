@@ -1,6 +1,8 @@
+from typing import List
+from uuid import UUID
+
 import django_filters
-from django.core.exceptions import ValidationError
-from django.db.models import QuerySet
+from django.db.models import Q, QuerySet
 
 from assets.models import Node
 
@@ -9,34 +11,29 @@ class NodeFilterSet(django_filters.FilterSet):
 
     parent = django_filters.CharFilter(label="Parent", method='filter_parent')
     descendent_of = django_filters.CharFilter(label="Descendent of", method='filter_descendent_of')
-    is_container = django_filters.BooleanFilter(method='filter_is_container', label="Is Container")
+    is_container = django_filters.BooleanFilter(label="Is Container")
+    location = django_filters.CharFilter(label="Location", field_name='location_path', lookup_expr='icontains')
+
+    def _get_nodes(self, value: str) -> List[Node]:
+        """Get the nodes from a comma separated list of IDs, ignoring any that are invalid."""
+        ids = []
+        for node_id in value.split(","):
+            try:
+                ids.append(UUID(node_id.strip()))
+            except ValueError:
+                pass
+        return list(Node.objects.filter(pk__in=ids).only('path', 'depth'))
 
     def filter_parent(self, queryset: QuerySet[Node], name: str, value: str) -> QuerySet[Node]:
-        if value == "root":
-            return queryset & Node.get_root_nodes()
-        try:
-            parent = Node.objects.get(pk=value)
-            return queryset & parent.get_children()
-        except (Node.DoesNotExist, ValidationError):
-            return Node.objects.none()
+        selected = Node.get_descendants_filter(self._get_nodes(value), children_only=True)
+        if "root" in value.split(","):
+            selected |= Q(depth=1)
+        return queryset.filter(selected)
 
     def filter_descendent_of(self, queryset: QuerySet[Node], name: str, value: str) -> QuerySet[Node]:
-        if value == "root":
+        if "root" in value.split(","):
             return queryset  # All nodes are a child of the root
-        try:
-            parent = Node.objects.get(pk=value)
-            return queryset & parent.get_descendants()
-        except (Node.DoesNotExist, ValidationError):
-            return Node.objects.none()
-
-    def filter_is_container(self, queryset: QuerySet[Node], name: str, value: bool) -> QuerySet[Node]:
-        if value:
-            return (
-                queryset.filter(node_type="A", asset__asset_model__is_container=True)
-                | queryset.filter(node_type="L")
-            )
-        else:
-            return queryset.filter(node_type="A", asset__asset_model__is_container=False)
+        return queryset.filter(Node.get_descendants_filter(self._get_nodes(value)))
 
     class Meta:
         model = Node
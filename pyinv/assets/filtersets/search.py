@@ -0,0 +1,24 @@
+from typing import Any
+
+from django.db.models import QuerySet
+from rest_framework import filters
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from assets.models.search import search
+
+
+class SearchDocumentFilter(filters.SearchFilter):
+    """
+    Search the stored search documents of a model, best matches first.
+
+    Rather than matching each term against the fields of several joined
+    tables, each term must be found in the search document of a row, which
+    is indexed. A given ordering replaces the ranking.
+    """
+
+    def filter_queryset(self, request: Request, queryset: QuerySet[Any], view: APIView) -> QuerySet[Any]:
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return search(queryset, terms)
@@ -0,0 +1,44 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from assets.models import AssetCodePrefix, AssetCodeReservation
+
+
+class Command(BaseCommand):
+
+    help = 'Generate asset codes ahead of time, for assets and labels to claim'  # noqa: A003
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--size',
+            type=int,
+            default=1000,
+            help='The number of available codes to keep in the pool for each prefix.',
+        )
+        parser.add_argument(
+            '--prefix',
+            action='append',
+            choices=settings.DAMM32_ASSET_CODE_PREFIXES,
+            help='Only fill the pool for this prefix. May be given more than once.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for prefix in options['prefix'] or settings.DAMM32_ASSET_CODE_PREFIXES:
+            try:
+                added = AssetCodeReservation.fill(prefix, options['size'])
+            except ValueError as e:
+                raise CommandError(f"Unable to fill the pool for {prefix}: {e}")
+            self.stdout.write(f"Added {added} codes to the pool for {prefix}")
+
+        for keyspace in AssetCodePrefix.get_occupancy():
+            if keyspace["nearly_full"]:
+                self.stdout.write(self.style.WARNING(
+                    f"{keyspace['prefix']} has {keyspace['remaining']} of {keyspace['capacity']} codes remaining",
+                ))
+        self.stdout.write(self.style.SUCCESS("Filled asset code pool"))
@@ -0,0 +1,46 @@
+from typing import Any
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from assets.models import NodeAssetCount
+
+
+class Command(BaseCommand):
+
+    help = 'Rebuild the number of assets below each node from a full recount'  # noqa: A003
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Compare the stored counts with a full recount without changing them.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        incorrect = self._count_incorrect()
+        self.stdout.write(f"Found {incorrect} incorrect asset counts")
+
+        if options['check']:
+            if incorrect:
+                raise CommandError("Asset counts do not match a full recount.")
+            return
+
+        NodeAssetCount.rebuild()
+        if self._count_incorrect():
+            raise CommandError("Asset counts do not match a full recount after rebuilding.")  # pragma: nocover
+        self.stdout.write(self.style.SUCCESS("Rebuilt asset counts"))
+
+    def _count_incorrect(self) -> int:
+        expected = NodeAssetCount.recount()
+        actual = {
+            (row.node_id, row.asset_model_id): row.count
+            for row in NodeAssetCount.objects.all()
+        }
+        return sum(
+            expected.get(key, 0) != actual.get(key, 0)
+            for key in expected.keys() | actual.keys()
+        )
@@ -0,0 +1,43 @@
+from typing import Any
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from assets.models import NodeClosure
+
+
+class Command(BaseCommand):
+
+    help = 'Rebuild the closure table of the asset tree from the node paths'  # noqa: A003
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Compare the stored links with the node paths without changing them.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        incorrect = self._count_incorrect()
+        self.stdout.write(f"Found {incorrect} incorrect tree links")
+
+        if options['check']:
+            if incorrect:
+                raise CommandError("Tree links do not match the node paths.")
+            return
+
+        NodeClosure.rebuild()
+        if self._count_incorrect():
+            raise CommandError("Tree links do not match the node paths after rebuilding.")  # pragma: nocover
+        self.stdout.write(self.style.SUCCESS("Rebuilt tree links"))
+
+    def _count_incorrect(self) -> int:
+        expected = NodeClosure.get_expected_links()
+        actual = {
+            (link.ancestor_id, link.descendant_id, link.distance)
+            for link in NodeClosure.objects.all()
+        }
+        return len(expected ^ actual)
@@ -0,0 +1,18 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from assets.models import Asset, Node
+from assets.models.search import refresh_search_documents, sync_search_indexes
+
+
+class Command(BaseCommand):
+
+    help = 'Rebuild the search documents of assets and nodes, and their indexes'  # noqa: A003
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        with transaction.atomic():
+            refresh_search_documents(assets=Asset.objects.all(), nodes=Node.objects.all())
+            sync_search_indexes(connection, [Asset._meta.db_table, Node._meta.db_table], rebuild=True)
+        self.stdout.write(self.style.SUCCESS("Rebuilt search documents"))
@@ -0,0 +1,18 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from assets.models.change_log import (
+    get_logged_tables,
+    sync_change_log_triggers,
+)
+
+
+class Command(BaseCommand):
+
+    help = 'Create the triggers that log the changes to assets, nodes, asset models and manufacturers'  # noqa: A003
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        sync_change_log_triggers(connection, get_logged_tables())
+        self.stdout.write(self.style.SUCCESS("Change log triggers are up to date"))
@@ -0,0 +1,20 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from assets.models import Asset
+from assets.models.asset_extra_data import sync_extra_data_indexes
+
+
+class Command(BaseCommand):
+
+    help = 'Create the indexes of the extra data of assets for the configured keys'  # noqa: A003
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        created, dropped = sync_extra_data_indexes(connection, Asset._meta.db_table)
+        for name in dropped:
+            self.stdout.write(f"Dropped index {name}")
+        for name in created:
+            self.stdout.write(f"Created index {name}")
+        self.stdout.write(self.style.SUCCESS("Extra data indexes are up to date"))
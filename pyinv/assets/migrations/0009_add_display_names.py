@@ -0,0 +1,64 @@
+# Generated by Django 3.2.14 on 2026-10-16 22:31
+
+from collections import Counter
+from typing import Any
+
+from django.db import migrations, models
+
+
+def populate_display_names(apps: Any, schema_editor: Any) -> None:
+    AssetModel = apps.get_model('assets', 'AssetModel')
+    Asset = apps.get_model('assets', 'Asset')
+    Node = apps.get_model('assets', 'Node')
+
+    asset_models = list(AssetModel.objects.select_related('manufacturer'))
+    name_counts = Counter(asset_model.name for asset_model in asset_models)
+    for asset_model in asset_models:
+        if name_counts[asset_model.name] == 1:
+            asset_model.display_name = asset_model.name
+        else:
+            asset_model.display_name = f"{asset_model.manufacturer.name} {asset_model.name}"
+    AssetModel.objects.bulk_update(asset_models, ['display_name'])
+
+    display_names = {asset_model.pk: asset_model.display_name for asset_model in asset_models}
+    assets = list(Asset.objects.prefetch_related('assetcode_set'))
+    node_names = dict(Node.objects.filter(asset__isnull=False).values_list('asset_id', 'name'))
+    for asset in assets:
+        codes = sorted(asset.assetcode_set.all(), key=lambda code: code.pk)
+        first_asset_code = codes[0].code if codes else str(asset.pk)
+        asset.display_name = (
+            node_names.get(asset.pk) or f"{display_names[asset.asset_model_id]} ({first_asset_code})"
+        )
+    Asset.objects.bulk_update(assets, ['display_name'])
+
+    asset_names = {asset.pk: asset.display_name for asset in assets}
+    nodes = list(Node.objects.all())
+    for node in nodes:
+        node.display_name = asset_names[node.asset_id] if node.asset_id else node.name or ""
+    Node.objects.bulk_update(nodes, ['display_name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0008_cascade_deletion_of_asset_onto_code'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asset',
+            name='display_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='assetmodel',
+            name='display_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=61),
+        ),
+        migrations.AddField(
+            model_name='node',
+            name='display_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=100),
+        ),
+        migrations.RunPython(populate_display_names, migrations.RunPython.noop),
+    ]
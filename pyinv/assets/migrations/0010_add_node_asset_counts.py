@@ -0,0 +1,57 @@
+# Generated by Django 3.2.14 on 2026-10-16 22:37
+
+import uuid
+from collections import Counter
+from typing import Any
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+STEPLEN = 4
+
+
+def populate_node_asset_counts(apps: Any, schema_editor: Any) -> None:
+    Node = apps.get_model('assets', 'Node')
+    NodeAssetCount = apps.get_model('assets', 'NodeAssetCount')
+
+    node_ids = dict(Node.objects.values_list('path', 'pk'))
+    counts: Counter = Counter()
+    for path, asset_model_id in Node.objects.filter(asset__isnull=False).values_list('path', 'asset__asset_model_id'):
+        for depth in range(1, len(path) // STEPLEN):
+            counts[(node_ids[path[:depth * STEPLEN]], asset_model_id)] += 1
+
+    NodeAssetCount.objects.bulk_create(
+        [
+            NodeAssetCount(node_id=node_id, asset_model_id=asset_model_id, count=count)
+            for (node_id, asset_model_id), count in counts.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0009_add_display_names'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NodeAssetCount',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('asset_model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='assets.assetmodel')),
+                ('node', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='asset_counts',
+                    to='assets.node',
+                )),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='nodeassetcount',
+            constraint=models.UniqueConstraint(fields=('node', 'asset_model'), name='node_asset_count_unique'),
+        ),
+        migrations.RunPython(populate_node_asset_counts, migrations.RunPython.noop),
+    ]
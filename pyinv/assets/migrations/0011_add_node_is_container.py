@@ -0,0 +1,26 @@
+# Generated by Django 3.2.14 on 2026-10-16 22:39
+
+from typing import Any
+
+from django.db import migrations, models
+
+
+def populate_is_container(apps: Any, schema_editor: Any) -> None:
+    Node = apps.get_model('assets', 'Node')
+    Node.objects.filter(asset__asset_model__is_container=False).update(is_container=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0010_add_node_asset_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='node',
+            name='is_container',
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.RunPython(populate_is_container, migrations.RunPython.noop),
+    ]
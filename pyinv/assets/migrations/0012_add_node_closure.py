@@ -0,0 +1,65 @@
+# Generated by Django 3.2.14 on 2026-10-16 22:51
+
+import uuid
+from typing import Any
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+STEPLEN = 4
+
+
+def populate_node_closure(apps: Any, schema_editor: Any) -> None:
+    # The links are maintained whichever tree backend is used, so that it can be switched at any time.
+    Node = apps.get_model('assets', 'Node')
+    NodeClosure = apps.get_model('assets', 'NodeClosure')
+
+    node_ids = dict(Node.objects.values_list('path', 'pk'))
+    NodeClosure.objects.bulk_create(
+        [
+            NodeClosure(
+                ancestor_id=node_ids[path[:depth * STEPLEN]],
+                descendant_id=pk,
+                distance=len(path) // STEPLEN - depth,
+            )
+            for path, pk in node_ids.items()
+            for depth in range(1, len(path) // STEPLEN + 1)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0011_add_node_is_container'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NodeClosure',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('distance', models.PositiveIntegerField()),
+                ('ancestor', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='descendant_links',
+                    to='assets.node',
+                )),
+                ('descendant', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='ancestor_links',
+                    to='assets.node',
+                )),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='nodeclosure',
+            index=models.Index(fields=['ancestor', 'distance'], name='node_closure_ancestor_distance'),
+        ),
+        migrations.AddConstraint(
+            model_name='nodeclosure',
+            constraint=models.UniqueConstraint(fields=('ancestor', 'descendant'), name='node_closure_unique'),
+        ),
+        migrations.RunPython(populate_node_closure, migrations.RunPython.noop),
+    ]
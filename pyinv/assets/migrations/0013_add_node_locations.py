@@ -0,0 +1,45 @@
+# Generated by Django 3.2.14 on 2026-10-16 23:00
+
+from typing import Any, Dict, List, Tuple
+
+from django.db import migrations, models
+
+STEPLEN = 4
+SEPARATOR = " / "
+
+
+def populate_locations(apps: Any, schema_editor: Any) -> None:
+    Node = apps.get_model('assets', 'Node')
+
+    # Parents are always before their children when ordered by path.
+    child_locations: Dict[str, Tuple[str, List[str]]] = {}
+    nodes = []
+    for node in Node.objects.order_by('path').only('path', 'display_name'):
+        node.location_path, node.location_ids = child_locations.get(node.path[:-STEPLEN], ("", []))
+        child_locations[node.path] = (
+            f"{node.location_path}{SEPARATOR}{node.display_name}" if node.location_path else node.display_name,
+            node.location_ids + [str(node.pk)],
+        )
+        nodes.append(node)
+    Node.objects.bulk_update(nodes, ['location_path', 'location_ids'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0012_add_node_closure'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='node',
+            name='location_ids',
+            field=models.JSONField(default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='node',
+            name='location_path',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunPython(populate_locations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.14 on 2026-10-16 23:05
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0013_add_node_locations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetCodeReservation',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('code', models.CharField(max_length=30, unique=True)),
+                ('prefix', models.CharField(max_length=3)),
+                ('reserved_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='assetcodereservation',
+            index=models.Index(fields=['prefix', 'reserved_at'], name='asset_code_pool_prefix'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.14 on 2026-10-16 23:09
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0014_add_asset_code_reservations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetCodePrefix',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('prefix', models.CharField(max_length=3, unique=True)),
+                ('next_index', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
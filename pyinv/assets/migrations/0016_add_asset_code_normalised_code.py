@@ -0,0 +1,56 @@
+# Generated by Django 3.2.14 on 2026-10-16 23:30
+
+from typing import Any
+
+from django.db import migrations, models
+
+
+# A copy of the normalisation of each code type when this migration was written.
+def normalise_arbitrary(code: str) -> str:
+    return code.strip()
+
+
+def normalise_damm32(code: str) -> str:
+    code = code.strip().upper()
+    if len(code) == 9 and code.isalnum():
+        return f"{code[:3]}-{code[3:6]}-{code[6:9]}"
+    return code
+
+
+def normalise_srobo(code: str) -> str:
+    code = code.strip().upper()
+    return code[2:] if code.startswith('SR') else code
+
+
+NORMALISERS = {
+    'A': normalise_arbitrary,
+    'D': normalise_damm32,
+    'S': normalise_srobo,
+}
+
+
+def populate_normalised_codes(apps: Any, schema_editor: Any) -> None:
+    AssetCode = apps.get_model('assets', 'AssetCode')
+
+    asset_codes = []
+    for asset_code in AssetCode.objects.only('code', 'code_type'):
+        asset_code.normalised_code = NORMALISERS[asset_code.code_type](asset_code.code)
+        asset_codes.append(asset_code)
+    AssetCode.objects.bulk_update(asset_codes, ['normalised_code'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0015_add_asset_code_prefix'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assetcode',
+            name='normalised_code',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=30),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_normalised_codes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+from typing import Any
+
+from django.db import migrations
+
+
+def create_extra_data_indexes(apps: Any, schema_editor: Any) -> None:
+    # Other keys are indexed on SQLite as they are configured, after migrating.
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS "asset_extra_data_gin" ON "assets_asset" USING gin ("extra_data")',
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS "asset_extra_data_serial" '
+            'ON "assets_asset" (JSON_EXTRACT("extra_data", \'$."serial"\'))',
+        )
+
+
+def drop_extra_data_indexes(apps: Any, schema_editor: Any) -> None:
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS "asset_extra_data_gin"')
+    elif vendor == 'sqlite':
+        with schema_editor.connection.cursor() as cursor:
+            indexes = schema_editor.connection.introspection.get_constraints(cursor, 'assets_asset')
+        for name in indexes:
+            if name.startswith('asset_extra_data_'):
+                schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0016_add_asset_code_normalised_code'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_extra_data_indexes, drop_extra_data_indexes),
+    ]
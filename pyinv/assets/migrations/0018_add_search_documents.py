@@ -0,0 +1,108 @@
+from typing import Any, List, Optional
+
+from django.db import migrations, models
+
+TABLES = ['assets_asset', 'assets_node']
+
+
+def build_search_document(display_name: str, location_path: str, asset: Optional[Any]) -> str:
+    parts = [display_name, location_path]
+    if asset is not None:
+        asset_model = asset.asset_model
+        manufacturer = asset_model.manufacturer
+        parts += [asset_model.name, str(asset_model.slug or ""), manufacturer.name, str(manufacturer.slug or "")]
+        parts += sorted(asset_code.code for asset_code in asset.assetcode_set.all())
+    return "\n".join(part for part in parts if part).lower()
+
+
+def populate_search_documents(apps: Any, schema_editor: Any) -> None:
+    Asset = apps.get_model('assets', 'Asset')
+    Node = apps.get_model('assets', 'Node')
+
+    nodes = list(
+        Node.objects.select_related('asset__asset_model__manufacturer').prefetch_related('asset__assetcode_set'),
+    )
+    for node in nodes:
+        node.search_document = build_search_document(node.display_name, node.location_path, node.asset)
+    Node.objects.bulk_update(nodes, ['search_document'], batch_size=1000)
+
+    # An asset in the tree has the same document as its node.
+    node_documents = {node.asset_id: node.search_document for node in nodes if node.asset_id is not None}
+    assets = list(Asset.objects.select_related('asset_model__manufacturer').prefetch_related('assetcode_set'))
+    for asset in assets:
+        asset.search_document = node_documents.get(asset.pk) or build_search_document(asset.display_name, "", asset)
+    Asset.objects.bulk_update(assets, ['search_document'], batch_size=1000)
+
+
+def get_sqlite_search_index_sql(table: str) -> List[str]:
+    # Each row is given a rowid of its own, as the implicit rowids of the table can be renumbered.
+    def rowid(row: str) -> str:
+        return f'(SELECT rowid FROM "{table}_search_ids" WHERE "id" = {row}."id")'
+
+    return [
+        f'CREATE TABLE IF NOT EXISTS "{table}_search_ids" (rowid INTEGER PRIMARY KEY, "id" char(32) NOT NULL UNIQUE)',
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS "{table}_search" USING fts5('
+        f'"id" UNINDEXED, search_document, tokenize=\'trigram\')',
+        f'CREATE TRIGGER IF NOT EXISTS "{table}_search_insert" AFTER INSERT ON "{table}" BEGIN '
+        f'INSERT INTO "{table}_search_ids" ("id") VALUES (new."id"); '
+        f'INSERT INTO "{table}_search" (rowid, "id", search_document) '
+        f'VALUES ({rowid("new")}, new."id", new.search_document); END',
+        f'CREATE TRIGGER IF NOT EXISTS "{table}_search_delete" AFTER DELETE ON "{table}" BEGIN '
+        f'DELETE FROM "{table}_search" WHERE rowid = {rowid("old")}; '
+        f'DELETE FROM "{table}_search_ids" WHERE "id" = old."id"; END',
+        f'CREATE TRIGGER IF NOT EXISTS "{table}_search_update" AFTER UPDATE OF search_document ON "{table}" BEGIN '
+        f'UPDATE "{table}_search" SET search_document = new.search_document WHERE rowid = {rowid("new")}; END',
+        f'INSERT INTO "{table}_search_ids" ("id") SELECT "id" FROM "{table}"',
+        f'INSERT INTO "{table}_search" (rowid, "id", search_document) '
+        f'SELECT "{table}_search_ids".rowid, "{table}"."id", "{table}".search_document '
+        f'FROM "{table}" JOIN "{table}_search_ids" ON "{table}_search_ids"."id" = "{table}"."id"',
+    ]
+
+
+def create_search_indexes(apps: Any, schema_editor: Any) -> None:
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for table in TABLES:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS "{table}_search_trgm" '
+                f'ON "{table}" USING gin (search_document gin_trgm_ops)',
+            )
+    elif vendor == 'sqlite':
+        for table in TABLES:
+            for sql in get_sqlite_search_index_sql(table):
+                schema_editor.execute(sql)
+
+
+def drop_search_indexes(apps: Any, schema_editor: Any) -> None:
+    vendor = schema_editor.connection.vendor
+    for table in TABLES:
+        if vendor == 'postgresql':
+            schema_editor.execute(f'DROP INDEX IF EXISTS "{table}_search_trgm"')
+        elif vendor == 'sqlite':
+            for operation in ('insert', 'delete', 'update'):
+                schema_editor.execute(f'DROP TRIGGER IF EXISTS "{table}_search_{operation}"')
+            schema_editor.execute(f'DROP TABLE IF EXISTS "{table}_search"')
+            schema_editor.execute(f'DROP TABLE IF EXISTS "{table}_search_ids"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0017_add_asset_extra_data_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asset',
+            name='search_document',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='node',
+            name='search_document',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunPython(populate_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
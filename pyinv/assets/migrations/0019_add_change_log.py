@@ -0,0 +1,134 @@
+from typing import Any, Dict, List
+
+from django.db import migrations, models
+from django.utils import timezone
+
+LOGGED_MODELS = {
+    'Asset': 'asset',
+    'Node': 'node',
+    'AssetModel': 'asset-model',
+    'Manufacturer': 'manufacturer',
+}
+OPERATIONS = ['insert', 'update', 'delete']
+COLUMNS = '"transaction_id", "object_type", "object_id", "action", "timestamp"'
+
+
+def get_logged_tables(apps: Any) -> Dict[str, str]:
+    return {apps.get_model('assets', name)._meta.db_table: object_type for name, object_type in LOGGED_MODELS.items()}
+
+
+def get_postgresql_trigger_sql(table: str, object_type: str) -> List[str]:
+    insert, update, delete = (f'"{table}_change_{operation}"' for operation in OPERATIONS)
+    procedure = f"EXECUTE PROCEDURE assets_log_change('{object_type}')"
+    return [
+        f'CREATE TRIGGER {insert} AFTER INSERT ON "{table}" FOR EACH ROW {procedure}',
+        # Updates that write the same values, like a save without changes, are not logged.
+        f'CREATE TRIGGER {update} AFTER UPDATE ON "{table}" '
+        f'FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*) {procedure}',
+        f'CREATE TRIGGER {delete} AFTER DELETE ON "{table}" FOR EACH ROW {procedure}',
+    ]
+
+
+def get_sqlite_trigger_sql(table: str, object_type: str) -> List[str]:
+    def log(row: str, action: str) -> str:
+        return (
+            f'BEGIN INSERT INTO "assets_changelogentry" ({COLUMNS}) VALUES '
+            f"(0, '{object_type}', {row}.\"id\", '{action}', STRFTIME('%Y-%m-%d %H:%M:%f', 'now')); END"
+        )
+
+    insert, update, delete = (f'"{table}_change_{operation}"' for operation in OPERATIONS)
+    return [
+        f'CREATE TRIGGER {insert} AFTER INSERT ON "{table}" {log("new", "C")}',
+        f'CREATE TRIGGER {update} AFTER UPDATE ON "{table}" {log("new", "U")}',
+        f'CREATE TRIGGER {delete} AFTER DELETE ON "{table}" {log("old", "D")}',
+    ]
+
+
+def log_existing_objects(apps: Any, schema_editor: Any) -> None:
+    # Clients that sync from the start of the log are given every object that already exists.
+    ChangeLogEntry = apps.get_model('assets', 'ChangeLogEntry')
+    timestamp = timezone.now()
+    for name, object_type in LOGGED_MODELS.items():
+        ChangeLogEntry.objects.bulk_create(
+            (
+                ChangeLogEntry(object_type=object_type, object_id=object_id, action='C', timestamp=timestamp)
+                for object_id in apps.get_model('assets', name).objects.values_list('pk', flat=True).iterator()
+            ),
+            batch_size=1000,
+        )
+
+
+def create_change_log_triggers(apps: Any, schema_editor: Any) -> None:
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE OR REPLACE FUNCTION assets_log_change() RETURNS trigger AS $$ BEGIN "
+            f'INSERT INTO "assets_changelogentry" ({COLUMNS}) VALUES ('
+            "txid_current(), TG_ARGV[0], "
+            'CASE WHEN TG_OP = \'DELETE\' THEN OLD."id" ELSE NEW."id" END, '
+            "CASE TG_OP WHEN 'INSERT' THEN 'C' WHEN 'UPDATE' THEN 'U' ELSE 'D' END, now()); "
+            "RETURN NULL; END $$ LANGUAGE plpgsql",
+            params=None,
+        )
+    for table, object_type in get_logged_tables(apps).items():
+        if vendor == 'postgresql':
+            statements = get_postgresql_trigger_sql(table, object_type)
+        elif vendor == 'sqlite':
+            statements = get_sqlite_trigger_sql(table, object_type)
+        else:
+            statements = []
+        for sql in statements:
+            schema_editor.execute(sql, params=None)
+
+
+def drop_change_log_triggers(apps: Any, schema_editor: Any) -> None:
+    vendor = schema_editor.connection.vendor
+    if vendor not in ('postgresql', 'sqlite'):
+        return
+    for table in get_logged_tables(apps):
+        for operation in OPERATIONS:
+            on_table = f' ON "{table}"' if vendor == 'postgresql' else ''
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS "{table}_change_{operation}"{on_table}', params=None)
+    if vendor == 'postgresql':
+        schema_editor.execute("DROP FUNCTION IF EXISTS assets_log_change()", params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0018_add_search_documents'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('transaction_id', models.BigIntegerField(default=0)),
+                (
+                    'object_type',
+                    models.CharField(
+                        choices=[
+                            ('asset', 'Asset'),
+                            ('node', 'Node'),
+                            ('asset-model', 'Asset Model'),
+                            ('manufacturer', 'Manufacturer'),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ('object_id', models.UUIDField()),
+                (
+                    'action',
+                    models.CharField(choices=[('C', 'Created'), ('U', 'Updated'), ('D', 'Deleted')], max_length=1),
+                ),
+                ('timestamp', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='changelogentry',
+            index=models.Index(fields=['transaction_id', 'id'], name='change_log_cursor'),
+        ),
+        migrations.RunPython(log_existing_objects, migrations.RunPython.noop),
+        migrations.RunPython(create_change_log_triggers, drop_change_log_triggers),
+    ]
@@ -1,17 +1,27 @@
 from .asset import Asset
 from .asset_code import AssetCode
+from .asset_code_keyspace import AssetCodePrefix
+from .asset_code_reservation import AssetCodeReservation
 from .asset_event import AssetEvent, ChangeSet
 from .asset_model import AssetModel
+from .change_log import ChangeLogEntry
 from .manufacturer import Manufacturer
 from .node import Node, NodeType
+from .node_asset_count import NodeAssetCount
+from .node_closure import NodeClosure
 
 __all__ = [
     "Asset",
     "AssetCode",
+    "AssetCodePrefix",
+    "AssetCodeReservation",
     "AssetEvent",
     "AssetModel",
+    "ChangeLogEntry",
     "ChangeSet",
     "Manufacturer",
     "Node",
+    "NodeAssetCount",
+    "NodeClosure",
     "NodeType",
 ]
@@ -1,15 +1,27 @@
 """Asset Information."""
 
-from typing import List, Optional
-from uuid import uuid4
+from collections import Counter
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
 
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError, models, transaction
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
 
-from assets.asset_codes import AssetCodeType
+from assets.asset_codes import AssetCodeType, Damm32AssetCodeStrategy
 
 from .asset_code import AssetCode
+from .asset_code_keyspace import (
+    generate_unused_codes,
+    generate_unused_damm32_codes,
+)
+from .asset_code_reservation import AssetCodeReservation
 from .asset_model import AssetModel
+from .node import Node, NodeType
+from .node_asset_count import NodeAssetCount
+from .search import refresh_search_documents
 
 
 class Asset(models.Model):
@@ -18,21 +30,19 @@ class Asset(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid4, editable=False)  # noqa: A003
     asset_model = models.ForeignKey(AssetModel, on_delete=models.PROTECT)
 
+    # The number of times to try inserting many codes when other writers take some of them first.
+    ADD_ASSET_CODES_ATTEMPTS = 10
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     extra_data = models.JSONField(default=dict, blank=True)
-
-    @property
-    def display_name(self) -> str:
-        try:
-            return self.node.name or str(f"{self.asset_model.display_name} ({self.first_asset_code})")
-        except Asset.node.RelatedObjectDoesNotExist:
-            return str(f"{self.asset_model.display_name} ({self.first_asset_code})")
+    display_name = models.CharField(max_length=100, editable=False, db_index=True, default="")
+    search_document = models.TextField(editable=False, default="")
 
     @property
     def first_asset_code(self) -> str:
         """A usable asset code for the asset."""
-        code = self.assetcode_set.first()
+        code = min(self.assetcode_set.all(), key=attrgetter('pk'), default=None)
         if code is None:
             return str(self.id)
         else:
@@ -46,6 +56,125 @@ class Asset(models.Model):
     def __str__(self) -> str:
         return self.display_name
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        adding = self._state.adding
+        previous_model_id = None
+        if not adding and not kwargs.get('update_fields'):
+            previous_model_id = Asset.objects.filter(pk=self.pk).values_list('asset_model_id', flat=True).first()
+        self.display_name = self.get_display_name()
+        super().save(*args, **kwargs)
+
+        # The asset models are shown with the number of their assets.
+        if adding:
+            AssetModel.mark_updated(AssetModel.objects.filter(pk=self.asset_model_id))
+        elif previous_model_id is not None and previous_model_id != self.asset_model_id:
+            AssetModel.mark_updated(AssetModel.objects.filter(pk__in=[previous_model_id, self.asset_model_id]))
+
+        if previous_model_id is not None and previous_model_id != self.asset_model_id:
+            Node.objects.filter(asset=self).update(is_container=self.asset_model.is_container)
+            Node.mark_assets_updated(Node.objects.filter(asset=self))
+            # The asset is now counted under its new model in the subtree of each ancestor.
+            for path in Node.objects.filter(asset=self).values_list('path', flat=True):
+                NodeAssetCount.add_to_ancestors([
+                    (path, Counter([previous_model_id]), -1),
+                    (path, Counter([self.asset_model_id]), 1),
+                ])
+        if not kwargs.get('update_fields'):
+            refresh_search_documents(assets=Asset.objects.filter(pk=self.pk))
+
+    def delete(self, *args: Any, **kwargs: Any) -> Tuple[int, Dict[str, int]]:
+        deleted = super().delete(*args, **kwargs)
+        AssetModel.mark_updated(AssetModel.objects.filter(pk=self.asset_model_id))
+        return deleted
+
+    def get_display_name(self) -> str:
+        """
+        Calculate the display name of the asset.
+
+        This is the name of the node if it has one, otherwise the asset model and a code.
+        """
+        node = None if self._state.adding else getattr(self, 'node', None)
+        if node is not None and node.name:
+            return node.name
+        return self._get_code_display_name(self.asset_model, self.first_asset_code)
+
+    @staticmethod
+    def _get_code_display_name(asset_model: AssetModel, code: str) -> str:
+        return f"{asset_model.display_name} ({code})"
+
+    def refresh_display_name(self) -> None:
+        """Recalculate the stored display name and search document of the asset and its node, and mark it as updated."""
+        self.display_name = self.get_display_name()
+        self.updated_at = timezone.now()
+        Asset.objects.filter(pk=self.pk).update(display_name=self.display_name, updated_at=self.updated_at)
+        Node.objects.filter(asset=self).update(display_name=self.display_name)
+        Node.refresh_locations(Node.objects.filter(asset=self, numchild__gt=0))
+        refresh_search_documents(assets=Asset.objects.filter(pk=self.pk))
+
+    @classmethod
+    def refresh_display_names(cls, assets: 'models.QuerySet[Asset]') -> None:
+        """
+        Recalculate the stored display names and search documents of many assets and their nodes.
+
+        The assets are also marked as updated.
+        """
+        changed = []
+        for asset in assets.select_related('asset_model', 'node').prefetch_related('assetcode_set'):
+            display_name = asset.get_display_name()
+            if asset.display_name != display_name:
+                asset.display_name = display_name
+                changed.append(asset)
+
+        nodes = []
+        for asset in changed:
+            if hasattr(asset, 'node'):
+                asset.node.display_name = asset.display_name
+                nodes.append(asset.node)
+
+        cls.objects.bulk_update(changed, ['display_name'])
+        Node.objects.bulk_update(nodes, ['display_name'])
+        Node.refresh_locations(node for node in nodes if node.numchild)
+        refresh_search_documents(assets=assets)
+        cls.mark_updated(assets)
+
+    @classmethod
+    def mark_updated(cls, assets: 'models.QuerySet[Asset]') -> None:
+        """
+        Set the time that many assets were last updated to now.
+
+        Changes to the codes, asset model or node of an asset change how it
+        is shown without saving it, so they mark it as updated for clients
+        that only fetch it again when it has changed.
+        """
+        assets.update(updated_at=timezone.now())
+
+    @classmethod
+    def resolve(cls, codes: Sequence[str]) -> Dict[str, 'Asset']:
+        """
+        Find the assets that many scanned asset codes or asset IDs refer to.
+
+        The same number of queries is made however many codes there are, and
+        the assets are fetched with their codes, nodes and node parents.
+        Codes that match nothing are left out.
+        """
+        asset_codes = AssetCode.lookup(codes, AssetCode.objects.select_related('asset__node', 'asset__asset_model'))
+        found = {code: asset_code.asset for code, asset_code in asset_codes.items()}
+
+        ids = {}
+        for code in codes:
+            if code not in found:
+                try:
+                    ids[code] = UUID(code.strip())
+                except ValueError:
+                    pass
+        if ids:
+            assets = cls.objects.select_related('node', 'asset_model').in_bulk(set(ids.values()))
+            found.update({code: assets[pk] for code, pk in ids.items() if pk in assets})
+
+        prefetch_related_objects(list(found.values()), 'assetcode_set')
+        Node.prefetch_parents(asset.node for asset in found.values() if hasattr(asset, 'node'))
+        return found
+
     def add_asset_code(self, code_type: AssetCodeType, code: Optional[str]) -> AssetCode:
         """
         Add an asset code to an asset.
@@ -61,13 +190,106 @@ class Asset(models.Model):
             except ValidationError as e:
                 raise ValueError(f"Provided asset code is not valid: {e}")
 
-        # Generate and attempt to insert codes in a loop
+        # Take a code from the pool, or generate one, and attempt to insert it in a loop
         while True:
             try:
-                if (code := strategy.generate_new_code()) is None:
-                    raise ValueError("Unable to generate an asset code of that type.")
-
                 with transaction.atomic():
+                    code = self._generate_codes(code_type, 1)[0]
                     return AssetCode.objects.create(asset=self, code=code, code_type=code_type.value)
             except IntegrityError:
                 pass
+
+    @classmethod
+    def add_asset_codes(cls, assets: Sequence['Asset'], code_type: AssetCodeType) -> List[AssetCode]:
+        """
+        Generate a new asset code for each of many assets.
+
+        Codes are taken from the pool where possible. Candidates for the rest
+        are generated at once, and any that are already taken are dropped
+        with a single query. Further rounds of candidates are generated for
+        the codes that are still needed, and then all of the codes are
+        inserted together.
+
+        :raises ValueError: Unable to generate enough codes of that type.
+        """
+        for _ in range(cls.ADD_ASSET_CODES_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    codes = cls._generate_codes(code_type, len(assets))
+                    asset_codes = AssetCode.objects.bulk_create(
+                        AssetCode(
+                            asset=asset,
+                            code=code,
+                            normalised_code=AssetCode.normalise(code, code_type.value),
+                            code_type=code_type.value,
+                        )
+                        for asset, code in zip(assets, codes)
+                    )
+                    cls.refresh_display_names(cls.objects.filter(pk__in=[asset.pk for asset in assets]))
+                    return asset_codes
+            except IntegrityError:
+                pass  # Another writer took one of the codes, so start again.
+        raise ValueError("Unable to generate enough unique asset codes.")
+
+    @classmethod
+    def bulk_add(
+        cls,
+        asset_model: AssetModel,
+        parent: Node,
+        code_type: AssetCodeType,
+        *,
+        count: int = 0,
+        codes: Optional[Sequence[str]] = None,
+    ) -> List[AssetCode]:
+        """
+        Add many assets of a model, each with an asset code, as children of a node.
+
+        The assets, their codes and their nodes are each inserted with a
+        single statement, and the node paths are allocated together. Either
+        the codes are given, and must be valid and unused, or ``count`` codes
+        are generated as for ``add_asset_codes``.
+
+        :returns: The code of each new asset.
+        :raises ValueError: Unable to generate enough codes, or the node cannot contain the assets.
+        """
+        for _ in range(cls.ADD_ASSET_CODES_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    new_codes = cls._generate_codes(code_type, count) if codes is None else list(codes)
+                    assets = [
+                        cls(asset_model=asset_model, display_name=cls._get_code_display_name(asset_model, code))
+                        for code in new_codes
+                    ]
+                    cls.objects.bulk_create(assets, batch_size=1000)
+                    AssetModel.mark_updated(AssetModel.objects.filter(pk=asset_model.pk))
+                    asset_codes = AssetCode.objects.bulk_create(
+                        (
+                            AssetCode(
+                                asset=asset,
+                                code=code,
+                                normalised_code=AssetCode.normalise(code, code_type.value),
+                                code_type=code_type.value,
+                            )
+                            for asset, code in zip(assets, new_codes)
+                        ),
+                        batch_size=1000,
+                    )
+                    if codes is not None:
+                        AssetCodeReservation.objects.filter(code__in=new_codes).delete()
+                    parent.add_children(Node(node_type=NodeType.ASSET, asset=asset) for asset in assets)
+                    return asset_codes
+            except IntegrityError:
+                if codes is not None:
+                    raise
+                # Another writer took one of the codes, so start again.
+        raise ValueError("Unable to generate enough unique asset codes.")
+
+    @staticmethod
+    def _generate_codes(code_type: AssetCodeType, count: int) -> List[str]:
+        # Damm32 codes are taken from the pool where possible, and the rest
+        # are generated in the configured mode for the default prefix.
+        strategy = AssetCodeType.get_strategy(code_type)
+        if not isinstance(strategy, Damm32AssetCodeStrategy):
+            return generate_unused_codes(strategy.generate_new_code, count)
+        codes = AssetCodeReservation.take(strategy.default_prefix, count)
+        return codes + generate_unused_damm32_codes(strategy.default_prefix, count - len(codes))
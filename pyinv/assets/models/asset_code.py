@@ -1,4 +1,6 @@
 import uuid
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from django.core.exceptions import ValidationError
 from django.db import models
@@ -11,12 +13,84 @@ class AssetCode(models.Model):
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)  # noqa: A003
     code = models.CharField(max_length=30, unique=True)
+    normalised_code = models.CharField(max_length=30, db_index=True, editable=False)
     code_type = models.CharField(max_length=1, choices=ASSET_CODE_TYPE_CHOICES)
     asset = models.ForeignKey('Asset', on_delete=models.CASCADE)
 
     def __str__(self) -> str:
         return self.code
 
+    @staticmethod
+    def normalise(code: str, code_type: str) -> str:
+        """The key that a code is indexed by, from the normalisation of its type."""
+        return AssetCodeType(code_type).get_strategy().normalise(code)
+
+    @staticmethod
+    def get_lookup_keys(code: str) -> Set[str]:
+        """
+        The keys that a code might be indexed by.
+
+        The type of a scanned code is not known, so it is normalised by
+        every strategy, and any of the results may match.
+        """
+        return {strategy.normalise(code) for strategy in AssetCodeType.strategy_mapping().values()}
+
+    @classmethod
+    def lookup(
+        cls,
+        codes: Iterable[str],
+        queryset: Optional['models.QuerySet[AssetCode]'] = None,
+    ) -> Dict[str, 'AssetCode']:
+        """
+        Find the asset codes that scanned codes refer to, with a single query.
+
+        A code that matches exactly is preferred over one that only matches
+        once normalised. Codes that match nothing are left out.
+        """
+        keys = {code: cls.get_lookup_keys(code) for code in codes}
+        if queryset is None:
+            queryset = cls.objects.all()
+
+        matches: Dict[str, List[AssetCode]] = {}
+        for asset_code in queryset.filter(normalised_code__in=set().union(*keys.values())):
+            matches.setdefault(asset_code.normalised_code, []).append(asset_code)
+
+        found = {}
+        for code, code_keys in keys.items():
+            candidates = [asset_code for key in code_keys for asset_code in matches.get(key, [])]
+            exact = [asset_code for asset_code in candidates if asset_code.code == code]
+            if candidates:
+                found[code] = min(exact or candidates, key=attrgetter('code'))
+        return found
+
+    @classmethod
+    def get_suggestions(cls, code: str) -> List['AssetCode']:
+        """
+        Find the asset codes that a mistyped code may have been meant to be, with a single query.
+
+        Each type of code suggests the valid codes that are one mistake away,
+        using its check digit, so only a few candidates are looked up.
+        """
+        candidates: Set[str] = set()
+        for strategy in AssetCodeType.strategy_mapping().values():
+            candidates |= strategy.get_corrections(code)
+        if not candidates:
+            return []
+        return list(cls.objects.filter(normalised_code__in=candidates).select_related('asset').order_by('code'))
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        from .asset_code_reservation import AssetCodeReservation
+
+        self.normalised_code = self.normalise(self.code, self.code_type)
+        super().save(*args, **kwargs)
+        AssetCodeReservation.objects.filter(code=self.code).delete()
+        self.asset.refresh_display_name()
+
+    def delete(self, *args: Any, **kwargs: Any) -> Tuple[int, Dict[str, int]]:
+        deleted = super().delete(*args, **kwargs)
+        self.asset.refresh_display_name()
+        return deleted
+
     def clean(self) -> None:
         try:
             code_type = AssetCodeType(self.code_type).get_strategy()
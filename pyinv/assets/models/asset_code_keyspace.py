@@ -0,0 +1,167 @@
+"""Generation of unused asset codes, and how full each Damm32 prefix is."""
+
+import logging
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Set
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models.functions import Substr, Upper
+
+from assets.asset_codes import AssetCodeType, Damm32AssetCodeStrategy
+
+from .asset_code import AssetCode
+
+logger = logging.getLogger(__name__)
+
+# The number of rounds of candidate codes to generate before giving up.
+GENERATE_ATTEMPTS = 10
+
+
+def get_damm32_strategy() -> Damm32AssetCodeStrategy:
+    """The shared Damm32 strategy, whose lookup tables are only built once."""
+    strategy = AssetCodeType.DAMM32.get_strategy()
+    assert isinstance(strategy, Damm32AssetCodeStrategy)
+    return strategy
+
+
+def drop_used_codes(candidates: Set[str]) -> Set[str]:
+    """Remove the codes that are used by an asset or are in the pool, with a query for each."""
+    from .asset_code_reservation import AssetCodeReservation
+
+    candidates = candidates - set(AssetCode.objects.filter(code__in=candidates).values_list('code', flat=True))
+    return candidates - set(AssetCodeReservation.objects.filter(code__in=candidates).values_list('code', flat=True))
+
+
+def generate_unused_codes(generate: Callable[[], Optional[str]], count: int) -> List[str]:
+    """
+    Generate codes that are neither used by an asset nor in the pool.
+
+    Candidates for every code are generated at once, and any that are
+    already taken are dropped. Further rounds of candidates are generated
+    for the codes that are still needed.
+
+    :raises ValueError: Unable to generate enough unused codes.
+    """
+    codes: Set[str] = set()
+    for _ in range(GENERATE_ATTEMPTS):
+        if len(codes) == count:
+            break
+
+        candidates = set()
+        for _ in range(count - len(codes)):
+            if (code := generate()) is None:
+                raise ValueError("Unable to generate an asset code of that type.")
+            candidates.add(code)
+        codes |= drop_used_codes(candidates - codes)
+
+    if len(codes) < count:
+        raise ValueError("Unable to generate enough unique asset codes.")
+    return list(codes)
+
+
+def generate_unused_damm32_codes(prefix: str, count: int) -> List[str]:
+    """
+    Generate unused Damm32 codes with a prefix, in the configured generation mode.
+
+    :raises ValueError: Unable to generate enough unused codes.
+    """
+    if not count:
+        return []
+    if settings.DAMM32_ASSET_CODE_GENERATION == 'random':
+        strategy = get_damm32_strategy()
+        return generate_unused_codes(lambda: strategy.generate_code_with_prefix(prefix), count)
+    return AssetCodePrefix.generate_codes(prefix, count)
+
+
+class AssetCodePrefix(models.Model):
+    """
+    How far through the codes of a Damm32 prefix generation has reached.
+
+    In the sequence generation mode, codes are generated by walking a
+    counter through a fixed shuffle of every code with the prefix. Every
+    index gives a different code, so the only codes that need skipping are
+    those added in some other way, and generation does not slow down as the
+    prefix fills up.
+    """
+
+    # Warn when this fraction of the codes of a prefix have been used.
+    WARNING_OCCUPANCY = 0.9
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)  # noqa: A003
+    prefix = models.CharField(max_length=3, unique=True)
+    next_index = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return self.prefix
+
+    @classmethod
+    def generate_codes(cls, prefix: str, count: int) -> List[str]:
+        """
+        Generate unused codes with a prefix by walking its counter.
+
+        The counter is locked until the end of the transaction, so that
+        concurrent writers do not generate the same codes.
+
+        :raises ValueError: There are not enough codes left with the prefix.
+        """
+        strategy = get_damm32_strategy()
+        codes: Set[str] = set()
+        with transaction.atomic():
+            # The counter is created in a savepoint, and fetched instead if a concurrent writer created it first.
+            counter, _ = cls.objects.select_for_update().get_or_create(prefix=prefix)
+            while len(codes) < count:
+                end = min(counter.next_index + count - len(codes), strategy.KEYSPACE_SIZE)
+                if end == counter.next_index:
+                    raise ValueError(f"All asset codes with the prefix {prefix} have been used.")
+                codes |= drop_used_codes({
+                    strategy.generate_code_at_index(prefix, index)
+                    for index in range(counter.next_index, end)
+                })
+                counter.next_index = end
+            counter.save(update_fields=['next_index'])
+
+        if counter.next_index >= cls.WARNING_OCCUPANCY * strategy.KEYSPACE_SIZE:
+            logger.warning(
+                "%d of %d asset codes with the prefix %s have been generated.",
+                counter.next_index, strategy.KEYSPACE_SIZE, prefix,
+            )
+        return list(codes)
+
+    @classmethod
+    def get_occupancy(cls) -> List[Dict[str, Any]]:
+        """How many of the codes of each Damm32 prefix have been used, reserved or generated."""
+        from .asset_code_reservation import AssetCodeReservation
+
+        capacity = Damm32AssetCodeStrategy.KEYSPACE_SIZE
+        assigned = Counter(dict(
+            AssetCode.objects.filter(code_type=AssetCodeType.DAMM32.value)
+            .annotate(prefix=Upper(Substr('code', 1, 3)))
+            .values('prefix').annotate(count=models.Count('pk')).values_list('prefix', 'count'),
+        ))
+        pooled = Counter(dict(
+            AssetCodeReservation.objects
+            .values('prefix').annotate(count=models.Count('pk')).values_list('prefix', 'count'),
+        ))
+        reserved = Counter(dict(
+            AssetCodeReservation.objects.filter(reserved_at__isnull=False)
+            .values('prefix').annotate(count=models.Count('pk')).values_list('prefix', 'count'),
+        ))
+        generated = {counter.prefix: counter.next_index for counter in cls.objects.all()}
+
+        occupancy = []
+        for prefix in sorted({*settings.DAMM32_ASSET_CODE_PREFIXES, *assigned, *pooled, *generated}):
+            used = assigned[prefix] + pooled[prefix]
+            occupancy.append({
+                "prefix": prefix,
+                "capacity": capacity,
+                "assigned": assigned[prefix],
+                "pooled": pooled[prefix] - reserved[prefix],
+                "reserved": reserved[prefix],
+                "generated": generated.get(prefix, 0),
+                "remaining": capacity - used,
+                "occupancy": used / capacity,
+                "nearly_full": max(used, generated.get(prefix, 0)) >= cls.WARNING_OCCUPANCY * capacity,
+            })
+        return occupancy
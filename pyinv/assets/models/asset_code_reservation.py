@@ -0,0 +1,93 @@
+"""Pool of pre-generated asset codes."""
+
+from typing import List
+from uuid import uuid4
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from .asset_code_keyspace import generate_unused_damm32_codes
+
+
+class AssetCodeReservation(models.Model):
+    """
+    A Damm32 asset code that has been generated ahead of time.
+
+    Codes in the pool are unused, and are taken by assets that are given a
+    generated code. Codes that have been printed on labels are reserved,
+    and leave the pool when an asset is registered with them.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)  # noqa: A003
+    code = models.CharField(max_length=30, unique=True)
+    prefix = models.CharField(max_length=3)
+    reserved_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['prefix', 'reserved_at'], name='asset_code_pool_prefix'),
+        ]
+
+    def __str__(self) -> str:
+        return self.code
+
+    @classmethod
+    def get_available(cls, prefix: str) -> 'models.QuerySet[AssetCodeReservation]':
+        """The codes in the pool with a prefix that have not been reserved."""
+        return cls.objects.filter(prefix=prefix, reserved_at__isnull=True)
+
+    @classmethod
+    def _claim(cls, prefix: str, count: int) -> List['AssetCodeReservation']:
+        # Rows locked by other writers are skipped rather than waited for, so
+        # concurrent claims each get different codes without retrying.
+        return list(cls.get_available(prefix).select_for_update(skip_locked=True)[:count])
+
+    @classmethod
+    def take(cls, prefix: str, count: int) -> List[str]:
+        """
+        Take up to ``count`` codes out of the pool, to be given to assets.
+
+        This must be called in the same transaction as the codes are used.
+        """
+        claimed = cls._claim(prefix, count)
+        cls.objects.filter(pk__in=[reservation.pk for reservation in claimed]).delete()
+        return [reservation.code for reservation in claimed]
+
+    @classmethod
+    def reserve(cls, prefix: str, count: int) -> List['AssetCodeReservation']:
+        """
+        Reserve codes to be printed on labels.
+
+        Codes are claimed from the pool, and any more that are needed are
+        generated, so this does not depend on the pool having been filled.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            reservations = cls._claim(prefix, count)
+            cls.objects.filter(pk__in=[reservation.pk for reservation in reservations]).update(reserved_at=now)
+            for reservation in reservations:
+                reservation.reserved_at = now
+
+            codes = generate_unused_damm32_codes(prefix, count - len(reservations))
+            reservations += cls.objects.bulk_create(
+                cls(code=code, prefix=prefix, reserved_at=now) for code in codes
+            )
+        return reservations
+
+    @classmethod
+    def fill(cls, prefix: str, size: int) -> int:
+        """
+        Add codes to the pool until it has ``size`` available codes with a prefix.
+
+        :returns: The number of codes added.
+        """
+        count = size - cls.get_available(prefix).count()
+        if count <= 0:
+            return 0
+        codes = generate_unused_damm32_codes(prefix, count)
+        created = cls.objects.bulk_create(
+            (cls(code=code, prefix=prefix) for code in codes),
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        return len(created)
@@ -0,0 +1,122 @@
+"""Querying and indexing the extra data of assets."""
+
+import json
+import re
+from typing import Any, Dict, List, Sequence, Tuple
+
+from django.conf import settings
+from django.db import connections, models
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+# Keys are written into the SQL of indexes and queries, so they are limited to word characters.
+EXTRA_DATA_KEY_RE = re.compile(r'^\w+$')
+
+EXTRA_DATA_INDEX_PREFIX = 'asset_extra_data_'
+EXTRA_DATA_GIN_INDEX = 'asset_extra_data_gin'
+
+
+def get_json_path(keys: Sequence[str]) -> str:
+    """The SQLite JSON path of a key, given as the keys to follow from the top level."""
+    if not keys or not all(EXTRA_DATA_KEY_RE.match(key) for key in keys):
+        raise ValueError(f"Invalid extra data key: {'__'.join(keys)!r}")
+    return '$' + ''.join(f'."{key}"' for key in keys)
+
+
+class ExtraDataKey(models.Func):
+    """
+    The value of a key in the extra data, as SQLite extracts it.
+
+    Django passes the JSON path of a key transform as a parameter, which
+    SQLite cannot match against an index on the same expression. This
+    writes the path into the SQL instead, so the hot key indexes are used.
+    """
+
+    template = "JSON_EXTRACT(%(expressions)s, '%(path)s')"
+    output_field: 'models.Field[Any, Any]' = models.Field()
+
+    def __init__(self, keys: Sequence[str]) -> None:
+        super().__init__(models.F('extra_data'), path=get_json_path(keys))
+
+
+def get_candidate_values(value: str) -> List[Any]:
+    """
+    The JSON values that a query string value could be looking for.
+
+    A value like 42 or true is also matched against the number or boolean,
+    as well as the string.
+    """
+    candidates: List[Any] = [value]
+    try:
+        # NaN and Infinity are not valid JSON, so they are only matched as strings.
+        parsed = json.loads(value, parse_constant=str)
+    except ValueError:
+        return candidates
+    if isinstance(parsed, (bool, int, float)):
+        candidates.append(parsed)
+    return candidates
+
+
+def filter_by_extra_data(
+    queryset: 'models.QuerySet[Any]',
+    keys: Sequence[str],
+    values: Sequence[str],
+) -> 'models.QuerySet[Any]':
+    """
+    Filter to the assets with any of the values at a key of their extra data.
+
+    PostgreSQL checks for containment, which the GIN index on the extra data
+    supports. Other databases compare the value at the key, which can use
+    the index of a hot key on SQLite.
+    """
+    candidates = [candidate for value in values for candidate in get_candidate_values(value)]
+    if connections[queryset.db].vendor == 'postgresql':
+        query = models.Q(pk__in=[])
+        for candidate in candidates:
+            contained: Any = candidate
+            for key in reversed(keys):
+                contained = {key: contained}
+            query |= models.Q(extra_data__contains=contained)
+        return queryset.filter(query)
+
+    return queryset.alias(extra_data_value=ExtraDataKey(keys)).filter(extra_data_value__in=candidates)
+
+
+def get_extra_data_indexes(connection: BaseDatabaseWrapper, table: str) -> Dict[str, str]:
+    """The SQL to create each index of the extra data that should exist, by name."""
+    quote = connection.ops.quote_name
+    if connection.vendor == 'postgresql':
+        return {
+            EXTRA_DATA_GIN_INDEX: (
+                f"CREATE INDEX IF NOT EXISTS {quote(EXTRA_DATA_GIN_INDEX)} "
+                f"ON {quote(table)} USING gin ({quote('extra_data')})"
+            ),
+        }
+    if connection.vendor == 'sqlite':
+        return {
+            f'{EXTRA_DATA_INDEX_PREFIX}{key}': (
+                f"CREATE INDEX IF NOT EXISTS {quote(EXTRA_DATA_INDEX_PREFIX + key)} "
+                f"ON {quote(table)} (JSON_EXTRACT({quote('extra_data')}, '{get_json_path([key])}'))"
+            )
+            for key in settings.ASSET_EXTRA_DATA_INDEXED_KEYS
+        }
+    return {}
+
+
+def sync_extra_data_indexes(connection: BaseDatabaseWrapper, table: str) -> Tuple[List[str], List[str]]:
+    """
+    Create the missing indexes of the extra data and drop any that are no longer configured.
+
+    :returns: The names of the created and the dropped indexes.
+    """
+    wanted = get_extra_data_indexes(connection, table)
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+        existing = {name for name in constraints if name.startswith(EXTRA_DATA_INDEX_PREFIX)}
+
+        created = sorted(set(wanted) - existing)
+        dropped = sorted(existing - set(wanted))
+        for name in dropped:
+            cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+        for name in created:
+            cursor.execute(wanted[name])
+    return created, dropped
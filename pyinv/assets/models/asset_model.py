@@ -1,9 +1,14 @@
 import uuid
+from collections import Counter
+from typing import Any, Dict, Iterable, Tuple
 
 from autoslug import AutoSlugField
 from django.db import models
+from django.utils import timezone
 
 from .manufacturer import Manufacturer
+from .node import Node
+from .search import refresh_search_documents
 
 
 class AssetModel(models.Model):
@@ -22,12 +27,73 @@ class AssetModel(models.Model):
     manufacturer = models.ForeignKey(Manufacturer, on_delete=models.PROTECT)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-
-    @property
-    def display_name(self) -> str:
-        if AssetModel.objects.filter(name=self.name).count() == 1:
-            return self.name
-        return f"{self.manufacturer.name} {self.name}"
+    display_name = models.CharField(max_length=61, editable=False, db_index=True, default="")
 
     def __str__(self) -> str:
         return self.display_name
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        previous = None if self._state.adding else AssetModel.objects.filter(pk=self.pk).first()
+
+        super().save(*args, **kwargs)
+
+        # The display name of other asset models with the old or new name may change.
+        if previous is None or (previous.name, previous.manufacturer_id) != (self.name, self.manufacturer_id):
+            AssetModel.refresh_display_names({self.name} | ({previous.name} if previous else set()))
+            self.refresh_from_db(fields=['display_name'])
+
+        from .asset import Asset
+        if previous is not None and previous.is_container != self.is_container:
+            Node.objects.filter(asset__asset_model=self).update(is_container=self.is_container)
+            Node.mark_assets_updated(Node.objects.filter(asset__asset_model=self))
+        if previous is not None and (previous.name, previous.slug, previous.manufacturer_id) != (
+            self.name, self.slug, self.manufacturer_id,
+        ):
+            refresh_search_documents(assets=Asset.objects.filter(asset_model=self))
+            # The assets show the name and slug of their asset model.
+            Asset.mark_updated(Asset.objects.filter(asset_model=self))
+
+    def delete(self, *args: Any, **kwargs: Any) -> Tuple[int, Dict[str, int]]:
+        deleted = super().delete(*args, **kwargs)
+        # Another asset model with the same name may no longer need its manufacturer in its display name.
+        AssetModel.refresh_display_names({self.name})
+        return deleted
+
+    @classmethod
+    def mark_updated(cls, asset_models: 'models.QuerySet[AssetModel]') -> None:
+        """
+        Set the time that many asset models were last updated to now.
+
+        An asset model is shown with its manufacturer and the number of its
+        assets, which change without saving it.
+        """
+        asset_models.update(updated_at=timezone.now())
+
+    @classmethod
+    def refresh_display_names(cls, names: Iterable[str]) -> None:
+        """
+        Recalculate the stored display names of the asset models with the given names.
+
+        The manufacturer is only included in the display name when multiple
+        asset models share a name. The display names of the assets of any
+        changed asset models are also recalculated.
+        """
+        from .asset import Asset
+
+        asset_models = list(cls.objects.filter(name__in=names).select_related('manufacturer'))
+        name_counts = Counter(asset_model.name for asset_model in asset_models)
+
+        changed = []
+        for asset_model in asset_models:
+            if name_counts[asset_model.name] == 1:
+                display_name = asset_model.name
+            else:
+                display_name = f"{asset_model.manufacturer.name} {asset_model.name}"
+
+            if asset_model.display_name != display_name:
+                asset_model.display_name = display_name
+                changed.append(asset_model)
+
+        if changed:
+            cls.objects.bulk_update(changed, ['display_name'])
+            Asset.refresh_display_names(Asset.objects.filter(asset_model__in=changed))
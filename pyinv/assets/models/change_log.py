@@ -0,0 +1,236 @@
+"""Append-only log of the changes to assets, nodes, asset models and manufacturers."""
+
+from typing import Iterable, List, Mapping, Optional, Set, Tuple
+
+from django.db import connections, models
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models.expressions import RawSQL
+
+# The transaction and id of the last change that a client has seen.
+ChangeCursor = Tuple[int, int]
+
+CHANGE_LOG_TRIGGER_FUNCTION = 'assets_log_change'
+
+
+class ChangeLogEntry(models.Model):
+    """
+    A row of a logged table that was inserted, updated or deleted.
+
+    Entries are written by database triggers, so every change is logged in
+    the same transaction as the change itself, including bulk updates and
+    the raw SQL of tree moves. They are read in order of their transaction
+    and id, which only increases for the transactions that commit later.
+    """
+
+    class ObjectType(models.TextChoices):
+
+        ASSET = 'asset', "Asset"
+        NODE = 'node', "Node"
+        ASSET_MODEL = 'asset-model', "Asset Model"
+        MANUFACTURER = 'manufacturer', "Manufacturer"
+
+    class Action(models.TextChoices):
+
+        CREATE = 'C', "Created"
+        UPDATE = 'U', "Updated"
+        DELETE = 'D', "Deleted"
+
+    id = models.BigAutoField(primary_key=True)  # noqa: A003
+    # The PostgreSQL transaction that made the change. SQLite commits one transaction at a time, so it is always 0.
+    transaction_id = models.BigIntegerField(default=0)
+    object_type = models.CharField(max_length=16, choices=ObjectType.choices)
+    object_id = models.UUIDField()
+    action = models.CharField(max_length=1, choices=Action.choices)
+    timestamp = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['transaction_id', 'id'], name='change_log_cursor'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_action_display()} {self.object_type} {self.object_id} at {self.timestamp}"
+
+    @property
+    def cursor(self) -> ChangeCursor:
+        return self.transaction_id, self.id
+
+    @staticmethod
+    def format_cursor(cursor: ChangeCursor) -> str:
+        return f"{cursor[0]}.{cursor[1]}"
+
+    @staticmethod
+    def parse_cursor(value: str) -> ChangeCursor:
+        """Parse a cursor given by a client, raising ValueError if it is invalid."""
+        transaction_id, _, entry_id = value.partition('.')
+        cursor = int(transaction_id), int(entry_id)
+        if min(cursor) < 0:
+            raise ValueError(f"Invalid cursor: {value!r}")
+        return cursor
+
+    @classmethod
+    def get_page(
+        cls,
+        since: ChangeCursor,
+        limit: int,
+        using: Optional[str] = None,
+    ) -> Tuple[List['ChangeLogEntry'], bool]:
+        """
+        Fetch the entries after a cursor, and whether there are more after them.
+
+        On PostgreSQL, a transaction can commit after a later one, so the
+        entries of a transaction are only given once every transaction that
+        started before it has finished. Any entry that is committed later is
+        then always after the cursor of the entries already given.
+        """
+        transaction_id, entry_id = since
+        queryset = cls.objects.using(using).filter(
+            models.Q(transaction_id__gt=transaction_id) | models.Q(transaction_id=transaction_id, id__gt=entry_id),
+        )
+        if connections[queryset.db].vendor == 'postgresql':
+            queryset = queryset.filter(
+                transaction_id__lt=RawSQL("txid_snapshot_xmin(txid_current_snapshot())", []),
+            )
+        entries = list(queryset.order_by('transaction_id', 'id')[:limit + 1])
+        return entries[:limit], len(entries) > limit
+
+
+def get_change_log_triggers(table: str) -> List[str]:
+    """The names of the triggers that log the inserts, updates and deletes of a table."""
+    return [f'{table}_change_{operation}' for operation in ('insert', 'update', 'delete')]
+
+
+def get_drop_change_log_trigger_sql(connection: BaseDatabaseWrapper, table: str) -> List[str]:
+    """The SQL to drop the triggers that log the changes to a table, if they exist."""
+    quote = connection.ops.quote_name
+    if connection.vendor == 'postgresql':
+        return [f"DROP TRIGGER IF EXISTS {quote(name)} ON {quote(table)}" for name in get_change_log_triggers(table)]
+    if connection.vendor == 'sqlite':
+        return [f"DROP TRIGGER IF EXISTS {quote(name)}" for name in get_change_log_triggers(table)]
+    return []
+
+
+def get_change_log_trigger_sql(connection: BaseDatabaseWrapper, table: str, object_type: str) -> List[str]:
+    """The SQL to (re)create the triggers that log the changes to a table."""
+    quote = connection.ops.quote_name
+    log_table = quote(ChangeLogEntry._meta.db_table)
+    columns = ", ".join(
+        quote(column) for column in ('transaction_id', 'object_type', 'object_id', 'action', 'timestamp')
+    )
+    insert, update, delete = (quote(name) for name in get_change_log_triggers(table))
+
+    if connection.vendor == 'postgresql':
+        return [
+            f"CREATE OR REPLACE FUNCTION {CHANGE_LOG_TRIGGER_FUNCTION}() RETURNS trigger AS $$ BEGIN "
+            f"INSERT INTO {log_table} ({columns}) VALUES ("
+            f"txid_current(), TG_ARGV[0], "
+            f"CASE WHEN TG_OP = 'DELETE' THEN OLD.{quote('id')} ELSE NEW.{quote('id')} END, "
+            f"CASE TG_OP WHEN 'INSERT' THEN 'C' WHEN 'UPDATE' THEN 'U' ELSE 'D' END, now()); "
+            f"RETURN NULL; END $$ LANGUAGE plpgsql",
+            *get_drop_change_log_trigger_sql(connection, table),
+            f"CREATE TRIGGER {insert} AFTER INSERT ON {quote(table)} "
+            f"FOR EACH ROW EXECUTE PROCEDURE {CHANGE_LOG_TRIGGER_FUNCTION}('{object_type}')",
+            # Updates that write the same values, like a save without changes, are not logged.
+            f"CREATE TRIGGER {update} AFTER UPDATE ON {quote(table)} "
+            f"FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*) "
+            f"EXECUTE PROCEDURE {CHANGE_LOG_TRIGGER_FUNCTION}('{object_type}')",
+            f"CREATE TRIGGER {delete} AFTER DELETE ON {quote(table)} "
+            f"FOR EACH ROW EXECUTE PROCEDURE {CHANGE_LOG_TRIGGER_FUNCTION}('{object_type}')",
+        ]
+    if connection.vendor != 'sqlite':
+        return []
+
+    def log(row: str, action: str) -> str:
+        return (
+            f"BEGIN INSERT INTO {log_table} ({columns}) VALUES "
+            f"(0, '{object_type}', {row}.{quote('id')}, '{action}', STRFTIME('%Y-%m-%d %H:%M:%f', 'now')); END"
+        )
+
+    return [
+        *get_drop_change_log_trigger_sql(connection, table),
+        f"CREATE TRIGGER {insert} AFTER INSERT ON {quote(table)} {log('new', 'C')}",
+        f"CREATE TRIGGER {update} AFTER UPDATE ON {quote(table)} {log('new', 'U')}",
+        f"CREATE TRIGGER {delete} AFTER DELETE ON {quote(table)} {log('old', 'D')}",
+    ]
+
+
+def sync_change_log_triggers(connection: BaseDatabaseWrapper, tables: Mapping[str, str]) -> None:
+    """
+    Create the triggers that log the changes to tables, given with the object type of their rows.
+
+    SQLite drops the triggers of a table when a migration rebuilds it, so
+    missing triggers are restored after migrating.
+    """
+    with connection.cursor() as cursor:
+        for table, object_type in tables.items():
+            for sql in get_change_log_trigger_sql(connection, table, object_type):
+                cursor.execute(sql)
+
+
+def get_existing_triggers(connection: BaseDatabaseWrapper) -> Set[str]:
+    """The names of the triggers in the database."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("SELECT tgname FROM pg_trigger WHERE NOT tgisinternal")
+        elif connection.vendor == 'sqlite':
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        else:
+            return set()
+        return {name for name, in cursor.fetchall()}
+
+
+def restore_change_log_triggers(connection: BaseDatabaseWrapper, tables: Mapping[str, str]) -> None:
+    """
+    Create the missing triggers that log the changes to tables, given with the object type of their rows.
+
+    The rows of a table that was missing any of its triggers may have
+    changed without being logged, so every one of them is logged as
+    updated. Clients that sync from the log then fetch them again.
+    """
+    if connection.vendor not in ('postgresql', 'sqlite'):
+        return
+    existing = get_existing_triggers(connection)
+    missing = {
+        table: object_type for table, object_type in tables.items()
+        if not set(get_change_log_triggers(table)) <= existing
+    }
+    sync_change_log_triggers(connection, missing)
+
+    quote = connection.ops.quote_name
+    columns = ", ".join(
+        quote(column) for column in ('transaction_id', 'object_type', 'object_id', 'action', 'timestamp')
+    )
+    if connection.vendor == 'postgresql':
+        transaction_id, timestamp = "txid_current()", "now()"
+    else:
+        transaction_id, timestamp = "0", "STRFTIME('%%Y-%%m-%%d %%H:%%M:%%f', 'now')"
+    with connection.cursor() as cursor:
+        for table, object_type in missing.items():
+            cursor.execute(
+                f"INSERT INTO {quote(ChangeLogEntry._meta.db_table)} ({columns}) "
+                f"SELECT {transaction_id}, %s, {quote('id')}, %s, {timestamp} FROM {quote(table)}",
+                [object_type, ChangeLogEntry.Action.UPDATE],
+            )
+
+
+def drop_change_log_triggers(connection: BaseDatabaseWrapper, tables: Iterable[str]) -> None:
+    """Stop logging the changes to tables."""
+    with connection.cursor() as cursor:
+        for table in tables:
+            for sql in get_drop_change_log_trigger_sql(connection, table):
+                cursor.execute(sql)
+
+
+def get_logged_tables() -> Mapping[str, str]:
+    """The tables whose changes are logged, with the object type of their rows."""
+    from .asset import Asset
+    from .asset_model import AssetModel
+    from .manufacturer import Manufacturer
+    from .node import Node
+
+    return {
+        Asset._meta.db_table: ChangeLogEntry.ObjectType.ASSET,
+        Node._meta.db_table: ChangeLogEntry.ObjectType.NODE,
+        AssetModel._meta.db_table: ChangeLogEntry.ObjectType.ASSET_MODEL,
+        Manufacturer._meta.db_table: ChangeLogEntry.ObjectType.MANUFACTURER,
+    }
@@ -1,4 +1,5 @@
 import uuid
+from typing import Any
 
 from autoslug import AutoSlugField
 from django.db import models
@@ -21,3 +22,22 @@ class Manufacturer(models.Model):
 
     def __str__(self) -> str:
         return self.name
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        from .asset import Asset
+        from .asset_model import AssetModel
+        from .search import refresh_search_documents
+
+        previous = None if self._state.adding else Manufacturer.objects.filter(pk=self.pk).first()
+        super().save(*args, **kwargs)
+        # A new manufacturer has no asset models, and nothing else shows the other fields.
+        if previous is None or (previous.name, previous.slug) == (self.name, self.slug):
+            return
+
+        if previous.name != self.name:
+            AssetModel.refresh_display_names(self.assetmodel_set.values_list('name', flat=True))
+        assets = Asset.objects.filter(asset_model__manufacturer=self)
+        refresh_search_documents(assets=assets)
+        # Asset models, and the asset models of assets, are shown with the name and slug of their manufacturer.
+        AssetModel.mark_updated(self.assetmodel_set.all())
+        Asset.mark_updated(assets)
@@ -1,11 +1,18 @@
 """Asset Tree Node."""
 
-from typing import List, Optional
+from collections import Counter
+from functools import reduce
+from operator import or_
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from uuid import uuid4
 
 from django.core.exceptions import ValidationError
-from django.db import models
-from treebeard.mp_tree import MP_Node
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Concat, Substr
+from treebeard.exceptions import NodeAlreadySaved, PathOverflow
+from treebeard.mp_tree import MP_Node, MP_NodeManager, MP_NodeQuerySet
+
+from .search import refresh_search_documents
 
 
 class NodeType(models.TextChoices):
@@ -15,6 +22,43 @@ class NodeType(models.TextChoices):
     LOCATION = 'L', 'Location'
 
 
+class NodeQuerySet(MP_NodeQuerySet):
+
+    def delete(self) -> None:
+        """Delete the nodes and their descendants, updating the display names and search documents of their assets."""
+        from .asset import Asset
+        from .node_asset_count import NodeAssetCount
+
+        nodes = list(self.order_by('path'))
+        if not nodes:
+            return
+
+        # Only the highest of the deleted nodes need removing from the counts of their ancestors.
+        paths: Set[str] = set()
+        for node in nodes:
+            if not any(path in paths for path in NodeAssetCount.get_ancestor_paths(node.path)):
+                paths.add(node.path)
+        removed = [node for node in nodes if node.path in paths]
+        counts = NodeAssetCount.get_subtree_counts(removed)
+        NodeAssetCount.add_to_ancestors((node.path, counts[node.pk], -1) for node in removed)
+
+        subtrees = [models.Q(path__startswith=path) for path in paths]
+        asset_ids = list(
+            Node.objects.filter(reduce(or_, subtrees), asset__isnull=False).values_list('asset_id', flat=True),
+        )
+        parent_paths = {Node._get_basepath(node.path, node.depth - 1) for node in removed if node.depth > 1}
+        super().delete()
+        # The assets are no longer in a location, and are no longer named by their nodes.
+        Asset.refresh_display_names(Asset.objects.filter(pk__in=asset_ids))
+        Node.mark_assets_updated(Node.objects.filter(path__in=parent_paths))
+
+
+class NodeManager(MP_NodeManager):
+
+    def get_queryset(self) -> NodeQuerySet:
+        return NodeQuerySet(self.model).order_by('path')
+
+
 class Node(MP_Node):
     """A node in the asset tree."""
 
@@ -22,6 +66,21 @@ class Node(MP_Node):
     name = models.CharField(max_length=100, blank=True, null=True)
     node_type = models.CharField(max_length=1, choices=NodeType.choices)
     asset = models.OneToOneField('Asset', on_delete=models.PROTECT, blank=True, null=True)
+    display_name = models.CharField(max_length=100, editable=False, db_index=True, default="")
+    is_container = models.BooleanField(default=True, editable=False)
+    location_path = models.TextField(editable=False, default="")
+    location_ids = models.JSONField(editable=False, default=list)
+    search_document = models.TextField(editable=False, default="")
+
+    objects = NodeManager()
+
+    # The number of times to try adding a root node when other writers take its path first.
+    ADD_ROOT_ATTEMPTS = 5
+
+    LOCATION_PATH_SEPARATOR = " / "
+
+    _cached_ancestors: List['Node']
+    _cached_children: List['Node']
 
     def clean(self) -> None:
         """Validate the node."""
@@ -56,22 +115,502 @@ class Node(MP_Node):
 
     @property
     def ancestors(self) -> List['Node']:
-        return self.get_ancestors().all()
-
-    @property
-    def is_container(self) -> bool:
-        return (not self.asset) or self.asset.asset_model.is_container
+        if not hasattr(self, "_cached_ancestors"):
+            self._cached_ancestors = list(self.get_ancestors())
+        return self._cached_ancestors
 
     @property
-    def display_name(self) -> str:
-        if self.asset:
-            return self.asset.display_name
-        else:
-            return self.name or ""  # name is always set for a location
+    def children(self) -> List['Node']:
+        if not hasattr(self, "_cached_children"):
+            self._cached_children = list(self.get_children())
+        return self._cached_children
 
     def __str__(self) -> str:
         return self.display_name
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        adding = self._state.adding
+        if self.asset is None:
+            display_name = self.name or ""  # name is always set for a location
+            self.is_container = True
+        else:
+            display_name = self.asset.get_display_name()
+            self.is_container = self.asset.asset_model.is_container
+        renamed = not adding and display_name != self.display_name
+        self.display_name = display_name
+        previous_asset_id = None
+        if not adding:
+            previous_asset_id = Node.objects.filter(pk=self.pk).values_list('asset_id', flat=True).first()
+
+        if adding:
+            parent = self.get_parent()
+            self.location_path, self.location_ids = ("", []) if parent is None else parent.get_child_location()
+
+        super().save(*args, **kwargs)
+
+        if self.asset is not None and self.asset.display_name != self.display_name:
+            self.asset.save(update_fields=['display_name'])
+
+        if adding and self.asset is not None:
+            from .node_asset_count import NodeAssetCount
+            NodeAssetCount.add_to_ancestors([(self.path, Counter([self.asset.asset_model_id]), 1)])
+
+        if adding:
+            from .node_closure import NodeClosure
+            NodeClosure.link_subtrees([self], new=True)
+
+        # The search document only changes with the name and asset of the node.
+        if adding or renamed or previous_asset_id != self.asset_id:
+            refresh_search_documents(nodes=Node.objects.filter(pk=self.pk))
+        if renamed and self.numchild:
+            Node.refresh_locations([self])
+        if adding or renamed:
+            Node.mark_assets_updated([self])
+
+    def get_child_location(self) -> Tuple[str, List[str]]:
+        """The location path and location ids of the children of the node."""
+        if self.location_path:
+            location_path = self.location_path + self.LOCATION_PATH_SEPARATOR + self.display_name
+        else:
+            location_path = self.display_name
+        return location_path, self.location_ids + [str(self.pk)]
+
+    @classmethod
+    def refresh_locations(cls, nodes: Iterable['Node']) -> None:
+        """
+        Recalculate the stored locations of many nodes and their descendants.
+
+        The subtrees are fetched with a single query, and each location is
+        built from the location of its parent, so this should be called
+        after a node is moved or the display name of a node changes.
+        """
+        nodes = list(nodes)
+        if not nodes:
+            return
+
+        subtrees = cls.objects.filter(models.Q(pk__in=[node.pk for node in nodes]) | cls.get_descendants_filter(nodes))
+        parents_by_path = {
+            parent.path: parent
+            for parent in cls.objects.filter(path__in={
+                cls._get_basepath(node.path, node.depth - 1) for node in nodes if node.depth > 1
+            }).only('path', 'display_name', 'location_path', 'location_ids')
+        }
+
+        changed = []
+        for node in subtrees.order_by('path').only('path', 'depth', 'display_name', 'location_path', 'location_ids'):
+            parent = parents_by_path.get(cls._get_basepath(node.path, node.depth - 1))
+            location_path, location_ids = ("", []) if parent is None else parent.get_child_location()
+            if (node.location_path, node.location_ids) != (location_path, location_ids):
+                node.location_path, node.location_ids = location_path, location_ids
+                changed.append(node)
+            parents_by_path[node.path] = node
+        cls.objects.bulk_update(changed, ['location_path', 'location_ids'], batch_size=1000)
+        if changed:
+            refresh_search_documents(nodes=subtrees)
+
+    @classmethod
+    def _get_new_node(cls, kwargs: Dict[str, Any]) -> 'Node':
+        if len(kwargs) == 1 and 'instance' in kwargs:
+            node: Node = kwargs['instance']
+            if not node._state.adding:
+                raise NodeAlreadySaved("Attempted to add a tree node that is already in the database")
+            return node
+        return cls(**kwargs)
+
+    @classmethod
+    def _get_next_child_path(cls, parent: Optional['Node']) -> str:
+        """The path after the current last child of a node, or of the last root node if there is no node."""
+        if parent is None:
+            children = cls.objects.filter(depth=1)
+        else:
+            children = cls.objects.filter(cls.get_descendants_filter([parent], children_only=True))
+        last_child = children.order_by('-path').only('path').first()
+
+        if last_child is not None:
+            return last_child._inc_path()
+        path = cls._get_path(None if parent is None else parent.path, 1 if parent is None else parent.depth + 1, 1)
+        if len(path) > cls._meta.get_field('path').max_length:
+            raise PathOverflow('The new node is too deep in the tree, try increasing the path.max_length property.')
+        return path
+
+    @classmethod
+    def add_root(cls, **kwargs: Any) -> 'Node':
+        """
+        Add a root node to the tree.
+
+        The path is allocated from the database rather than from memory. If
+        another writer takes the path first, it is allocated again.
+        """
+        node = cls._get_new_node(kwargs)
+        node.depth = 1
+        for attempt in range(1, cls.ADD_ROOT_ATTEMPTS + 1):
+            node.path = cls._get_next_child_path(None)
+            try:
+                with transaction.atomic():
+                    node.save()
+                return node
+            except IntegrityError:
+                if attempt == cls.ADD_ROOT_ATTEMPTS or not cls.objects.filter(path=node.path).exists():
+                    raise
+        raise AssertionError("unreachable")  # pragma: nocover
+
+    def add_child(self, **kwargs: Any) -> 'Node':
+        """
+        Add a child to the node.
+
+        Unlike treebeard, which allocates the path from the parent in memory
+        and only then increments ``numchild``, the parent row is updated
+        first. This locks the parent row on PostgreSQL and takes the write
+        lock on SQLite, so concurrent writers adding to the same parent
+        queue for the length of the insert, rather than colliding on a path.
+
+        :raises Node.DoesNotExist: The node has been deleted.
+        """
+        node = self._get_new_node(kwargs)
+        with transaction.atomic():
+            if not Node.objects.filter(pk=self.pk).update(numchild=models.F('numchild') + 1):
+                raise Node.DoesNotExist(f"{self} is no longer in the tree.")
+            node.path = self._get_next_child_path(self)
+            node.depth = self.depth + 1
+            node._cached_parent_obj = self
+            node.save()
+            Node.mark_assets_updated([self])
+
+        self.numchild += 1
+        return node
+
+    def add_children(self, nodes: Iterable['Node']) -> List['Node']:
+        """
+        Add many children to the node, after its current last child.
+
+        Like ``add_child``, the parent row is updated first. The paths are
+        then allocated together from the last child, and the nodes are
+        inserted with a single statement. Asset nodes take the display names
+        of their assets, which must already be set.
+
+        :raises ValueError: The node cannot contain the new nodes.
+        :raises Node.DoesNotExist: The node has been deleted.
+        """
+        from .node_asset_count import NodeAssetCount
+        from .node_closure import NodeClosure
+
+        nodes = [self._get_new_node({'instance': node}) for node in nodes]
+        if not nodes:
+            return []
+        if not self.is_container:
+            raise ValueError(f"{self} cannot contain other nodes.")
+
+        with transaction.atomic():
+            if not Node.objects.filter(pk=self.pk).update(numchild=models.F('numchild') + len(nodes)):
+                raise Node.DoesNotExist(f"{self} is no longer in the tree.")
+            try:
+                first_position = self._str2int(self._get_next_child_path(self)[-self.steplen:])
+            except PathOverflow:
+                first_position = len(self.alphabet) ** self.steplen
+            if first_position + len(nodes) > len(self.alphabet) ** self.steplen:
+                raise ValueError(f"{self} cannot contain any more nodes.")
+
+            location_path, location_ids = self.get_child_location()
+            for position, node in enumerate(nodes, start=first_position):
+                node.path = self._get_path(self.path, self.depth + 1, position)
+                node.depth = self.depth + 1
+                node.numchild = 0
+                node.location_path, node.location_ids = location_path, location_ids
+                if node.asset is None:
+                    node.display_name, node.is_container = node.name or "", True
+                else:
+                    node.display_name, node.is_container = node.asset.display_name, node.asset.asset_model.is_container
+                node._cached_parent_obj = self
+            Node.objects.bulk_create(nodes, batch_size=1000)
+
+            NodeAssetCount.add_to_ancestors(
+                (node.path, Counter([node.asset.asset_model_id]), 1) for node in nodes if node.asset is not None
+            )
+            NodeClosure.link_subtrees(nodes, new=True)
+            refresh_search_documents(nodes=Node.objects.filter(
+                Node.get_descendants_filter([self], children_only=True),
+                path__gte=nodes[0].path,
+            ))
+            Node.mark_assets_updated([self])
+
+        self.numchild += len(nodes)
+        return nodes
+
+    def move(self, target: 'Node', pos: Optional[str] = None) -> None:
+        from .node_asset_count import NodeAssetCount
+        from .node_closure import NodeClosure
+
+        # Moving next to a sibling can shift the paths of other nodes, so
+        # remove the counts from the old ancestors before moving.
+        with transaction.atomic():
+            counts = NodeAssetCount.get_subtree_counts([self])[self.pk]
+            NodeAssetCount.add_to_ancestors([(self.path, counts, -1)])
+            old_parent = self.get_parent()
+            super().move(target, pos)
+            moved = Node.objects.get(pk=self.pk)
+            NodeAssetCount.add_to_ancestors([(moved.path, counts, 1)])
+            NodeClosure.link_subtrees([moved])
+            Node.refresh_locations([moved])
+            Node.mark_assets_updated(node for node in (moved, old_parent, moved.get_parent()) if node is not None)
+        self._set_tree_position(Node.objects.get(pk=self.pk))
+
+    def _set_tree_position(self, moved: 'Node', parent: Optional['Node'] = None) -> None:
+        """
+        Take the position in the tree of a fresh copy of the node, after it has moved.
+
+        The cached ancestors are forgotten, and so is the cached parent unless the new one is given.
+        """
+        for field in ('path', 'depth', 'location_path', 'location_ids'):
+            setattr(self, field, getattr(moved, field))
+        self.__dict__.pop('_cached_ancestors', None)
+        if parent is None:
+            self.__dict__.pop('_cached_parent_obj', None)
+        else:
+            self._cached_parent_obj = parent
+
+    @classmethod
+    def mark_assets_updated(cls, nodes: Iterable['Node']) -> None:
+        """
+        Mark the assets that show many nodes as updated, after the names, parents or children of the nodes change.
+
+        An asset is shown with its node and the parent of its node, so these
+        are the assets of the nodes and of their children.
+        """
+        from .asset import Asset
+
+        nodes = list(nodes)
+        if not nodes:
+            return
+        Asset.mark_updated(Asset.objects.filter(
+            models.Q(node__in=[node.pk for node in nodes])
+            | models.Q(node__in=cls.objects.filter(cls.get_descendants_filter(nodes, children_only=True))),
+        ))
+
+    def get_subtree(self, depth: Optional[int] = None) -> 'Node':
+        """
+        Fetch the subtree below the node in a single query.
+
+        :param depth: The number of levels below the node to fetch, or all levels if None.
+        :returns: A fresh copy of the node, with ``children`` cached throughout the subtree.
+        """
+        nodes = Node.objects.filter(models.Q(pk=self.pk) | Node.get_descendants_filter([self]))
+        if depth is not None:
+            nodes = nodes.filter(depth__lte=self.depth + depth)
+        nodes = nodes.select_related('asset__asset_model').prefetch_related('asset__assetcode_set')
+
+        nodes_by_path: Dict[str, Node] = {}
+        for node in nodes.order_by('path'):
+            node._cached_children = []
+            parent = nodes_by_path.get(self._get_basepath(node.path, node.depth - 1))
+            if parent is not None:
+                node._cached_parent_obj = parent
+                parent._cached_children.append(node)
+            nodes_by_path[node.path] = node
+        return nodes_by_path[self.path]
+
+    @classmethod
+    def _get_path_upper_bound(cls, path: str) -> Optional[str]:
+        """The first path after all of the paths that start with the given path, if there is one."""
+        prefix = path.rstrip(cls.alphabet[-1])
+        if not prefix:
+            return None
+        return prefix[:-1] + cls.alphabet[cls.alphabet.index(prefix[-1]) + 1]
+
+    @classmethod
+    def get_path_descendants_filter(cls, nodes: Iterable['Node'], *, children_only: bool = False) -> models.Q:
+        """
+        Select the descendants of many nodes from their paths.
+
+        Each subtree is selected as a range of paths, from the path of the
+        node to the first path that does not start with it. Unlike the LIKE
+        used by treebeard, this is always an index range scan.
+
+        :param children_only: Only select the children of the nodes.
+        """
+        selected = models.Q(pk__in=[])
+        for node in nodes:
+            subtree = models.Q(path__gt=node.path)
+            upper_bound = cls._get_path_upper_bound(node.path)
+            if upper_bound is not None:
+                subtree &= models.Q(path__lt=upper_bound)
+            if children_only:
+                subtree &= models.Q(depth=node.depth + 1)
+            selected |= subtree
+        return selected
+
+    @classmethod
+    def get_descendants_filter(cls, nodes: Iterable['Node'], *, children_only: bool = False) -> models.Q:
+        """
+        Select the descendants of many nodes, using the configured tree backend.
+
+        :param children_only: Only select the children of the nodes.
+        """
+        from .node_closure import NodeClosure
+
+        if not NodeClosure.is_enabled():
+            return cls.get_path_descendants_filter(nodes, children_only=children_only)
+
+        links = NodeClosure.objects.filter(ancestor__in=[node.pk for node in nodes])
+        links = links.filter(distance=1) if children_only else links.filter(distance__gt=0)
+        return models.Q(pk__in=links.values('descendant'))
+
+    def get_ancestors(self) -> 'models.QuerySet[Node]':
+        from .node_closure import NodeClosure
+
+        if not NodeClosure.is_enabled():
+            return super().get_ancestors()
+        return Node.objects.filter(
+            descendant_links__descendant=self,
+            descendant_links__distance__gt=0,
+        )
+
+    def get_descendants(self) -> 'models.QuerySet[Node]':
+        from .node_closure import NodeClosure
+
+        if not NodeClosure.is_enabled():
+            return super().get_descendants()
+        return Node.objects.filter(ancestor_links__ancestor=self, ancestor_links__distance__gt=0)
+
+    @classmethod
+    def bulk_move(cls, nodes: Iterable['Node'], target: 'Node') -> List[Tuple['Node', Optional['Node']]]:
+        """
+        Move many nodes to be the last children of a target node.
+
+        Unlike ``move``, the paths and depths of every moved subtree are
+        rewritten with a single UPDATE, and the ``numchild`` of the old
+        parents and the target with another. Nodes that are already children
+        of the target are left where they are.
+
+        :returns: The moved nodes, each with its previous parent.
+        :raises ValueError: The nodes cannot be moved to the target.
+        """
+        from .node_asset_count import NodeAssetCount
+        from .node_closure import NodeClosure
+
+        with transaction.atomic():
+            given = list(nodes)
+            target = cls.objects.select_for_update().get(pk=target.pk)
+            nodes = list(cls.objects.select_for_update().filter(pk__in=[node.pk for node in given]))
+
+            if not target.is_container:
+                raise ValueError(f"{target} cannot contain other nodes.")
+
+            paths = {node.path for node in nodes}
+            for node in nodes:
+                if target.path.startswith(node.path):
+                    raise ValueError(f"Cannot move {node} inside itself.")
+                if any(cls._get_basepath(node.path, depth) in paths for depth in range(1, node.depth)):
+                    raise ValueError(f"Cannot move {node} at the same time as one of its ancestors.")
+
+            nodes = [node for node in nodes if not node.is_child_of(target)]
+            if not nodes:
+                return []
+            cls.prefetch_parents(nodes)
+            counts = NodeAssetCount.get_subtree_counts(nodes)
+            moves = [(node, node.parent) for node in nodes]
+
+            last_child = target.get_last_child()
+            first_position = 1 if last_child is None else last_child._get_lastpos_in_path() + 1
+            if first_position + len(nodes) > len(cls.alphabet) ** cls.steplen:
+                raise ValueError(f"{target} cannot contain any more nodes.")
+
+            subtrees = {node.path: models.Q(pk=node.pk) | cls.get_path_descendants_filter([node]) for node in nodes}
+            # Every level of a path has the same length, so the deepest node of each subtree gives its longest path.
+            subtree_height = cls.objects.filter(reduce(or_, subtrees.values())).aggregate(height=models.Max(
+                models.F('depth') - models.Case(*(
+                    models.When(subtrees[node.path], then=models.Value(node.depth)) for node in nodes
+                )),
+            ))['height']
+            if (target.depth + 1 + subtree_height) * cls.steplen > cls._meta.get_field('path').max_length:
+                raise ValueError(f"Cannot move the nodes this deep in the tree, below {target}.")
+
+            new_paths = {
+                node.path: cls._get_path(target.path, target.depth + 1, first_position + i)
+                for i, node in enumerate(nodes)
+            }
+            cls.objects.filter(reduce(or_, subtrees.values())).update(
+                path=models.Case(*(
+                    models.When(
+                        subtrees[node.path],
+                        then=Concat(models.Value(new_paths[node.path]), Substr('path', len(node.path) + 1)),
+                    )
+                    for node in nodes
+                ), output_field=models.CharField()),
+                depth=models.Case(*(
+                    models.When(subtrees[node.path], then=models.F('depth') + (target.depth + 1 - node.depth))
+                    for node in nodes
+                )),
+            )
+
+            old_parents = Counter(parent.path for _, parent in moves if parent is not None)
+            cls.objects.filter(path__in=[target.path, *old_parents]).update(numchild=models.Case(
+                models.When(path=target.path, then=models.F('numchild') + len(nodes)),
+                *(models.When(path=path, then=models.F('numchild') - count) for path, count in old_parents.items()),
+            ))
+
+            NodeAssetCount.add_to_ancestors(
+                [(node.path, counts[node.pk], -1) for node in nodes]
+                + [(new_paths[node.path], counts[node.pk], 1) for node in nodes],
+            )
+
+            for node in nodes:
+                node.path = new_paths[node.path]
+                node.depth = target.depth + 1
+                node._cached_parent_obj = target
+
+            NodeClosure.link_subtrees(nodes)
+            cls.refresh_locations(nodes)
+            cls.mark_assets_updated([target, *nodes, *(parent for _, parent in moves if parent is not None)])
+
+        moved = {node.pk: node for node in cls.objects.filter(pk__in=[node.pk for node in nodes])}
+        for node in [*nodes, *given]:
+            if node.pk in moved:
+                node._set_tree_position(moved[node.pk], target)
+        return moves
+
+    @classmethod
+    def _get_nodes_by_path(cls, paths: Set[str]) -> Dict[str, 'Node']:
+        if not paths:
+            return {}
+        nodes = cls.objects.filter(path__in=paths).select_related('asset__asset_model')
+        return {node.path: node for node in nodes}
+
+    @classmethod
+    def prefetch_ancestors(cls, nodes: Iterable['Node']) -> None:
+        """
+        Fetch the ancestors of many nodes in a single query.
+
+        The path of every ancestor is a prefix of the path of the node, so the
+        ancestors of all of the nodes can be collected up front. The results
+        are cached on each node for use by ``ancestors`` and ``parent``.
+        """
+        nodes = [node for node in nodes if not hasattr(node, "_cached_ancestors")]
+        ancestors_by_path = cls._get_nodes_by_path({
+            cls._get_basepath(node.path, depth)
+            for node in nodes
+            for depth in range(1, node.depth)
+        })
+        for node in nodes:
+            node._cached_ancestors = [
+                ancestors_by_path[path]
+                for path in (cls._get_basepath(node.path, depth) for depth in range(1, node.depth))
+                if path in ancestors_by_path
+            ]
+            if node._cached_ancestors:
+                node._cached_parent_obj = node._cached_ancestors[-1]
+
+    @classmethod
+    def prefetch_parents(cls, nodes: Iterable['Node']) -> None:
+        """Fetch the parents of many nodes in a single query, caching them on each node."""
+        nodes = [node for node in nodes if node.depth > 1 and not hasattr(node, "_cached_parent_obj")]
+        parents_by_path = cls._get_nodes_by_path({
+            cls._get_basepath(node.path, node.depth - 1) for node in nodes
+        })
+        for node in nodes:
+            parent = parents_by_path.get(cls._get_basepath(node.path, node.depth - 1))
+            if parent is not None:
+                node._cached_parent_obj = parent
+
     def mark_out_of_tree(self, recursive: bool) -> None:
         """Mark the node and all of its descendants as out of tree."""
         if not recursive and self.get_descendants().count() > 0:
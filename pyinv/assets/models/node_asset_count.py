@@ -0,0 +1,127 @@
+"""Number of assets of each asset model below a node."""
+
+from collections import Counter
+from functools import reduce
+from operator import or_
+from typing import Dict, Iterable, Tuple
+from uuid import UUID, uuid4
+
+from django.db import IntegrityError, models, transaction
+
+from .node import Node
+
+SubtreeCounts = Dict[UUID, 'Counter[UUID]']
+
+
+class NodeAssetCount(models.Model):
+    """
+    The number of assets of an asset model below a node.
+
+    The counts are maintained incrementally as nodes are added, moved and
+    deleted, by adding to the counts of each ancestor of the changed node.
+    Ancestors are found from the prefixes of the node path.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)  # noqa: A003
+    node = models.ForeignKey(Node, on_delete=models.CASCADE, related_name='asset_counts')
+    asset_model = models.ForeignKey('AssetModel', on_delete=models.CASCADE)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['node', 'asset_model'], name='node_asset_count_unique'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.count} x {self.asset_model} in {self.node}"
+
+    @staticmethod
+    def get_ancestor_paths(path: str) -> Iterable[str]:
+        """The paths of the ancestors of a node with the given path."""
+        return (Node._get_basepath(path, depth) for depth in range(1, len(path) // Node.steplen))
+
+    @classmethod
+    def get_subtree_counts(cls, nodes: Iterable[Node]) -> SubtreeCounts:
+        """The number of assets of each model in the subtree of each node, including the node itself."""
+        node_ids = [node.pk for node in nodes]
+        counts: SubtreeCounts = {pk: Counter() for pk in node_ids}
+        for row in cls.objects.filter(node_id__in=node_ids):
+            counts[row.node_id][row.asset_model_id] += row.count
+        for node_id, asset_model_id in Node.objects.filter(pk__in=node_ids).values_list(
+            'pk', 'asset__asset_model_id',
+        ):
+            if asset_model_id is not None:
+                counts[node_id][asset_model_id] += 1
+        return counts
+
+    @classmethod
+    def add_to_ancestors(cls, deltas: Iterable[Tuple[str, 'Counter[UUID]', int]]) -> None:
+        """
+        Add subtree counts to the ancestors of many paths.
+
+        :param deltas: Tuples of a node path, the counts in its subtree and a
+            sign, -1 to remove the counts from the ancestors or 1 to add them.
+        """
+        changes: Counter[Tuple[str, UUID]] = Counter()
+        for path, counts, sign in deltas:
+            for ancestor_path in cls.get_ancestor_paths(path):
+                for asset_model_id, count in counts.items():
+                    changes[(ancestor_path, asset_model_id)] += sign * count
+        cls._apply_changes(changes)
+
+    @classmethod
+    def _apply_changes(cls, changes: 'Counter[Tuple[str, UUID]]') -> None:
+        changes = Counter({key: delta for key, delta in changes.items() if delta})
+        if not changes:
+            return
+
+        node_ids = dict(Node.objects.filter(path__in={path for path, _ in changes}).values_list('path', 'pk'))
+        rows = {
+            (node_ids[path], asset_model_id): delta
+            for (path, asset_model_id), delta in changes.items()
+            if path in node_ids
+        }
+        selected = reduce(or_, (
+            models.Q(node_id=node_id, asset_model_id=asset_model_id) for node_id, asset_model_id in rows
+        ))
+
+        with transaction.atomic():
+            cls.objects.bulk_create([
+                cls(node_id=node_id, asset_model_id=asset_model_id)
+                for (node_id, asset_model_id), delta in rows.items()
+                if delta > 0
+            ], ignore_conflicts=True)
+            # A count that is missing or would drop below zero means the counts have drifted from the tree, so
+            # the change fails rather than storing a wrong count. The field's check constraint catches the latter.
+            updated = cls.objects.filter(selected).update(count=models.Case(*(
+                models.When(node_id=node_id, asset_model_id=asset_model_id, then=models.F('count') + delta)
+                for (node_id, asset_model_id), delta in rows.items()
+            )))
+            if updated != len(rows):
+                raise IntegrityError("Asset counts do not match the tree, run rebuild_node_asset_counts.")
+            cls.objects.filter(selected, count=0).delete()
+
+    @classmethod
+    def recount(cls) -> Dict[Tuple[UUID, UUID], int]:
+        """Count the assets of each model below every node from scratch."""
+        node_ids = dict(Node.objects.values_list('path', 'pk'))
+        counts: Counter[Tuple[UUID, UUID]] = Counter()
+        for path, asset_model_id in Node.objects.filter(asset__isnull=False).values_list(
+            'path', 'asset__asset_model_id',
+        ):
+            for ancestor_path in cls.get_ancestor_paths(path):
+                counts[(node_ids[ancestor_path], asset_model_id)] += 1
+        return dict(counts)
+
+    @classmethod
+    def rebuild(cls) -> None:
+        """Replace all of the counts with a full recount."""
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(
+                [
+                    cls(node_id=node_id, asset_model_id=asset_model_id, count=count)
+                    for (node_id, asset_model_id), count in cls.recount().items()
+                ],
+                batch_size=1000,
+            )
@@ -0,0 +1,117 @@
+"""Closure table of the asset tree."""
+
+from itertools import islice
+from typing import Dict, Iterable, Set, Tuple
+from uuid import UUID, uuid4
+
+from django.conf import settings
+from django.db import models, transaction
+
+from .node import Node
+
+Link = Tuple[UUID, UUID, int]
+
+
+class NodeClosure(models.Model):
+    """
+    A link between a node and one of its ancestors, or itself.
+
+    When the closure tree backend is enabled, ancestor and descendant lookups
+    join on these links rather than matching path prefixes. The paths are
+    still the source of truth for the shape and order of the tree, so the
+    links are maintained from the paths as nodes are added and moved, and
+    are removed with their nodes. They are maintained whichever backend is
+    enabled, so that switching backends never leaves lookups using links
+    that are missing or out of date.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)  # noqa: A003
+    ancestor = models.ForeignKey(Node, on_delete=models.CASCADE, related_name='descendant_links')
+    descendant = models.ForeignKey(Node, on_delete=models.CASCADE, related_name='ancestor_links')
+    distance = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['ancestor', 'descendant'], name='node_closure_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['ancestor', 'distance'], name='node_closure_ancestor_distance'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.ancestor} > {self.descendant}"
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """Whether tree lookups should use the closure table, rather than only the node paths."""
+        return bool(settings.NODE_TREE_BACKEND == 'closure')
+
+    @classmethod
+    def link_subtrees(cls, nodes: Iterable[Node], *, new: bool = False) -> None:
+        """
+        Link the subtrees of the nodes to their ancestors, after they have been added or moved.
+
+        Links within a moved subtree do not change, so only the links from
+        the subtree to its old ancestors are replaced.
+
+        :param new: The nodes have just been added, so have no descendants or links to replace.
+        """
+        nodes_by_path = {node.path: node for node in nodes}
+        if not nodes_by_path:
+            return
+
+        subtrees = models.Q(pk__in=[node.pk for node in nodes_by_path.values()])
+        subtrees |= Node.get_path_descendants_filter(nodes_by_path.values())
+        subtree_ids = Node.objects.filter(subtrees).values('pk')
+
+        ancestor_ids = dict(Node.objects.filter(path__in={
+            Node._get_basepath(path, depth)
+            for path, node in nodes_by_path.items()
+            for depth in range(1, node.depth)
+        }).values_list('path', 'pk'))
+
+        links = []
+        for descendant in nodes_by_path.values() if new else Node.objects.filter(subtrees).only('path', 'depth'):
+            links.append(cls(ancestor_id=descendant.pk, descendant_id=descendant.pk, distance=0))
+            root = next(
+                nodes_by_path[path]
+                for path in (Node._get_basepath(descendant.path, depth) for depth in range(1, descendant.depth + 1))
+                if path in nodes_by_path
+            )
+            links.extend(
+                cls(
+                    ancestor_id=ancestor_ids[Node._get_basepath(root.path, depth)],
+                    descendant_id=descendant.pk,
+                    distance=descendant.depth - depth,
+                )
+                for depth in range(1, root.depth)
+            )
+
+        if new:
+            cls.objects.bulk_create(links, batch_size=1000)
+            return
+        with transaction.atomic():
+            cls.objects.filter(descendant__in=subtree_ids).exclude(ancestor__in=subtree_ids).delete()
+            cls.objects.bulk_create(links, batch_size=1000, ignore_conflicts=True)
+
+    @classmethod
+    def get_expected_links(cls) -> Set[Link]:
+        """Find every link from the node paths."""
+        node_ids: Dict[str, UUID] = {node.path: node.pk for node in Node.objects.only('path')}
+        return {
+            (node_ids[Node._get_basepath(path, depth)], pk, len(path) // Node.steplen - depth)
+            for path, pk in node_ids.items()
+            for depth in range(1, len(path) // Node.steplen + 1)
+        }
+
+    @classmethod
+    def rebuild(cls) -> None:
+        """Replace all of the links with ones found from the node paths."""
+        links = iter(cls.get_expected_links())
+        with transaction.atomic():
+            cls.objects.all().delete()
+            while batch := list(islice(links, 1000)):
+                cls.objects.bulk_create(
+                    cls(ancestor_id=ancestor_id, descendant_id=descendant_id, distance=distance)
+                    for ancestor_id, descendant_id, distance in batch
+                )
@@ -0,0 +1,246 @@
+"""Search documents of assets and nodes, and the indexes that they are searched through."""
+
+from functools import reduce
+from operator import add
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence
+
+from django.db import connections, models
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models.expressions import RawSQL
+
+if TYPE_CHECKING:
+    from .asset import Asset
+    from .node import Node
+
+# Terms shorter than this have no trigrams, so they cannot be found through the SQLite index.
+TRIGRAM_LENGTH = 3
+
+
+def build_search_document(display_name: str, location_path: str, asset: Optional['Asset']) -> str:
+    """
+    Combine the text that an asset or node can be found by.
+
+    Each part is on its own line, so that a term cannot match across two
+    parts, and the document is lowercase so that it can be searched without
+    folding the case of every row.
+    """
+    parts = [display_name, location_path]
+    if asset is not None:
+        asset_model = asset.asset_model
+        manufacturer = asset_model.manufacturer
+        parts += [asset_model.name, str(asset_model.slug or ""), manufacturer.name, str(manufacturer.slug or "")]
+        parts += sorted(asset_code.code for asset_code in asset.assetcode_set.all())
+    return "\n".join(part for part in parts if part).lower()
+
+
+def refresh_search_documents(
+    *,
+    assets: Optional['models.QuerySet[Asset]'] = None,
+    nodes: Optional['models.QuerySet[Node]'] = None,
+) -> None:
+    """
+    Recalculate the stored search documents of many assets and nodes.
+
+    The node of each asset and the asset of each node are also updated, as
+    an asset in the tree has the same document as its node. Only documents
+    that have changed are written.
+    """
+    from .asset import Asset
+    from .node import Node
+
+    selected = models.Q(pk__in=[])
+    if nodes is not None:
+        selected |= models.Q(pk__in=nodes.values('pk'))
+    if assets is not None:
+        selected |= models.Q(asset__in=assets.values('pk'))
+
+    changed_nodes = []
+    changed_assets = []
+    for node in (
+        Node.objects.filter(selected)
+        .select_related('asset__asset_model__manufacturer')
+        .prefetch_related('asset__assetcode_set')
+    ):
+        document = build_search_document(node.display_name, node.location_path, node.asset)
+        if node.search_document != document:
+            node.search_document = document
+            changed_nodes.append(node)
+        if node.asset is not None and node.asset.search_document != document:
+            node.asset.search_document = document
+            changed_assets.append(node.asset)
+
+    if assets is not None:
+        for asset in (
+            Asset.objects.filter(pk__in=assets.values('pk'), node__isnull=True)
+            .select_related('asset_model__manufacturer')
+            .prefetch_related('assetcode_set')
+        ):
+            document = build_search_document(asset.display_name, "", asset)
+            if asset.search_document != document:
+                asset.search_document = document
+                changed_assets.append(asset)
+
+    Node.objects.bulk_update(changed_nodes, ['search_document'], batch_size=1000)
+    Asset.objects.bulk_update(changed_assets, ['search_document'], batch_size=1000)
+
+
+class WordSimilarity(models.Func):
+    """The greatest trigram similarity between a term and any part of a text, on PostgreSQL."""
+
+    function = 'WORD_SIMILARITY'
+    output_field: 'models.Field[Any, Any]' = models.FloatField()
+
+    def __init__(self, term: str, expression: str) -> None:
+        super().__init__(models.Value(term), models.F(expression))
+
+
+def get_search_table(table: str) -> str:
+    """The name of the SQLite full-text index of a table."""
+    return f'{table}_search'
+
+
+def get_search_ids_table(table: str) -> str:
+    """
+    The name of the table that gives each row of a table a row of the SQLite full-text index.
+
+    The rows of the indexed tables only have implicit rowids, which VACUUM
+    and table rebuilds can renumber, so each id is given its own rowid.
+    """
+    return f'{table}_search_ids'
+
+
+def get_search_triggers(table: str) -> List[str]:
+    """The names of the triggers that keep the SQLite full-text index of a table up to date."""
+    return [f'{table}_search_{operation}' for operation in ('insert', 'delete', 'update')]
+
+
+def search(queryset: 'models.QuerySet[Any]', terms: Sequence[str]) -> 'models.QuerySet[Any]':
+    """
+    Filter to the rows with every term in their search document, best matches first.
+
+    PostgreSQL finds the rows with a trigram index, and ranks them by the
+    similarity of each term to the words of the document. SQLite finds and
+    ranks them with a full-text index of trigrams. The rank is annotated as
+    ``search_rank``.
+    """
+    terms = [term.lower() for term in terms]
+    connection = connections[queryset.db]
+
+    if connection.vendor == 'postgresql':
+        for term in terms:
+            queryset = queryset.filter(search_document__contains=term)
+        rank: Any = reduce(add, (WordSimilarity(term, 'search_document') for term in terms))
+        return queryset.annotate(search_rank=rank).order_by('-search_rank')
+
+    unranked = models.Value(0.0, output_field=models.FloatField())
+    if connection.vendor != 'sqlite':
+        for term in terms:
+            queryset = queryset.filter(search_document__contains=term)
+        return queryset.annotate(search_rank=unranked)
+
+    indexed = [term for term in terms if len(term) >= TRIGRAM_LENGTH]
+    for term in terms:
+        if len(term) < TRIGRAM_LENGTH:
+            queryset = queryset.filter(search_document__contains=term)
+    if not indexed:
+        return queryset.annotate(search_rank=unranked)
+
+    quote = connection.ops.quote_name
+    table = queryset.model._meta.db_table
+    search_table = get_search_table(table)
+    match = " ".join('"{}"'.format(term.replace('"', '""')) for term in indexed)
+    queryset = queryset.filter(pk__in=RawSQL(
+        f"SELECT {quote('id')} FROM {quote(search_table)} WHERE {quote(search_table)} MATCH %s",
+        [match],
+    ))
+    # FTS5 ranks better matches lower.
+    rank = RawSQL(
+        f"SELECT -rank FROM {quote(search_table)} WHERE {quote(search_table)} MATCH %s AND rowid = "
+        f"(SELECT rowid FROM {quote(get_search_ids_table(table))} WHERE {quote('id')} = {quote(table)}.{quote('id')})",
+        [match],
+        output_field=models.FloatField(),
+    )
+    return queryset.annotate(search_rank=rank).order_by('-search_rank')
+
+
+def get_search_index_sql(connection: BaseDatabaseWrapper, table: str) -> List[str]:
+    """
+    The SQL to create the index of the search documents of a table, if it does not exist.
+
+    On SQLite, the full-text index holds the id of each row along with its
+    document, and is kept up to date by triggers.
+    """
+    quote = connection.ops.quote_name
+    if connection.vendor == 'postgresql':
+        return [
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            f"CREATE INDEX IF NOT EXISTS {quote(f'{table}_search_trgm')} "
+            f"ON {quote(table)} USING gin ({quote('search_document')} gin_trgm_ops)",
+        ]
+    if connection.vendor != 'sqlite':
+        return []
+
+    search_table = quote(get_search_table(table))
+    ids_table = quote(get_search_ids_table(table))
+    insert, delete, update = (quote(name) for name in get_search_triggers(table))
+    id_column = quote('id')
+
+    def rowid(row: str) -> str:
+        return f"(SELECT rowid FROM {ids_table} WHERE {id_column} = {row}.{id_column})"
+
+    return [
+        f"CREATE TABLE IF NOT EXISTS {ids_table} (rowid INTEGER PRIMARY KEY, {id_column} char(32) NOT NULL UNIQUE)",
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {search_table} USING fts5("
+        f"{id_column} UNINDEXED, search_document, tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {insert} AFTER INSERT ON {quote(table)} BEGIN "
+        f"INSERT INTO {ids_table} ({id_column}) VALUES (new.{id_column}); "
+        f"INSERT INTO {search_table} (rowid, {id_column}, search_document) "
+        f"VALUES ({rowid('new')}, new.{id_column}, new.search_document); END",
+        f"CREATE TRIGGER IF NOT EXISTS {delete} AFTER DELETE ON {quote(table)} BEGIN "
+        f"DELETE FROM {search_table} WHERE rowid = {rowid('old')}; "
+        f"DELETE FROM {ids_table} WHERE {id_column} = old.{id_column}; END",
+        f"CREATE TRIGGER IF NOT EXISTS {update} AFTER UPDATE OF search_document ON {quote(table)} BEGIN "
+        f"UPDATE {search_table} SET search_document = new.search_document WHERE rowid = {rowid('new')}; END",
+    ]
+
+
+def get_search_rebuild_sql(connection: BaseDatabaseWrapper, table: str) -> List[str]:
+    """The SQL to fill the SQLite full-text index of a table from its search documents."""
+    if connection.vendor != 'sqlite':
+        return []
+    quote = connection.ops.quote_name
+    search_table = quote(get_search_table(table))
+    ids_table = quote(get_search_ids_table(table))
+    id_column = quote('id')
+    return [
+        f"DELETE FROM {search_table}",
+        f"DELETE FROM {ids_table}",
+        f"INSERT INTO {ids_table} ({id_column}) SELECT {id_column} FROM {quote(table)}",
+        f"INSERT INTO {search_table} (rowid, {id_column}, search_document) "
+        f"SELECT {ids_table}.rowid, {ids_table}.{id_column}, {quote(table)}.search_document "
+        f"FROM {quote(table)} JOIN {ids_table} ON {ids_table}.{id_column} = {quote(table)}.{id_column}",
+    ]
+
+
+def sync_search_indexes(connection: BaseDatabaseWrapper, tables: Sequence[str], *, rebuild: bool = False) -> None:
+    """
+    Create the missing indexes of the search documents of tables.
+
+    On SQLite, a full-text index is rebuilt if asked to, or if any of its
+    triggers were missing, as the documents may have changed without them.
+    """
+    with connection.cursor() as cursor:
+        existing = set(connection.introspection.table_names(cursor))
+        if connection.vendor == 'sqlite':
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+            existing |= {name for name, in cursor.fetchall()}
+
+        for table in tables:
+            stale = rebuild or not {
+                get_search_table(table), get_search_ids_table(table), *get_search_triggers(table),
+            } <= existing
+            for sql in get_search_index_sql(connection, table):
+                cursor.execute(sql)
+            if stale:
+                for sql in get_search_rebuild_sql(connection, table):
+                    cursor.execute(sql)
@@ -1,8 +1,22 @@
 from .asset import (
     AssetLinkSerializer,
+    AssetResolutionSerializer,
+    AssetResolveSerializer,
     AssetSerializer,
+    AssetWithLocationSerializer,
     AssetWithNodeSerializer,
 )
+from .asset_bulk import AssetBulkCreateSerializer
+from .asset_code import (
+    AssetCodeGenerateSerializer,
+    AssetCodeKeyspaceSerializer,
+    AssetCodeReserveSerializer,
+    AssetCodeSerializer,
+    AssetCodeSuggestionQuerySerializer,
+    AssetCodeSuggestionSerializer,
+    AssetCodeValidateSerializer,
+    AssetCodeValidationSerializer,
+)
 from .asset_event import (
     AssetEventSerializer,
     AssetEventTimelineSerializer,
@@ -10,31 +24,65 @@ from .asset_event import (
     AssetEventWithoutChangeSetSerializer,
 )
 from .asset_model import AssetModelLinkSerializer, AssetModelSerializer
+from .change_log import (
+    ChangeFeedQuerySerializer,
+    ChangeFeedSerializer,
+    ChangeSerializer,
+)
 from .changeset import (
     ChangeSetSerializer,
     ChangeSetSerializerWithCountSerializer,
 )
 from .manufacturer import ManufacturerLinkSerializer, ManufacturerSerializer
-from .node import NodeSerializer
+from .mixins import SparseFieldsetQuerySerializer
+from .node import (
+    NodeAssetCountSerializer,
+    NodeSerializer,
+    NodeSummarySerializer,
+    NodeTreeQuerySerializer,
+    NodeTreeSerializer,
+)
 from .node_link import NodeLinkSerializer, NodeLinkWithParentSerializer
+from .node_move import NodeBulkMoveSerializer
 
 __all__ = [
+    "AssetBulkCreateSerializer",
     "AssetSerializer",
     "AssetLinkSerializer",
+    "AssetResolutionSerializer",
+    "AssetResolveSerializer",
+    "AssetCodeGenerateSerializer",
+    "AssetCodeKeyspaceSerializer",
+    "AssetCodeReserveSerializer",
+    "AssetCodeSerializer",
+    "AssetCodeSuggestionQuerySerializer",
+    "AssetCodeSuggestionSerializer",
+    "AssetCodeValidateSerializer",
+    "AssetCodeValidationSerializer",
     "AssetEventSerializer",
     "AssetEventWithoutChangeSetSerializer",
     "AssetEventWithAssetSerializer",
     "AssetEventTimelineSerializer",
+    "AssetWithLocationSerializer",
     "AssetWithNodeSerializer",
     "AssetModelLinkSerializer",
     "AssetModelSerializer",
+    "ChangeFeedQuerySerializer",
+    "ChangeFeedSerializer",
+    "ChangeSerializer",
     "ChangeSetSerializer",
     "ChangeSetSerializerWithCountSerializer",
     "ManufacturerLinkSerializer",
     "ManufacturerSerializer",
     "AssetNodeLinkSerializer",
     "AssetNodeParentLinkSerializer",
+    "NodeAssetCountSerializer",
+    "NodeBulkMoveSerializer",
     "NodeLinkSerializer",
     "NodeLinkWithParentSerializer",
     "NodeSerializer",
+    "NodeSummarySerializer",
+    "NodeTreeQuerySerializer",
+    "NodeTreeSerializer",
+    "SparseFieldsetQuerySerializer",
 ]
@@ -1,8 +1,12 @@
+from typing import Any, Dict, List, Sequence, Union
+
+from django.db import models
 from rest_framework import serializers
 
-from assets.models import Asset
+from assets.models import Asset, Node
 
 from .asset_model import AssetModelLinkSerializer
+from .mixins import SparseFieldsetMixin
 from .node_link import NodeLinkWithParentSerializer
 
 
@@ -18,9 +22,20 @@ class AssetLinkSerializer(serializers.ModelSerializer):
         )
 
 
-class AssetSerializer(serializers.ModelSerializer):
+class AssetSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Asset objects."""
 
+    select_related_fields = {
+        'asset_model': ['asset_model'],
+    }
+    prefetch_related_fields = {
+        'asset_codes': ['assetcode_set'],
+        'first_asset_code': ['assetcode_set'],
+    }
+    expandable_fields: Dict[str, Sequence[str]] = {
+        'asset_model': [],
+    }
+
     id = serializers.UUIDField(read_only=True)  # noqa: A003
     asset_model = AssetModelLinkSerializer(read_only=True)
     asset_codes = serializers.ListField(child=serializers.CharField())
@@ -42,13 +57,80 @@ class AssetSerializer(serializers.ModelSerializer):
         )
 
 
+class AssetWithNodeListSerializer(serializers.ListSerializer):
+    """Resolve the parent node of every asset in the list with a single query."""
+
+    def to_representation(self, data: Union[models.Manager, models.QuerySet, List[Asset]]) -> List[Any]:
+        assets = list(data.all() if isinstance(data, models.Manager) else data)
+        # The parents are only needed when the node is nested, rather than collapsed or left out.
+        if isinstance(getattr(self.child, 'fields', {}).get('node'), NodeLinkWithParentSerializer):
+            Node.prefetch_parents(asset.node for asset in assets if hasattr(asset, 'node'))
+        return super().to_representation(assets)
+
+
 class AssetWithNodeSerializer(AssetSerializer):
     """Serializer for Asset objects."""
 
+    # The parents of the nodes are fetched by the list serializer.
+    select_related_fields = {
+        **AssetSerializer.select_related_fields,
+        'node': ['node'],
+    }
+    expandable_fields: Dict[str, Sequence[str]] = {
+        **AssetSerializer.expandable_fields,
+        'node': ['node'],
+    }
+
     node = NodeLinkWithParentSerializer(read_only=True)
 
     class Meta:
         model = Asset
+        list_serializer_class = AssetWithNodeListSerializer
         fields = AssetSerializer.Meta.fields + (
             'node',
         )
+
+
+class AssetWithLocationSerializer(AssetWithNodeSerializer):
+    """Serializer for Asset objects, with the location of their node."""
+
+    select_related_fields = {
+        **AssetWithNodeSerializer.select_related_fields,
+        'location_path': ['node'],
+    }
+
+    location_path = serializers.CharField(source='node.location_path', read_only=True, allow_null=True)
+
+    class Meta:
+        model = Asset
+        list_serializer_class = AssetWithNodeListSerializer
+        fields = AssetWithNodeSerializer.Meta.fields + (
+            'location_path',
+        )
+
+
+class AssetResolutionSerializer(serializers.Serializer):
+    """The asset that a scanned asset code or asset ID refers to."""
+
+    code = serializers.CharField(help_text="The asset code or asset ID as it was given.")
+    asset = AssetWithLocationSerializer(allow_null=True, help_text="The asset, or null if nothing matched.")
+
+
+class AssetResolveSerializer(serializers.Serializer):
+    """Resolve many scanned asset codes or asset IDs at once."""
+
+    MAX_CODES = 5000
+
+    codes = serializers.ListField(
+        child=serializers.CharField(trim_whitespace=False),
+        allow_empty=False,
+        max_length=MAX_CODES,
+        write_only=True,
+    )
+    results = AssetResolutionSerializer(many=True, read_only=True)
+
+    def create(self, validated_data: Dict[str, Any]) -> Dict[str, Any]:
+        assets = Asset.resolve(validated_data["codes"])
+        return {
+            "results": [{"code": code, "asset": assets.get(code)} for code in validated_data["codes"]],
+        }
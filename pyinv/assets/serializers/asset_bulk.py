@@ -0,0 +1,130 @@
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from assets.asset_codes import ASSET_CODE_TYPE_CHOICES, AssetCodeType
+from assets.models import (
+    Asset,
+    AssetCode,
+    AssetEvent,
+    AssetModel,
+    ChangeSet,
+    Node,
+)
+
+from .asset_code import AssetCodeSerializer
+from .changeset import ChangeSetSerializer
+
+
+class AssetBulkCreateSerializer(serializers.Serializer):
+    """Add many assets of a model to a node, recording their creation in a changeset."""
+
+    MAX_ASSETS = 5000
+
+    asset_model = serializers.SlugRelatedField(slug_field='slug', queryset=AssetModel.objects.all())
+    node = serializers.UUIDField(help_text="The node to add the assets to.")
+    count = serializers.IntegerField(
+        min_value=1,
+        max_value=MAX_ASSETS,
+        required=False,
+        help_text="The number of assets to add, each with a generated asset code.",
+    )
+    codes = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=MAX_ASSETS,
+        required=False,
+        write_only=True,
+        help_text="The asset codes of the assets to add, one asset for each code.",
+    )
+    code_type = serializers.ChoiceField(choices=ASSET_CODE_TYPE_CHOICES, default=AssetCodeType.DAMM32.value)
+    comment = serializers.CharField(default="", allow_blank=True)
+    asset_codes = AssetCodeSerializer(many=True, read_only=True)
+    changeset = ChangeSetSerializer(read_only=True)
+
+    def validate_node(self, value: UUID) -> Node:
+        try:
+            node = Node.objects.get(pk=value)
+        except Node.DoesNotExist:
+            raise serializers.ValidationError("Node does not exist.")
+        if not node.is_container:
+            raise serializers.ValidationError(f"{node} cannot contain other nodes.")
+        return node
+
+    def validate(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if ("count" in data) == ("codes" in data):
+            raise serializers.ValidationError("Either count or codes must be given.")
+        if "codes" in data:
+            data["codes"] = self._validate_codes(data["codes"], AssetCodeType(data["code_type"]))
+        return data
+
+    def _validate_codes(self, codes: List[str], code_type: AssetCodeType) -> List[str]:
+        strategy = code_type.get_strategy()
+        normalised = [strategy.normalise(code) for code in codes]
+
+        errors: Dict[int, List[str]] = {}
+        for i, code in enumerate(normalised):
+            try:
+                strategy.validate(code)
+            except ValidationError as e:
+                errors[i] = e.messages
+        seen = set()
+        for i, code in enumerate(normalised):
+            if code in seen:
+                errors.setdefault(i, []).append("Asset code is given more than once.")
+            seen.add(code)
+        existing = set(AssetCode.objects.filter(normalised_code__in=seen).values_list('normalised_code', flat=True))
+        for i, code in enumerate(normalised):
+            if code in existing:
+                errors.setdefault(i, []).append("Asset code is already in use.")
+
+        if errors:
+            raise serializers.ValidationError({"codes": errors})
+        return normalised
+
+    def create(self, validated_data: Dict[str, Any]) -> Dict[str, Any]:
+        node = validated_data["node"]
+        codes: Optional[List[str]] = validated_data.get("codes")
+        with transaction.atomic():
+            try:
+                asset_codes = Asset.bulk_add(
+                    validated_data["asset_model"],
+                    node,
+                    AssetCodeType(validated_data["code_type"]),
+                    count=validated_data.get("count", 0),
+                    codes=codes,
+                )
+            except (ValueError, Node.DoesNotExist) as e:
+                raise serializers.ValidationError(str(e))
+
+            changeset = ChangeSet.objects.create(
+                user=self.context["request"].user,
+                comment=validated_data["comment"],
+                timestamp=timezone.now(),
+            )
+            AssetEvent.objects.bulk_create(
+                (
+                    AssetEvent(
+                        event_type=AssetEvent.AssetEventType.CREATE,
+                        changeset=changeset,
+                        asset_id=asset_code.asset_id,
+                        data={"location": str(node.id)},
+                    )
+                    for asset_code in asset_codes
+                ),
+                batch_size=1000,
+            )
+
+        return {
+            "asset_model": validated_data["asset_model"],
+            "node": node.id,
+            "count": len(asset_codes),
+            "code_type": validated_data["code_type"],
+            "comment": validated_data["comment"],
+            "asset_codes": asset_codes,
+            "changeset": changeset,
+        }
@@ -0,0 +1,158 @@
+from typing import Any, Dict, List
+from uuid import UUID
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from rest_framework import serializers
+
+from assets.asset_codes import ASSET_CODE_TYPE_CHOICES, AssetCodeType
+from assets.models import Asset, AssetCode, AssetCodeReservation
+
+from .asset import AssetLinkSerializer
+
+
+class AssetCodeSerializer(serializers.ModelSerializer):
+
+    asset = serializers.UUIDField(source='asset_id', read_only=True)
+
+    class Meta:
+        model = AssetCode
+        fields = ('asset', 'code', 'code_type')
+
+
+class AssetCodeGenerateSerializer(serializers.Serializer):
+    """Generate a new asset code for each of many assets."""
+
+    MAX_ASSETS = 5000
+
+    assets = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=MAX_ASSETS)
+    code_type = serializers.ChoiceField(choices=ASSET_CODE_TYPE_CHOICES, default=AssetCodeType.DAMM32.value)
+    asset_codes = AssetCodeSerializer(many=True, read_only=True)
+
+    def validate_assets(self, value: List[UUID]) -> List[Asset]:
+        assets = Asset.objects.in_bulk(value)
+        missing = {str(pk) for pk in value if pk not in assets}
+        if missing:
+            raise serializers.ValidationError(f"Assets do not exist: {', '.join(sorted(missing))}")
+        return [assets[pk] for pk in dict.fromkeys(value)]
+
+    def create(self, validated_data: Dict[str, Any]) -> Dict[str, Any]:
+        assets = validated_data["assets"]
+        try:
+            asset_codes = Asset.add_asset_codes(assets, AssetCodeType(validated_data["code_type"]))
+        except ValueError as e:
+            raise serializers.ValidationError({"code_type": [str(e)]})
+
+        return {
+            "assets": [asset.id for asset in assets],
+            "code_type": validated_data["code_type"],
+            "asset_codes": asset_codes,
+        }
+
+
+class AssetCodeReserveSerializer(serializers.Serializer):
+    """Reserve Damm32 asset codes to be printed on labels."""
+
+    MAX_CODES = 1000
+
+    count = serializers.IntegerField(min_value=1, max_value=MAX_CODES)
+    prefix = serializers.CharField(required=False, help_text="Prefix of the codes, or the default prefix if unset.")
+    codes = serializers.ListField(child=serializers.CharField(), read_only=True)
+
+    def validate_prefix(self, value: str) -> str:
+        if value not in settings.DAMM32_ASSET_CODE_PREFIXES:
+            raise serializers.ValidationError(f"Invalid asset code prefix: {value}")
+        return value
+
+    def create(self, validated_data: Dict[str, Any]) -> Dict[str, Any]:
+        prefix = validated_data.get("prefix", settings.DAMM32_ASSET_CODE_DEFAULT_PREFIX)
+        try:
+            reservations = AssetCodeReservation.reserve(prefix, validated_data["count"])
+        except ValueError as e:
+            raise serializers.ValidationError({"prefix": [str(e)]})
+
+        return {
+            "count": validated_data["count"],
+            "prefix": prefix,
+            "codes": [reservation.code for reservation in reservations],
+        }
+
+
+class AssetCodeValidationSerializer(serializers.Serializer):
+    """Whether an asset code is valid and in use."""
+
+    code = serializers.CharField(help_text="The code as it was given.")
+    normalised = serializers.CharField(help_text="The code in the form in which it is usually stored.")
+    valid = serializers.BooleanField()
+    error = serializers.CharField(allow_null=True, help_text="Why the code is invalid, if it is.")
+    exists = serializers.BooleanField(help_text="Whether an asset has the code, once normalised.")
+
+
+class AssetCodeValidateSerializer(serializers.Serializer):
+    """Validate many asset codes, and find which of them are in use."""
+
+    MAX_CODES = 5000
+
+    codes = serializers.ListField(
+        child=serializers.CharField(trim_whitespace=False),
+        allow_empty=False,
+        max_length=MAX_CODES,
+        write_only=True,
+    )
+    code_type = serializers.ChoiceField(choices=ASSET_CODE_TYPE_CHOICES, default=AssetCodeType.DAMM32.value)
+    results = AssetCodeValidationSerializer(many=True, read_only=True)
+
+    def create(self, validated_data: Dict[str, Any]) -> Dict[str, Any]:
+        strategy = AssetCodeType(validated_data["code_type"]).get_strategy()
+
+        results = []
+        for code in validated_data["codes"]:
+            normalised = strategy.normalise(code)
+            try:
+                strategy.validate(normalised)
+                error = None
+            except ValidationError as e:
+                error = " ".join(e.messages)
+            results.append({"code": code, "normalised": normalised, "valid": error is None, "error": error})
+
+        existing = set(
+            AssetCode.objects.filter(normalised_code__in={result["normalised"] for result in results})
+            .values_list('normalised_code', flat=True),
+        )
+        for result in results:
+            result["exists"] = result["normalised"] in existing
+
+        return {
+            "code_type": validated_data["code_type"],
+            "results": results,
+        }
+
+
+class AssetCodeSuggestionQuerySerializer(serializers.Serializer):
+    """Query parameters for suggesting corrections to a mistyped asset code."""
+
+    code = serializers.CharField(trim_whitespace=False, help_text="The mistyped asset code.")
+
+
+class AssetCodeSuggestionSerializer(serializers.ModelSerializer):
+    """An asset code that a mistyped code may have been meant to be."""
+
+    asset = AssetLinkSerializer(read_only=True)
+
+    class Meta:
+        model = AssetCode
+        fields = ('code', 'code_type', 'asset')
+
+
+class AssetCodeKeyspaceSerializer(serializers.Serializer):
+    """How many of the Damm32 asset codes with a prefix have been used."""
+
+    prefix = serializers.CharField()
+    capacity = serializers.IntegerField(help_text="The number of codes with the prefix.")
+    assigned = serializers.IntegerField(help_text="The number of codes given to assets.")
+    pooled = serializers.IntegerField(help_text="The number of codes in the pool that have not been reserved.")
+    reserved = serializers.IntegerField(help_text="The number of codes reserved to be printed on labels.")
+    generated = serializers.IntegerField(help_text="How far through the codes sequential generation has reached.")
+    remaining = serializers.IntegerField(help_text="The number of codes that are neither assigned nor pooled.")
+    occupancy = serializers.FloatField(help_text="The fraction of the codes that are assigned or pooled.")
+    nearly_full = serializers.BooleanField(help_text="Whether the prefix is close to running out of codes.")
@@ -1,9 +1,12 @@
+from typing import Dict, Sequence
+
 from rest_framework import serializers
 
 from assets.models import AssetEvent
 
 from .asset import AssetLinkSerializer
 from .changeset import ChangeSetSerializer
+from .mixins import SparseFieldsetMixin
 
 
 class AssetEventWithoutChangeSetSerializer(serializers.ModelSerializer):
@@ -35,7 +38,16 @@ class AssetEventSerializer(AssetEventWithoutChangeSetSerializer):
         fields = ('id', 'changeset', 'event_type', 'event_data')
 
 
-class AssetEventWithAssetSerializer(AssetEventSerializer):
+class AssetEventWithAssetSerializer(SparseFieldsetMixin, AssetEventSerializer):
+
+    select_related_fields = {
+        'changeset': ['changeset__user'],
+        'asset': ['asset'],
+    }
+    expandable_fields: Dict[str, Sequence[str]] = {
+        'changeset': [],
+        'asset': [],
+    }
 
     asset = AssetLinkSerializer(read_only=True)
 
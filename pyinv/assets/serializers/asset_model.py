@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import Any, Dict, Sequence
 
 from rest_framework import serializers
 
@@ -6,6 +6,7 @@ from assets.models import AssetModel, Manufacturer, Node
 from pyinv.api_exceptions import UnableToChangeContainerState
 
 from .manufacturer import ManufacturerLinkSerializer
+from .mixins import SparseFieldsetMixin
 
 
 class AssetModelLinkSerializer(serializers.ModelSerializer):
@@ -16,8 +17,16 @@ class AssetModelLinkSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class AssetModelSerializer(serializers.ModelSerializer):
+class AssetModelSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for AssetModel objects."""
+
+    select_related_fields = {
+        'manufacturer': ['manufacturer'],
+    }
+    expandable_fields: Dict[str, Sequence[str]] = {
+        'manufacturer': [],
+    }
+
     slug = serializers.CharField(allow_null=True, required=False)
     manufacturer = ManufacturerLinkSerializer(read_only=True)
     manufacturer_slug = serializers.SlugRelatedField(
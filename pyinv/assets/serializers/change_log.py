@@ -0,0 +1,48 @@
+from rest_framework import serializers
+
+from assets.models import ChangeLogEntry
+from assets.models.change_log import ChangeCursor
+
+
+class ChangeFeedQuerySerializer(serializers.Serializer):
+    """Query parameters for fetching the changes since a cursor."""
+
+    since = serializers.CharField(
+        required=False,
+        default=ChangeLogEntry.format_cursor((0, 0)),
+        help_text="The cursor of the last page that was fetched. Start from the first change if not given.",
+    )
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=1000,
+        default=100,
+        help_text="The number of changes to read from the log.",
+    )
+
+    def validate_since(self, value: str) -> ChangeCursor:
+        try:
+            return ChangeLogEntry.parse_cursor(value)
+        except ValueError:
+            raise serializers.ValidationError("Invalid cursor.")
+
+
+class ChangeSerializer(serializers.Serializer):
+    """The latest change to an object, and the object as it is now."""
+
+    object_type = serializers.ChoiceField(choices=ChangeLogEntry.ObjectType.choices)
+    id = serializers.UUIDField()  # noqa: A003
+    action = serializers.ChoiceField(choices=['created', 'updated', 'deleted'])
+    timestamp = serializers.DateTimeField()
+    data = serializers.JSONField(  # type: ignore[assignment]
+        allow_null=True,
+        help_text="The object, as it is fetched from its endpoint. Null if it has been deleted.",
+    )
+
+
+class ChangeFeedSerializer(serializers.Serializer):
+    """A page of changes."""
+
+    cursor = serializers.CharField(help_text="Give as since to fetch the changes after this page.")
+    more = serializers.BooleanField(help_text="Whether there are more changes after this page.")
+    next = serializers.URLField(allow_null=True)  # noqa: A003
+    results = ChangeSerializer(many=True)
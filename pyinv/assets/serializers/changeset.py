@@ -1,8 +1,12 @@
+from typing import Dict, Sequence
+
 from accounts.serializers import UserLinkSerializer
 from rest_framework import serializers
 
 from assets.models import ChangeSet
 
+from .mixins import SparseFieldsetMixin
+
 
 class ChangeSetSerializer(serializers.ModelSerializer):
 
@@ -16,7 +20,14 @@ class ChangeSetSerializer(serializers.ModelSerializer):
         fields = ('id', 'timestamp', 'display_name', 'user', 'comment')
 
 
-class ChangeSetSerializerWithCountSerializer(ChangeSetSerializer):
+class ChangeSetSerializerWithCountSerializer(SparseFieldsetMixin, ChangeSetSerializer):
+
+    select_related_fields = {
+        'user': ['user'],
+    }
+    expandable_fields: Dict[str, Sequence[str]] = {
+        'user': [],
+    }
 
     event_count = serializers.IntegerField(read_only=True, source="assetevent_set.count")
 
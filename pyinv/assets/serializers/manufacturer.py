@@ -2,6 +2,8 @@ from rest_framework import serializers
 
 from assets.models import Manufacturer
 
+from .mixins import SparseFieldsetMixin
+
 
 class ManufacturerLinkSerializer(serializers.ModelSerializer):
     """Serializer with enough information to display a link to a manufacturer."""
@@ -13,7 +15,7 @@ class ManufacturerLinkSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class ManufacturerSerializer(ManufacturerLinkSerializer):
+class ManufacturerSerializer(SparseFieldsetMixin, ManufacturerLinkSerializer):
     """Serializer with all information we have about a manufacturer."""
 
     created_at = serializers.DateTimeField(read_only=True)
@@ -0,0 +1,122 @@
+"""Behaviour shared by serializers."""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, TypeVar
+
+from django.db import models
+from rest_framework import serializers
+
+_M = TypeVar('_M', bound=models.Model)
+
+
+class EagerLoadingMixin:
+    """
+    Declare the joins and prefetches that the fields of a serializer need.
+
+    Views build their querysets with ``setup_eager_loading``, so that a page
+    of results is fetched with the same number of queries however long it is.
+    """
+
+    # Relations to join, or to prefetch, for each field that is serialized.
+    select_related_fields: Dict[str, Sequence[str]] = {}
+    prefetch_related_fields: Dict[str, Sequence[str]] = {}
+
+    @classmethod
+    def setup_eager_loading(
+        cls,
+        queryset: 'models.QuerySet[_M]',
+        fields: Optional[Iterable[str]] = None,
+    ) -> 'models.QuerySet[_M]':
+        """Join and prefetch the relations read by the fields, or by every field of the serializer."""
+        fields = list(getattr(cls, 'Meta').fields if fields is None else fields)
+        select_related = {
+            relation: None for field in fields for relation in cls.select_related_fields.get(field, ())
+        }
+        prefetch_related = {
+            relation: None for field in fields for relation in cls.prefetch_related_fields.get(field, ())
+        }
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+
+class SparseFieldsetMixin(EagerLoadingMixin):
+    """
+    Let callers choose the fields that are serialized, and the relations that are nested.
+
+    ``fields`` limits the serializer to the named fields. The relations in
+    ``expandable_fields`` are nested in full, unless ``expand`` is given, in
+    which case only the named relations are nested and the rest are
+    collapsed to their primary keys. The same arguments are given to
+    ``setup_eager_loading``, so that fields which are not serialized are not
+    fetched either.
+    """
+
+    # Relations that can be collapsed to their primary key, and the relations to join to read it.
+    expandable_fields: Dict[str, Sequence[str]] = {}
+
+    def __init__(
+        self,
+        *args: Any,
+        fields: Optional[Sequence[str]] = None,
+        expand: Optional[Sequence[str]] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        serializer_fields: Dict[str, serializers.Field] = getattr(self, 'fields')
+
+        if fields is not None:
+            if unknown := sorted(set(fields) - set(serializer_fields)):
+                raise serializers.ValidationError({'fields': [f"Unknown fields: {', '.join(unknown)}."]})
+            for name in set(serializer_fields) - set(fields):
+                serializer_fields.pop(name)
+
+        if expand is not None:
+            if unknown := sorted(set(expand) - set(self.expandable_fields)):
+                raise serializers.ValidationError({'expand': [f"Unknown relations: {', '.join(unknown)}."]})
+            for name in set(self.expandable_fields) & set(serializer_fields) - set(expand):
+                collapsed: serializers.Field = serializers.PrimaryKeyRelatedField(read_only=True)
+                if serializer_fields[name].source != name:
+                    collapsed.source = serializer_fields[name].source
+                serializer_fields[name] = collapsed
+
+    @classmethod
+    def setup_eager_loading(
+        cls,
+        queryset: 'models.QuerySet[_M]',
+        fields: Optional[Iterable[str]] = None,
+        expand: Optional[Iterable[str]] = None,
+    ) -> 'models.QuerySet[_M]':
+        """Join and prefetch the relations read by the fields, joining collapsed relations only for their keys."""
+        fields = list(getattr(cls, 'Meta').fields if fields is None else fields)
+        if expand is None:
+            return super().setup_eager_loading(queryset, fields)
+
+        collapsed = set(cls.expandable_fields) - set(expand)
+        select_related = [
+            relation for field in fields if field in collapsed for relation in cls.expandable_fields[field]
+        ]
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        return super().setup_eager_loading(queryset, [field for field in fields if field not in collapsed])
+
+
+class SparseFieldsetQuerySerializer(serializers.Serializer):
+    """Query parameters for choosing the fields of the results."""
+
+    fields = serializers.CharField(  # type: ignore[assignment]
+        required=False,
+        help_text="Comma separated fields to include in the results, instead of every field.",
+    )
+    expand = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        help_text="Comma separated relations to nest in full. Other relations are given as their primary keys.",
+    )
+
+    def validate_fields(self, value: str) -> List[str]:
+        return [field.strip() for field in value.split(',') if field.strip()]
+
+    def validate_expand(self, value: str) -> List[str]:
+        return [field.strip() for field in value.split(',') if field.strip()]
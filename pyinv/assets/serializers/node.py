@@ -1,25 +1,89 @@
+from typing import Dict, Sequence
+
 from rest_framework import serializers
 
-from assets.models import Node
+from assets.models import Node, NodeAssetCount
 
 from .asset import AssetSerializer
-from .node_link import NodeLinkSerializer
+from .asset_model import AssetModelLinkSerializer
+from .mixins import SparseFieldsetMixin
+from .node_link import NodeLinkSerializer, NodeListSerializer
 
 
-class NodeSerializer(NodeLinkSerializer):
+class NodeSerializer(SparseFieldsetMixin, NodeLinkSerializer):
     """Serializer for nodes."""
 
+    select_related_fields = {
+        'asset': ['asset__asset_model'],
+    }
+    prefetch_related_fields = {
+        'asset': ['asset__assetcode_set'],
+    }
+    expandable_fields: Dict[str, Sequence[str]] = {
+        'asset': [],
+    }
+
     name = serializers.CharField()
     asset = AssetSerializer(read_only=True)
 
     ancestors = serializers.ListField(child=NodeLinkSerializer(), read_only=True)
     depth = serializers.IntegerField(read_only=True)
+    location_path = serializers.CharField(read_only=True)
+    location_ids = serializers.ListField(child=serializers.UUIDField(), read_only=True)
 
     class Meta:
         model = Node
+        list_serializer_class = NodeListSerializer
         fields = NodeLinkSerializer.Meta.fields + (
             'name',
             'asset',
             'depth',
             'ancestors',
+            'location_path',
+            'location_ids',
         )
+
+
+class NodeTreeSerializer(NodeLinkSerializer):
+    """Serializer for a node and its nested children."""
+
+    name = serializers.CharField(read_only=True)
+    asset = AssetSerializer(read_only=True)
+    depth = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Node
+        fields = NodeLinkSerializer.Meta.fields + (
+            'name',
+            'asset',
+            'depth',
+            'children',
+        )
+
+    def get_fields(self) -> Dict[str, serializers.Field]:
+        fields = super().get_fields()
+        fields['children'] = NodeTreeSerializer(many=True, read_only=True)
+        return fields
+
+
+class NodeTreeQuerySerializer(serializers.Serializer):
+    """Query parameters for fetching a subtree of nodes."""
+
+    depth = serializers.IntegerField(min_value=1, default=1, help_text="Number of levels of children to include.")
+
+
+class NodeAssetCountSerializer(serializers.ModelSerializer):
+
+    asset_model = AssetModelLinkSerializer(read_only=True)
+    count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = NodeAssetCount
+        fields = ('asset_model', 'count')
+
+
+class NodeSummarySerializer(serializers.Serializer):
+    """Summary of the assets below a node."""
+
+    asset_count = serializers.IntegerField(read_only=True)
+    asset_models = NodeAssetCountSerializer(many=True, read_only=True)
@@ -1,8 +1,21 @@
+from typing import Any, List, Union
+
+from django.db import models
 from rest_framework import serializers
 
 from assets.models import Node, NodeType
 
 
+class NodeListSerializer(serializers.ListSerializer):
+    """Resolve the ancestors of every node in the list with a single query."""
+
+    def to_representation(self, data: Union[models.Manager, models.QuerySet, List[Node]]) -> List[Any]:
+        nodes = list(data.all() if isinstance(data, models.Manager) else data)
+        if 'ancestors' in getattr(self.child, 'fields', {}):
+            Node.prefetch_ancestors(nodes)
+        return super().to_representation(nodes)
+
+
 class NodeLinkSerializer(serializers.ModelSerializer):
     """Serializer with enough information to link to a node."""
 
@@ -0,0 +1,88 @@
+from typing import Any, Dict, List
+from uuid import UUID
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from assets.models import AssetEvent, ChangeSet, Node
+
+from .changeset import ChangeSetSerializer
+
+
+class NodeBulkMoveSerializer(serializers.Serializer):
+    """Move many nodes to a new parent, recording the move in a changeset."""
+
+    nodes = serializers.ListField(child=serializers.UUIDField(), allow_empty=False)
+    target = serializers.UUIDField()
+    comment = serializers.CharField(default="", allow_blank=True)
+    changeset = ChangeSetSerializer(read_only=True, allow_null=True)
+
+    def validate_nodes(self, value: List[UUID]) -> List[Node]:
+        nodes = Node.objects.in_bulk(value)
+        missing = {str(pk) for pk in value if pk not in nodes}
+        if missing:
+            raise serializers.ValidationError(f"Nodes do not exist: {', '.join(sorted(missing))}")
+        return list(nodes.values())
+
+    def validate_target(self, value: UUID) -> Node:
+        try:
+            return Node.objects.get(pk=value)
+        except Node.DoesNotExist:
+            raise serializers.ValidationError("Node does not exist.")
+
+    def create(self, validated_data: Dict[str, Any]) -> Dict[str, Any]:
+        target = validated_data["target"]
+        with transaction.atomic():
+            try:
+                moves = Node.bulk_move(validated_data["nodes"], target)
+            except ValueError as e:
+                raise serializers.ValidationError({"target": [str(e)]})
+
+            events = [
+                AssetEvent(
+                    event_type=AssetEvent.AssetEventType.MOVE,
+                    asset_id=node.asset_id,
+                    data={
+                        "old": str(old_parent.id) if old_parent else None,
+                        "new": str(target.id),
+                    },
+                )
+                for node, old_parent in moves
+                if node.asset_id is not None
+            ]
+            # The assets inside the moved nodes have moved along with them.
+            moved = {node.path: (node, old_parent) for node, old_parent in moves}
+            descendants = Node.objects.filter(
+                Node.get_path_descendants_filter([node for node, _ in moves]),
+                asset__isnull=False,
+            )
+            for path, asset_id in descendants.values_list('path', 'asset_id'):
+                node, old_parent = moved[path[:len(target.path) + Node.steplen]]
+                events.append(AssetEvent(
+                    event_type=AssetEvent.AssetEventType.MOVE,
+                    asset_id=asset_id,
+                    data={
+                        "old": str(old_parent.id) if old_parent else None,
+                        "new": str(target.id),
+                        "moved_with": str(node.id),
+                    },
+                ))
+
+            changeset = None
+            if events:
+                changeset = ChangeSet.objects.create(
+                    user=self.context["request"].user,
+                    comment=validated_data["comment"],
+                    timestamp=timezone.now(),
+                )
+                for event in events:
+                    event.changeset = changeset
+                AssetEvent.objects.bulk_create(events)
+
+        return {
+            "nodes": [node.id for node, _ in moves],
+            "target": target.id,
+            "comment": validated_data["comment"],
+            "changeset": changeset,
+        }
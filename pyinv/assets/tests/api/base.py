@@ -1,9 +1,11 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from django.contrib.auth.models import Permission, User
 from django.utils import dateparse
 
+from pyinv.tests.client import Client
+
 
 class PermissionsMixin:
 
@@ -31,6 +33,22 @@ class APITestCase(PermissionsMixin):
         self.assert_valid_timestamps(data)
         assert isinstance(data["extra_data"], dict)
 
+    def assert_like_asset_with_location(self, data: Dict[str, Any]) -> None:
+        assert data.keys() == {
+            'id', 'display_name', 'asset_model', 'asset_codes', 'first_asset_code',
+            'created_at', 'updated_at', 'extra_data', 'node', 'location_path',
+        }
+        assert UUID(data["id"])
+        assert isinstance(data["display_name"], str)
+        self.assert_like_asset_model_link(data["asset_model"])
+        assert isinstance(data["asset_codes"], list)
+        self.assert_valid_timestamps(data)
+        if data["node"] is None:
+            assert data["location_path"] is None
+        else:
+            assert data["node"].keys() == {'id', 'display_name', 'node_type', 'numchild', 'is_container', 'parent'}
+            assert isinstance(data["location_path"], str)
+
     def assert_like_asset_link(self, data: Dict[str, Any]) -> None:
         assert data.keys() == {'id', 'display_name'}
         assert UUID(data["id"])
@@ -88,6 +106,7 @@ class APITestCase(PermissionsMixin):
         assert data.keys() == {
             'id', 'display_name', 'node_type', 'numchild',
             'is_container', 'name', 'asset', 'depth', 'ancestors',
+            'location_path', 'location_ids',
         }
         assert UUID(data["id"])
         assert isinstance(data["display_name"], str)
@@ -96,6 +115,8 @@ class APITestCase(PermissionsMixin):
         assert isinstance(data["numchild"], int)
         assert isinstance(data["depth"], int)
         assert isinstance(data["ancestors"], list)
+        assert isinstance(data["location_path"], str)
+        assert isinstance(data["location_ids"], list)
 
         if data["asset"]:
             self.assert_like_asset(data["asset"])
@@ -110,6 +131,8 @@ class APITestCase(PermissionsMixin):
         assert data["node_type"] == "A" or data["display_name"] == data["name"]
         assert data["numchild"] == 0 or data["is_container"]
         assert data["depth"] - 1 == len(data["ancestors"])
+        assert data["location_ids"] == [ancestor["id"] for ancestor in data["ancestors"]]
+        assert data["location_path"] == " / ".join(ancestor["display_name"] for ancestor in data["ancestors"])
 
     def assert_like_user_link(self, data: Dict[str, Any]) -> None:
         assert data.keys() == {'username', 'display_name'}
@@ -144,3 +167,21 @@ class APITestCase(PermissionsMixin):
     def assert_valid_timestamps(self, data: Dict[str, Any]) -> None:
         assert dateparse.parse_datetime(data["updated_at"]) is not None
         assert dateparse.parse_datetime(data["created_at"]) is not None
+
+    def walk_cursor_pages(
+        self,
+        api_client: Client,
+        url: str,
+        params: Dict[str, str],
+    ) -> List[List[Dict[str, Any]]]:
+        """Follow the next links from the first cursor page, and return every page."""
+        pages = []
+        next_url: Optional[str] = url
+        query: Optional[Dict[str, str]] = {"cursor": "", **params}
+        while next_url is not None:
+            response = api_client.get(next_url, query)
+            assert response.status_code == 200
+            data = response.json()
+            pages.append(data["results"])
+            next_url, query = data["next"], None
+        return pages
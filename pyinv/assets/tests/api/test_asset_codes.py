@@ -0,0 +1,158 @@
+from typing import Callable, ContextManager
+
+import pytest
+from django.contrib.auth.models import User
+
+from assets.asset_codes import AssetCodeType
+from assets.models import Asset, AssetCodeReservation
+from assets.serializers import AssetCodeValidateSerializer
+from pyinv.tests.client import Client
+
+from .base import APITestCase
+
+
+@pytest.mark.django_db
+class TestAssetCodeReserveEndpoint(APITestCase):
+
+    _subject = "/api/v1/asset-codes/reserve/"
+    _permission = "add_assetcode"
+
+    def test_reserve_no_auth(self, api_client: Client) -> None:
+        resp = api_client.post(self._subject)
+        assert resp.status_code == 403
+
+    def test_reserve_no_permissions(self, user_client: Client) -> None:
+        resp = user_client.post(self._subject)
+        assert resp.status_code == 403
+
+    def test_reserve_bad_request(self, user_client: Client, user: User) -> None:
+        self._set_permission(user)
+        resp = user_client.post(self._subject, {"count": 0, "prefix": "BEE"}, format="json")
+        assert resp.status_code == 400
+        assert resp.json().keys() == {"count", "prefix"}
+
+    def test_reserve(self, user_client: Client, user: User) -> None:
+        self._set_permission(user)
+        AssetCodeReservation.fill("INV", 10)
+
+        resp = user_client.post(self._subject, {"count": 4}, format="json")
+        assert resp.status_code == 200
+
+        result = resp.json()
+        assert result["prefix"] == "INV"
+        assert len(set(result["codes"])) == 4
+        assert set(
+            AssetCodeReservation.objects.filter(reserved_at__isnull=False).values_list('code', flat=True),
+        ) == set(result["codes"])
+        assert AssetCodeReservation.get_available("INV").count() == 6
+
+
+@pytest.mark.django_db
+class TestAssetCodeKeyspaceEndpoint:
+
+    _subject = "/api/v1/asset-codes/keyspace/"
+
+    def test_keyspace(self, api_client: Client) -> None:
+        AssetCodeReservation.fill("INV", 10)
+
+        resp = api_client.get(self._subject)
+        assert resp.status_code == 200
+        assert resp.json() == [{
+            "prefix": "INV",
+            "capacity": 2 ** 25,
+            "assigned": 0,
+            "pooled": 10,
+            "reserved": 0,
+            "generated": 10,
+            "remaining": 2 ** 25 - 10,
+            "occupancy": 10 / 2 ** 25,
+            "nearly_full": False,
+        }]
+
+
+@pytest.mark.django_db
+class TestAssetCodeValidateEndpoint(APITestCase):
+
+    _subject = "/api/v1/asset-codes/validate/"
+    _permission = "view_assetcode"
+
+    def test_validate_no_auth(self, api_client: Client) -> None:
+        resp = api_client.post(self._subject)
+        assert resp.status_code == 403
+
+    def test_validate_no_permissions(self, user_client: Client) -> None:
+        resp = user_client.post(self._subject)
+        assert resp.status_code == 403
+
+    def test_validate_bad_request(self, user_client: Client, user: User) -> None:
+        self._set_permission(user)
+        resp = user_client.post(self._subject, {"codes": [], "code_type": "Z"}, format="json")
+        assert resp.status_code == 400
+        assert resp.json().keys() == {"codes", "code_type"}
+
+    def test_validate(
+        self,
+        user_client: Client,
+        user: User,
+        asset: Asset,
+        django_assert_max_num_queries: Callable[[int], ContextManager[None]],
+    ) -> None:
+        self._set_permission(user)
+        asset.add_asset_code(AssetCodeType.DAMM32, "INV-DRE-XY2")
+
+        with django_assert_max_num_queries(3):
+            resp = user_client.post(
+                self._subject,
+                {"codes": ["inv-dre-xy2", "INVZI3T5X", "INV-DRE-XYZ"]},
+                format="json",
+            )
+        assert resp.status_code == 200
+        assert resp.json() == {
+            "code_type": "D",
+            "results": [
+                {"code": "inv-dre-xy2", "normalised": "INV-DRE-XY2", "valid": True, "error": None, "exists": True},
+                {"code": "INVZI3T5X", "normalised": "INV-ZI3-T5X", "valid": True, "error": None, "exists": False},
+                {
+                    "code": "INV-DRE-XYZ",
+                    "normalised": "INV-DRE-XYZ",
+                    "valid": False,
+                    "error": "Invalid asset code check digit. 2",
+                    "exists": False,
+                },
+            ],
+        }
+
+    def test_validate_many(self, user_client: Client, user: User) -> None:
+        self._set_permission(user)
+        codes = [f"{index:04d}" for index in range(AssetCodeValidateSerializer.MAX_CODES)]
+
+        resp = user_client.post(self._subject, {"codes": codes, "code_type": "A"}, format="json")
+        assert resp.status_code == 200
+        assert [result["valid"] for result in resp.json()["results"]] == [True] * len(codes)
+
+
+@pytest.mark.django_db
+class TestAssetCodeSuggestionsEndpoint(APITestCase):
+
+    _subject = "/api/v1/asset-codes/suggestions/"
+
+    def test_suggestions_bad_request(self, api_client: Client) -> None:
+        resp = api_client.get(self._subject)
+        assert resp.status_code == 400
+        assert resp.json().keys() == {"code"}
+
+    def test_suggestions(self, api_client: Client, asset: Asset) -> None:
+        asset.add_asset_code(AssetCodeType.DAMM32, "INV-ASE-SEJ")
+
+        resp = api_client.get(self._subject, {"code": "inv-ase-sek"})
+        assert resp.status_code == 200
+        assert resp.json() == [{
+            "code": "INV-ASE-SEJ",
+            "code_type": "D",
+            "asset": {"id": str(asset.id), "display_name": "Foo Model (INV-ASE-SEJ)"},
+        }]
+
+    def test_suggestions_none(self, api_client: Client) -> None:
+        resp = api_client.get(self._subject, {"code": "bees"})
+        assert resp.status_code == 200
+        assert resp.json() == []
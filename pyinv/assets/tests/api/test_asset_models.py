@@ -3,7 +3,7 @@ from typing import Any, Dict, Optional
 import pytest
 from django.contrib.auth.models import User
 
-from assets.models import AssetModel, Manufacturer
+from assets.models import Asset, AssetModel, Manufacturer
 from pyinv.tests.client import Client
 
 from .base import APITestCase
@@ -167,6 +167,44 @@ class TestAssetModelGetIndividualEndpoint(APITestCase):
         self.assert_like_asset_model(result)
         assert result["name"] == asset_model.name
 
+    def test_fetch_not_modified(self, api_client: Client, asset_model: AssetModel) -> None:
+        list_etag = api_client.get("/api/v1/asset-models/")["ETag"]
+        etag = api_client.get(f"{self._subject}/foo-model/")["ETag"]
+        assert api_client.get(f"{self._subject}/foo-model/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+        assert api_client.get("/api/v1/asset-models/", HTTP_IF_NONE_MATCH=list_etag).status_code == 304
+
+        # Adding an asset changes the asset count of the model, but not the model.
+        Asset.objects.create(asset_model=asset_model)
+        assert api_client.get(f"{self._subject}/foo-model/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+        assert api_client.get("/api/v1/asset-models/", HTTP_IF_NONE_MATCH=list_etag).status_code == 200
+
+    def test_fetch_modified_by_asset_model_change(
+        self,
+        api_client: Client,
+        asset_model: AssetModel,
+        container_model: AssetModel,
+    ) -> None:
+        asset = Asset.objects.create(asset_model=asset_model)
+        list_etag = api_client.get("/api/v1/asset-models/")["ETag"]
+        etag = api_client.get(f"{self._subject}/bar-model/")["ETag"]
+
+        # The total number of assets is the same, but each model has a different number.
+        asset.asset_model = container_model
+        asset.save()
+        assert api_client.get("/api/v1/asset-models/", HTTP_IF_NONE_MATCH=list_etag).status_code == 200
+        assert api_client.get(f"{self._subject}/bar-model/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_fetch_modified_by_manufacturer_rename(self, api_client: Client, asset_model: AssetModel) -> None:
+        list_etag = api_client.get("/api/v1/asset-models/")["ETag"]
+        etag = api_client.get(f"{self._subject}/foo-model/")["ETag"]
+
+        asset_model.manufacturer.name = "Renamed Manufacturer"
+        asset_model.manufacturer.save()
+        assert api_client.get("/api/v1/asset-models/", HTTP_IF_NONE_MATCH=list_etag).status_code == 200
+        resp = api_client.get(f"{self._subject}/foo-model/", HTTP_IF_NONE_MATCH=etag)
+        assert resp.status_code == 200
+        assert resp.json()["manufacturer"]["name"] == "Renamed Manufacturer"
+
 
 @pytest.mark.django_db
 @pytest.mark.usefixtures("asset_model")
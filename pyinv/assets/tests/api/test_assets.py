@@ -1,8 +1,11 @@
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Union
+from uuid import uuid4
 
 import pytest
+from django.contrib.auth.models import User
 
-from assets.models import Asset
+from assets.asset_codes import AssetCodeType, Damm32AssetCodeStrategy
+from assets.models import Asset, AssetModel, ChangeSet, Manufacturer, Node
 from pyinv.tests.client import Client
 
 from .base import APITestCase
@@ -63,6 +66,112 @@ class TestAssetListEndpoint(APITestCase):
         assert data["previous"] is not None
         assert len(data["results"]) == 1
 
+    def test_page_queries(
+        self,
+        api_client: Client,
+        container: Asset,
+        asset_model: AssetModel,
+        django_assert_num_queries: Callable[[int], ContextManager[None]],
+    ) -> None:
+        root = Node.add_root(node_type="A", asset=container)
+        assets = Asset.objects.bulk_create(Asset(asset_model=asset_model) for _ in range(100))
+        for asset in assets:
+            root.add_child(node_type="A", asset=asset)
+        Asset.add_asset_codes(assets, AssetCodeType.DAMM32)
+
+        # Count, assets with their models and nodes, asset codes, node parents
+        with django_assert_num_queries(4):
+            data = self._subject(api_client, params={"limit": "100"})
+        assert len(data["results"]) == 100
+        for result in data["results"]:
+            if result["id"] != str(container.id):
+                assert result["asset_model"] == {"name": asset_model.name, "slug": asset_model.slug}
+                assert len(result["asset_codes"]) == 2
+                assert result["node"]["parent"]["id"] == str(root.id)
+
+    def test_cursor_pages(self, api_client: Client, asset_model: AssetModel) -> None:
+        assets = Asset.objects.bulk_create(Asset(asset_model=asset_model) for _ in range(5))
+
+        pages = self.walk_cursor_pages(api_client, "/api/v1/assets/", {"limit": "2"})
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert [result["id"] for page in pages for result in page] == sorted(str(asset.id) for asset in assets)
+
+    def test_cursor_previous_page(self, api_client: Client, asset_model: AssetModel) -> None:
+        Asset.objects.bulk_create(Asset(asset_model=asset_model) for _ in range(5))
+        first = self._subject(api_client, params={"cursor": "", "limit": "2"})
+        assert first["count"] is None
+        assert first["previous"] is None
+
+        second = api_client.get(first["next"]).json()
+        assert second["previous"] is not None
+        previous = api_client.get(second["previous"]).json()
+        assert previous["results"] == first["results"]
+        assert previous["previous"] is None
+        assert previous["next"] is not None
+
+    def test_cursor_ordering_ties(self, api_client: Client, asset_model: AssetModel) -> None:
+        # Every asset has the same display name, so they are only ordered by id.
+        assets = Asset.objects.bulk_create(Asset(asset_model=asset_model) for _ in range(5))
+
+        pages = self.walk_cursor_pages(api_client, "/api/v1/assets/", {"limit": "2", "ordering": "-display_name"})
+        assert sorted(result["id"] for page in pages for result in page) == sorted(str(asset.id) for asset in assets)
+
+    def test_invalid_cursor(self, api_client: Client) -> None:
+        data = self._subject(api_client, expected_status=404, params={"cursor": "bees"})
+        assert data == {"detail": "Invalid cursor."}
+
+    @pytest.mark.usefixtures("asset", "container")
+    def test_count_modes(self, api_client: Client) -> None:
+        data = self._subject(api_client, params={"count": "none", "limit": "1"})
+        assert data["count"] is None
+        assert data["next"] is not None
+        assert len(data["results"]) == 1
+
+        data = self._subject(api_client, params={"count": "none", "limit": "1", "offset": "1"})
+        assert data["next"] is None
+
+        # Only PostgreSQL can estimate, so SQLite counts exactly.
+        data = self._subject(api_client, params={"count": "estimate", "cursor": ""})
+        assert data["count"] == 2
+
+        data = self._subject(api_client, expected_status=400, params={"count": "bees"})
+        assert data == {"count": ["Must be one of: exact, estimate, none."]}
+
+    def test_sparse_fieldset_queries(
+        self,
+        api_client: Client,
+        asset_model: AssetModel,
+        django_assert_num_queries: Callable[[int], ContextManager[None]],
+    ) -> None:
+        assets = Asset.objects.bulk_create(Asset(asset_model=asset_model) for _ in range(10))
+        Asset.add_asset_codes(assets, AssetCodeType.DAMM32)
+
+        # Count, assets
+        with django_assert_num_queries(2):
+            data = self._subject(api_client, params={"fields": "id,display_name"})
+        assert len(data["results"]) == 10
+        for result in data["results"]:
+            assert set(result) == {"id", "display_name"}
+
+    def test_collapsed_relations(self, api_client: Client, container_with_child: Asset) -> None:
+        data = self._subject(api_client, params={"fields": "id,asset_model,node", "expand": ""})
+        for result in data["results"]:
+            asset = Asset.objects.get(pk=result["id"])
+            assert result["asset_model"] == str(asset.asset_model_id)
+            assert result["node"] == str(asset.node.id)
+
+        data = self._subject(api_client, params={"fields": "id,asset_model,node", "expand": "asset_model"})
+        for result in data["results"]:
+            self.assert_like_asset_model_link(result["asset_model"])
+            assert isinstance(result["node"], str)
+
+    def test_unknown_sparse_fields(self, api_client: Client) -> None:
+        data = self._subject(api_client, expected_status=400, params={"fields": "id,bees"})
+        assert data == {"fields": ["Unknown fields: bees."]}
+
+        data = self._subject(api_client, expected_status=400, params={"expand": "display_name"})
+        assert data == {"expand": ["Unknown relations: display_name."]}
+
     @pytest.mark.usefixtures("container", "container_with_child")
     def test_filter_by_is_container(self, api_client: Client) -> None:
         data = self._subject(api_client, params={"is_container": True})
@@ -89,6 +198,28 @@ class TestAssetListEndpoint(APITestCase):
 
         assert data["results"][0]["display_name"].startswith("Bar Model")
 
+    def test_filter_by_extra_data(self, api_client: Client, asset_model: AssetModel) -> None:
+        Asset.objects.create(asset_model=asset_model, extra_data={"serial": "XYZ", "ports": 4})
+        Asset.objects.create(asset_model=asset_model, extra_data={"serial": "ABC", "power": {"voltage": 12}})
+        Asset.objects.create(asset_model=asset_model, extra_data={"serial": "4"})
+        Asset.objects.create(asset_model=asset_model)
+
+        assert self._subject(api_client, params={"extra_data__serial": "XYZ"})["count"] == 1
+        assert self._subject(api_client, params={"extra_data__serial": "xyz"})["count"] == 0
+        assert self._subject(api_client, params={"extra_data__ports": "4"})["count"] == 1
+        assert self._subject(api_client, params={"extra_data__serial": "4"})["count"] == 1
+        assert self._subject(api_client, params={"extra_data__power__voltage": "12"})["count"] == 1
+        assert self._subject(api_client, params={"extra_data__has_key": "power"})["count"] == 1
+        assert self._subject(api_client, params={"extra_data__has_key": "serial"})["count"] == 3
+
+        response = api_client.get("/api/v1/assets/", {"extra_data__serial": ["XYZ", "ABC"]})
+        assert response.json()["count"] == 2
+
+    @pytest.mark.usefixtures("asset")
+    def test_filter_by_invalid_extra_data_key(self, api_client: Client) -> None:
+        data = self._subject(api_client, params={"extra_data__serial-no": "XYZ"})
+        assert data["count"] == 1
+
     @pytest.mark.usefixtures("asset_with_code", "container")
     def test_find_by_asset_code(self, api_client: Client) -> None:
         data = self._subject(api_client, params={"asset_code": "asset-code"})
@@ -100,6 +231,13 @@ class TestAssetListEndpoint(APITestCase):
         assert data["results"][0]["display_name"].startswith("Foo Model")
 
     @pytest.mark.usefixtures("asset_with_code", "container")
+    def test_find_by_normalised_asset_code(self, api_client: Client, asset: Asset) -> None:
+        asset.add_asset_code(AssetCodeType.DAMM32, "INV-ASE-SEJ")
+
+        data = self._subject(api_client, params={"asset_code": " invasesej "})
+        assert data["count"] == 1
+        assert data["results"][0]["id"] == str(asset.id)
+
     def test_find_by_asset_code_no_results(self, api_client: Client) -> None:
         data = self._subject(api_client, params={"asset_code": "bees"})
         assert data["count"] == 0
@@ -138,12 +276,68 @@ class TestAssetListEndpoint(APITestCase):
     @pytest.mark.usefixtures("named_container_with_child")
     def test_search_by_node_name(self, api_client: Client) -> None:
         data = self._subject(api_client, params={"search": "node-name"})
-        assert data["count"] == 1
+        assert data["count"] == 2
         assert data["next"] is None
         assert data["previous"] is None
-        assert len(data["results"]) == 1
+        assert len(data["results"]) == 2
+
+        # The child is found by its location.
+        assert "node-name" in {result["display_name"] for result in data["results"]}
+
+    def test_search_ranking(self, api_client: Client, location: Node) -> None:
+        manufacturer = Manufacturer.objects.create(name="Acme")
+        widget = Asset.objects.create(asset_model=AssetModel.objects.create(name="Widget", manufacturer=manufacturer))
+        shelf = Asset.objects.create(asset_model=AssetModel.objects.create(name="Shelf", manufacturer=manufacturer))
+        location.name = "Widget Store"
+        location.save()
+        location.add_child(node_type="A", asset=shelf)
+
+        data = self._subject(api_client, params={"search": "WIDGET"})
+        assert [result["id"] for result in data["results"]] == [str(widget.id), str(shelf.id)]
+
+        data = self._subject(api_client, params={"search": "acme widget"})
+        assert data["count"] == 2
+
+        data = self._subject(api_client, params={"search": "widget ac"})
+        assert data["count"] == 2
 
-        assert data["results"][0]["display_name"] == "node-name"
+        data = self._subject(api_client, params={"search": "shelf store"})
+        assert [result["id"] for result in data["results"]] == [str(shelf.id)]
+
+        data = self._subject(api_client, params={"search": "widget", "ordering": "display_name"})
+        assert [result["id"] for result in data["results"]] == [str(shelf.id), str(widget.id)]
+
+    def test_not_modified(
+        self,
+        api_client: Client,
+        asset: Asset,
+        django_assert_num_queries: Callable[[int], ContextManager[None]],
+    ) -> None:
+        resp = api_client.get("/api/v1/assets/")
+        etag = resp["ETag"]
+        assert etag.startswith('W/"')
+        assert resp["Cache-Control"] == "no-cache"
+
+        with django_assert_num_queries(1):
+            resp = api_client.get("/api/v1/assets/", HTTP_IF_NONE_MATCH=etag)
+        assert resp.status_code == 304
+        assert resp["ETag"] == etag
+        resp = api_client.get("/api/v1/assets/", HTTP_IF_MODIFIED_SINCE=resp["Last-Modified"])
+        assert resp.status_code == 304
+
+        # Filtering, adding and changing assets all change the version.
+        assert api_client.get("/api/v1/assets/", {"search": "bees"}, HTTP_IF_NONE_MATCH=etag).status_code == 200
+        asset.save()
+        assert api_client.get("/api/v1/assets/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+        etag = api_client.get("/api/v1/assets/")["ETag"]
+        Asset.objects.create(asset_model=asset.asset_model)
+        assert api_client.get("/api/v1/assets/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_search_cursor_pages(self, api_client: Client, asset_model: AssetModel) -> None:
+        assets = [Asset.objects.create(asset_model=asset_model) for _ in range(5)]
+        pages = self.walk_cursor_pages(api_client, "/api/v1/assets/", {"search": "foo", "limit": "2"})
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert sorted(result["id"] for page in pages for result in page) == sorted(str(asset.id) for asset in assets)
 
 
 @pytest.mark.django_db
@@ -162,3 +356,322 @@ class TestAssetGetIndividualEndpoint(APITestCase):
 
         result = resp.json()
         self.assert_like_asset_with_node(result)
+
+    def test_fetch_not_modified(self, api_client: Client, asset: Asset) -> None:
+        resp = api_client.get(f"{self._subject}/{asset.id}/")
+        etag = resp["ETag"]
+        assert api_client.get(f"{self._subject}/{asset.id}/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+        assert api_client.get(f"{self._subject}/{asset.id}/", HTTP_IF_NONE_MATCH='W/"other"').status_code == 200
+        resp = api_client.get(f"{self._subject}/{asset.id}/", HTTP_IF_MODIFIED_SINCE=resp["Last-Modified"])
+        assert resp.status_code == 304
+
+        asset.save()
+        assert api_client.get(f"{self._subject}/{asset.id}/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_fetch_modified_by_related_changes(self, api_client: Client, container_with_child: Asset) -> None:
+        asset = container_with_child.node.get_children().get().asset
+        asset_model = asset.asset_model
+        parent = container_with_child.node
+
+        def rename_model() -> None:
+            asset_model.name = "Renamed Model"
+            asset_model.save()
+
+        def rename_manufacturer() -> None:
+            asset_model.manufacturer.name = "Renamed Manufacturer"
+            asset_model.manufacturer.save()
+
+        def rename_parent() -> None:
+            parent.name = "Box"
+            parent.save()
+
+        # Each change alters how the asset is shown without saving it.
+        changes: List[Callable[[], Any]] = [
+            lambda: asset.assetcode_set.create(code_type="A", code="asset-code"),
+            lambda: asset.assetcode_set.get().delete(),
+            rename_model,
+            rename_manufacturer,
+            rename_parent,
+            lambda: parent.add_child(node_type="L", name="Shelf"),
+        ]
+        for change in changes:
+            urls = [f"{self._subject}/{asset.id}/", f"{self._subject}/"]
+            etags = [api_client.get(url)["ETag"] for url in urls]
+            change()
+            for url, etag in zip(urls, etags):
+                assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_fetch_sparse_fieldset(self, api_client: Client, asset: Asset) -> None:
+        resp = api_client.get(f"{self._subject}/{asset.id}/", {"fields": "id,asset_model", "expand": ""})
+        assert resp.status_code == 200
+        assert resp.json() == {"id": str(asset.id), "asset_model": str(asset.asset_model_id)}
+
+
+@pytest.mark.django_db
+class TestAssetByCodeEndpoint(APITestCase):
+
+    _subject = "/api/v1/assets/by-code"
+
+    def test_fetch_not_exists(self, api_client: Client) -> None:
+        resp = api_client.get(f"{self._subject}/INV-ASE-SEJ/")
+        assert resp.status_code == 404
+        assert resp.json() == {'detail': 'No asset has the code INV-ASE-SEJ.'}
+
+    @pytest.mark.parametrize("code", ["INV-ASE-SEJ", "inv-ase-sej", "invasesej", " INVASESEJ "])
+    def test_fetch(
+        self,
+        api_client: Client,
+        container_with_child: Asset,
+        code: str,
+        django_assert_max_num_queries: Callable[[int], ContextManager[None]],
+    ) -> None:
+        asset = container_with_child.node.get_children()[0].asset
+        asset.add_asset_code(AssetCodeType.DAMM32, "INV-ASE-SEJ")
+
+        with django_assert_max_num_queries(3):
+            resp = api_client.get(f"{self._subject}/{code}/")
+        assert resp.status_code == 200
+
+        result = resp.json()
+        self.assert_like_asset_with_location(result)
+        assert result["id"] == str(asset.id)
+        assert result["node"]["parent"]["id"] == str(container_with_child.node.id)
+        assert result["location_path"] == container_with_child.display_name
+
+    def test_fetch_without_node(self, api_client: Client, asset: Asset) -> None:
+        asset.add_asset_code(AssetCodeType.SROBO, "sr2UT29")
+
+        resp = api_client.get(f"{self._subject}/2ut29/")
+        assert resp.status_code == 200
+
+        result = resp.json()
+        assert result["id"] == str(asset.id)
+        assert result["node"] is None
+        assert result["location_path"] is None
+
+
+@pytest.mark.django_db
+class TestAssetResolveEndpoint(APITestCase):
+
+    _subject = "/api/v1/assets/resolve/"
+    _permission = "view_asset"
+
+    def test_resolve_no_auth(self, api_client: Client) -> None:
+        resp = api_client.post(self._subject)
+        assert resp.status_code == 403
+
+    def test_resolve_no_permissions(self, user_client: Client) -> None:
+        resp = user_client.post(self._subject)
+        assert resp.status_code == 403
+
+    def test_resolve_bad_request(self, user_client: Client, user: User) -> None:
+        self._set_permission(user)
+        resp = user_client.post(self._subject, {"codes": []}, format="json")
+        assert resp.status_code == 400
+        assert resp.json().keys() == {"codes"}
+
+    def test_resolve(self, user_client: Client, user: User, container_with_child: Asset, asset: Asset) -> None:
+        self._set_permission(user)
+        child = container_with_child.node.get_children()[0].asset
+        child.add_asset_code(AssetCodeType.DAMM32, "INV-ASE-SEJ")
+
+        codes = ["invasesej", str(asset.id), "bees", str(uuid4()), str(container_with_child.id), "INV-ASE-SEJ"]
+        resp = user_client.post(self._subject, {"codes": codes}, format="json")
+        assert resp.status_code == 200
+
+        results = resp.json()["results"]
+        assert [result["code"] for result in results] == codes
+        assert [result["asset"] and result["asset"]["id"] for result in results] == [
+            str(child.id), str(asset.id), None, None, str(container_with_child.id), str(child.id),
+        ]
+        for result in results:
+            if result["asset"]:
+                self.assert_like_asset_with_location(result["asset"])
+        assert results[0]["asset"]["node"]["parent"]["id"] == str(container_with_child.node.id)
+        assert results[0]["asset"]["location_path"] == container_with_child.display_name
+        assert results[4]["asset"]["node"]["parent"] is None
+
+    def test_resolve_fixed_queries(
+        self,
+        user_client: Client,
+        user: User,
+        container: Asset,
+        asset_model: AssetModel,
+        django_assert_num_queries: Callable[[int], ContextManager[None]],
+    ) -> None:
+        self._set_permission(user)
+        root = Node.add_root(node_type="A", asset=container)
+        assets = Asset.objects.bulk_create(Asset(asset_model=asset_model) for _ in range(20))
+        for asset in assets:
+            root.add_child(node_type="A", asset=asset)
+        Asset.add_asset_codes(assets[:10], AssetCodeType.DAMM32)
+        codes = [asset.first_asset_code for asset in Asset.objects.filter(pk__in=[asset.pk for asset in assets[:10]])]
+        codes += [str(asset.id) for asset in assets[10:]]
+
+        # Load the permissions of the user, which are then cached
+        user_client.post(self._subject, {"codes": codes[:1]}, format="json")
+
+        # Codes, IDs, the codes of the assets, and node parents
+        with django_assert_num_queries(4):
+            resp = user_client.post(self._subject, {"codes": codes[:2] + codes[-2:]}, format="json")
+        assert resp.status_code == 200
+        with django_assert_num_queries(4):
+            resp = user_client.post(self._subject, {"codes": codes}, format="json")
+        assert resp.status_code == 200
+        assert all(result["asset"] for result in resp.json()["results"])
+
+
+@pytest.mark.django_db
+class TestAssetBulkCreateEndpoint(APITestCase):
+
+    _subject = "/api/v1/assets/bulk/"
+    _permission = "add_asset"
+
+    def test_bulk_no_auth(self, api_client: Client) -> None:
+        resp = api_client.post(self._subject)
+        assert resp.status_code == 403
+
+    def test_bulk_no_permissions(self, user_client: Client) -> None:
+        resp = user_client.post(self._subject)
+        assert resp.status_code == 403
+
+    def test_bulk_count(
+        self,
+        user_client: Client,
+        user: User,
+        asset_model: AssetModel,
+        location: Node,
+        django_assert_max_num_queries: Callable[[int], ContextManager[None]],
+    ) -> None:
+        self._set_permission(user)
+        body = {"asset_model": asset_model.slug, "node": str(location.id), "comment": "Intake"}
+
+        # Load the permissions of the user, which are then cached
+        user_client.post(self._subject, {**body, "count": 1}, format="json")
+
+        # SQLite limits the parameters of a statement, so each insert is split into a few batches
+        with django_assert_max_num_queries(55):
+            resp = user_client.post(self._subject, {**body, "count": 500}, format="json")
+        assert resp.status_code == 201
+
+        result = resp.json()
+        assert result["count"] == 500
+        assert len(result["asset_codes"]) == 500
+        self.assert_like_changeset(result["changeset"])
+        assert result["changeset"]["comment"] == "Intake"
+
+        changeset = ChangeSet.objects.get(pk=result["changeset"]["id"])
+        events = list(changeset.assetevent_set.all())
+        assert {str(event.asset_id) for event in events} == {code["asset"] for code in result["asset_codes"]}
+        assert all(event.event_type == "CR" and event.data == {"location": str(location.id)} for event in events)
+        location.refresh_from_db()
+        assert location.get_children_count() == 501
+
+    def test_bulk_codes(self, user_client: Client, user: User, asset_model: AssetModel, location: Node) -> None:
+        self._set_permission(user)
+        strategy = Damm32AssetCodeStrategy()
+        codes = [strategy.generate_code_at_index("INV", index) for index in range(3)]
+
+        resp = user_client.post(self._subject, {
+            "asset_model": asset_model.slug,
+            "node": str(location.id),
+            "codes": [codes[0].lower().replace("-", ""), *codes[1:]],
+        }, format="json")
+        assert resp.status_code == 201
+        assert [code["code"] for code in resp.json()["asset_codes"]] == codes
+        location.refresh_from_db()
+        assert [node.asset.first_asset_code for node in location.get_children()] == codes
+
+    def test_bulk_bad_codes(
+        self,
+        user_client: Client,
+        user: User,
+        asset: Asset,
+        asset_model: AssetModel,
+        location: Node,
+    ) -> None:
+        self._set_permission(user)
+        taken = asset.add_asset_code(AssetCodeType.DAMM32, None).code
+        code = Damm32AssetCodeStrategy().generate_code_at_index("INV", 5)
+
+        resp = user_client.post(self._subject, {
+            "asset_model": asset_model.slug,
+            "node": str(location.id),
+            "codes": [code, "INV-AAA-AAA", code, taken],
+        }, format="json")
+        assert resp.status_code == 400
+        assert resp.json() == {"codes": {
+            "1": ["Invalid asset code check digit. O"],
+            "2": ["Asset code is given more than once."],
+            "3": ["Asset code is already in use."],
+        }}
+        assert Node.objects.count() == 1
+
+    def test_bulk_count_or_codes(
+        self,
+        user_client: Client,
+        user: User,
+        asset_model: AssetModel,
+        location: Node,
+    ) -> None:
+        self._set_permission(user)
+        body: Dict[str, Any] = {"asset_model": asset_model.slug, "node": str(location.id)}
+
+        extras: List[Dict[str, Any]] = [{}, {"count": 1, "codes": ["ABC"]}]
+        for extra in extras:
+            resp = user_client.post(self._subject, {**body, **extra}, format="json")
+            assert resp.status_code == 400
+            assert resp.json() == {"non_field_errors": ["Either count or codes must be given."]}
+
+    def test_bulk_not_container(self, user_client: Client, user: User, asset_model: AssetModel, asset: Asset) -> None:
+        self._set_permission(user)
+        node = Node.add_root(node_type="A", asset=asset)
+
+        resp = user_client.post(self._subject, {
+            "asset_model": asset_model.slug,
+            "node": str(node.id),
+            "count": 1,
+        }, format="json")
+        assert resp.status_code == 400
+        assert resp.json() == {"node": [f"{node} cannot contain other nodes."]}
+
+
+@pytest.mark.django_db
+class TestAssetCodeGenerateEndpoint(APITestCase):
+
+    _subject = "/api/v1/assets/generate-codes/"
+    _permission = "add_assetcode"
+
+    def test_generate_no_auth(self, api_client: Client) -> None:
+        resp = api_client.post(self._subject)
+        assert resp.status_code == 403
+
+    def test_generate_no_permissions(self, user_client: Client) -> None:
+        resp = user_client.post(self._subject)
+        assert resp.status_code == 403
+
+    def test_generate_missing_assets(self, user_client: Client, user: User) -> None:
+        self._set_permission(user)
+        resp = user_client.post(self._subject, {"assets": [str(uuid4())]}, format="json")
+        assert resp.status_code == 400
+        assert "assets" in resp.json()
+
+    def test_generate_unsupported_type(self, user_client: Client, user: User, asset: Asset) -> None:
+        self._set_permission(user)
+        resp = user_client.post(self._subject, {"assets": [asset.id], "code_type": "S"}, format="json")
+        assert resp.status_code == 400
+        assert resp.json() == {"code_type": ["Unable to generate an asset code of that type."]}
+
+    def test_generate(self, user_client: Client, user: User, asset_model: AssetModel) -> None:
+        self._set_permission(user)
+        assets = Asset.objects.bulk_create(Asset(asset_model=asset_model) for _ in range(20))
+        resp = user_client.post(self._subject, {"assets": [asset.id for asset in assets]}, format="json")
+        assert resp.status_code == 200
+
+        result = resp.json()
+        assert result["code_type"] == "D"
+        assert [code["asset"] for code in result["asset_codes"]] == [str(asset.id) for asset in assets]
+        for asset, code in zip(assets, result["asset_codes"]):
+            asset.refresh_from_db()
+            assert asset.asset_codes[1:] == [code["code"]]
+            assert asset.display_name == f"{asset_model.display_name} ({code['code']})"
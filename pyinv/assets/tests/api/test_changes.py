@@ -0,0 +1,100 @@
+from typing import Any, Callable, ContextManager, Dict, Optional
+
+import pytest
+
+from assets.models import Asset, AssetModel, Manufacturer, Node
+from pyinv.tests.client import Client
+
+from .base import APITestCase
+
+
+@pytest.mark.django_db
+class TestChangeFeedEndpoint(APITestCase):
+    """Test the endpoint for fetching the changes since a cursor."""
+
+    def _subject(
+        self,
+        api_client: Client,
+        *,
+        expected_status: int = 200,
+        params: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        response = api_client.get("/api/v1/changes/", params)
+        assert response.status_code == expected_status
+        return response.json()
+
+    def _latest_cursor(self, api_client: Client) -> str:
+        data = self._subject(api_client, params={"limit": "1000"})
+        assert not data["more"]
+        return data["cursor"]
+
+    def test_no_changes(self, api_client: Client) -> None:
+        data = self._subject(api_client)
+        assert data == {"cursor": "0.0", "more": False, "next": None, "results": []}
+
+    def test_created(self, api_client: Client, asset: Asset) -> None:
+        data = self._subject(api_client)
+        assert not data["more"]
+        assert [(result["object_type"], result["action"]) for result in data["results"]] == [
+            ("manufacturer", "created"),
+            ("asset-model", "created"),
+            ("asset", "created"),
+        ]
+        result = data["results"][2]
+        assert result["id"] == str(asset.pk)
+        self.assert_like_asset_with_node(result["data"])
+        assert result["data"]["display_name"] == asset.display_name
+
+        # Nothing has changed since the last page.
+        assert self._subject(api_client, params={"since": data["cursor"]})["results"] == []
+
+    def test_updated_and_deleted(self, api_client: Client, asset: Asset, location: Node) -> None:
+        cursor = self._latest_cursor(api_client)
+        asset.asset_model.name = "Renamed"
+        asset.asset_model.save()
+        location.delete()
+
+        data = self._subject(api_client, params={"since": cursor})
+        changes = {(result["object_type"], result["id"]): result for result in data["results"]}
+        assert len(changes) == len(data["results"])
+
+        model_change = changes["asset-model", str(asset.asset_model.pk)]
+        assert model_change["action"] == "updated"
+        assert model_change["data"]["name"] == "Renamed"
+        assert model_change["data"]["asset_count"] == 1
+
+        node_change = changes["node", str(location.pk)]
+        assert node_change["action"] == "deleted"
+        assert node_change["data"] is None
+
+    def test_pages(self, api_client: Client, manufacturer: Manufacturer) -> None:
+        cursor = self._latest_cursor(api_client)
+        models = [AssetModel.objects.create(name=f"Model {i}", manufacturer=manufacturer) for i in range(3)]
+
+        seen = []
+        data = self._subject(api_client, params={"since": cursor, "limit": "2"})
+        while True:
+            seen += [result["id"] for result in data["results"]]
+            if not data["more"]:
+                break
+            assert "since=" in data["next"]
+            data = self._subject(api_client, params={"since": data["cursor"], "limit": "2"})
+        assert set(seen) == {str(model.pk) for model in models}
+
+    def test_query_count(
+        self,
+        api_client: Client,
+        asset_model: AssetModel,
+        location: Node,
+        django_assert_max_num_queries: Callable[[int], ContextManager[None]],
+    ) -> None:
+        for _ in range(5):
+            location.add_child(node_type="A", asset=Asset.objects.create(asset_model=asset_model))
+
+        with django_assert_max_num_queries(10):
+            data = self._subject(api_client, params={"limit": "1000"})
+        assert len(data["results"]) == 13
+
+    @pytest.mark.parametrize("params", [{"since": "latest"}, {"limit": "0"}, {"limit": "1001"}])
+    def test_invalid_params(self, api_client: Client, params: Dict[str, str]) -> None:
+        self._subject(api_client, params=params, expected_status=400)
@@ -68,6 +68,16 @@ class TestChangesetListEndpoint(APITestCase):
         assert data["previous"] is not None
         assert len(data["results"]) == 1
 
+    @pytest.mark.usefixtures("changeset", "changeset2")
+    def test_cursor_pages_by_event_count(self, user_client: Client) -> None:
+        pages = self.walk_cursor_pages(user_client, "/api/v1/changesets/", {"limit": "1", "ordering": "-event_count"})
+        assert [len(page) for page in pages] == [1, 1]
+        assert {page[0]["id"] for page in pages} == {str(changeset.id) for changeset in ChangeSet.objects.all()}
+
+    def test_collapsed_user(self, user_client: Client, changeset: ChangeSet) -> None:
+        data = self._subject(user_client, params={"fields": "id,user", "expand": ""})
+        assert data["results"] == [{"id": str(changeset.id), "user": changeset.user_id}]
+
     @pytest.mark.usefixtures("changeset", "changeset2")
     def test_search_by_changeset_comment(self, user_client: Client) -> None:
         data = self._subject(user_client, params={"search": "bees"})
@@ -1,9 +1,10 @@
-from typing import Any, Dict, Optional, Union
-from uuid import UUID
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Union
+from uuid import UUID, uuid4
 
 import pytest
+from django.contrib.auth.models import User
 
-from assets.models import Asset, Node
+from assets.models import Asset, AssetEvent, Node
 from pyinv.tests.client import Client
 
 from .base import APITestCase
@@ -70,6 +71,54 @@ class TestNodeListEndpoint(APITestCase):
         for n in data["results"]:
             self.assert_like_node(n)
 
+    def test_ancestors_are_fetched_in_one_query(
+        self,
+        api_client: Client,
+        django_assert_max_num_queries: Callable[[int], ContextManager[None]],
+    ) -> None:
+        node = Node.add_root(node_type="L", name="warehouse")
+        for i in range(5):
+            node = node.add_child(node_type="L", name=f"level-{i}")
+
+        with django_assert_max_num_queries(3):
+            data = self._subject(api_client)
+        assert data["count"] == 6
+
+        names = ["warehouse"] + [f"level-{i}" for i in range(5)]
+        for result in data["results"]:
+            self.assert_like_node(result)
+            assert [a["display_name"] for a in result["ancestors"]] == names[:result["depth"] - 1]
+
+    @pytest.mark.parametrize("ordering", ["name", "-name"])
+    def test_cursor_pages_with_null_names(self, api_client: Client, container: Asset, ordering: str) -> None:
+        root = Node.add_root(node_type="A", asset=container)
+        for name in ["b", "a", "c"]:
+            root.add_child(node_type="L", name=name)
+        for _ in range(3):
+            root.add_child(node_type="A", asset=Asset.objects.create(asset_model=container.asset_model))
+
+        pages = self.walk_cursor_pages(api_client, "/api/v1/nodes/", {"limit": "2", "ordering": ordering})
+        results = [result for page in pages for result in page]
+        assert len({result["id"] for result in results}) == Node.objects.count() == 7
+        names = [result["name"] for result in results]
+        # Nodes without names are last in ascending order, and first in descending order.
+        expected: List[Optional[str]] = ["a", "b", "c", None, None, None, None]
+        assert names == (expected if ordering == "name" else expected[::-1])
+
+    @pytest.mark.usefixtures("container_with_child")
+    def test_sparse_fieldset_queries(
+        self,
+        api_client: Client,
+        django_assert_num_queries: Callable[[int], ContextManager[None]],
+    ) -> None:
+        # Count, nodes, without their assets or ancestors
+        with django_assert_num_queries(2):
+            data = self._subject(api_client, params={"fields": "id,name,asset", "expand": ""})
+        assert len(data["results"]) == 2
+        for result in data["results"]:
+            assert set(result) == {"id", "name", "asset"}
+            assert result["asset"] == str(Node.objects.get(pk=result["id"]).asset_id)
+
     @pytest.mark.usefixtures("location", "container_with_child")
     def test_filter_by_is_container(self, api_client: Client) -> None:
         data = self._subject(api_client, params={"is_container": True})
@@ -105,6 +154,31 @@ class TestNodeListEndpoint(APITestCase):
         data = self._subject(api_client, params={"descendent_of": container_with_child.node.id})
         assert data["count"] == 1
 
+    def test_filter_by_multiple(self, api_client: Client, location: Node, container_with_child: Asset) -> None:
+        location.add_child(node_type="L", name="shelf")
+        node_ids = f"{location.id},{container_with_child.node.id}"
+
+        data = self._subject(api_client, params={"parent": node_ids})
+        assert data["count"] == 2
+
+        data = self._subject(api_client, params={"descendent_of": f"{node_ids},not-a-node"})
+        assert data["count"] == 2
+
+        data = self._subject(api_client, params={"parent": f"root,{location.id}"})
+        assert data["count"] == 3
+
+    def test_filter_by_location(self, api_client: Client, location: Node) -> None:
+        shelf = location.add_child(node_type="L", name="shelf")
+        shelf.add_child(node_type="L", name="box")
+
+        data = self._subject(api_client, params={"location": "location / SHELF"})
+        assert data["count"] == 1
+        assert data["results"][0]["location_path"] == "location / shelf"
+        assert data["results"][0]["location_ids"] == [str(location.id), str(shelf.id)]
+
+        data = self._subject(api_client, params={"search": "shelf"})
+        assert data["count"] == 2
+
     @pytest.mark.usefixtures("location", "container_with_child")
     def test_filter_by_node_type(self, api_client: Client) -> None:
         data = self._subject(api_client, params={"node_type": "A"})
@@ -138,3 +212,190 @@ class TestAssetGetIndividualEndpoint(APITestCase):
 
         result = resp.json()
         self.assert_like_node(result)
+
+
+@pytest.mark.django_db
+class TestNodeTreeEndpoint(APITestCase):
+
+    _subject = "/api/v1/nodes"
+
+    def assert_like_node_tree(self, data: Dict[str, Any]) -> None:
+        assert data.keys() == {
+            'id', 'display_name', 'node_type', 'numchild',
+            'is_container', 'name', 'asset', 'depth', 'children',
+        }
+        if data["asset"]:
+            self.assert_like_asset(data["asset"])
+        for child in data["children"]:
+            assert child["depth"] == data["depth"] + 1
+            self.assert_like_node_tree(child)
+
+    def test_fetch_not_exists(self, api_client: Client) -> None:
+        resp = api_client.get(f"{self._subject}/000/tree/")
+        assert resp.status_code == 404
+
+    def test_bad_depth(self, api_client: Client, location: Node) -> None:
+        resp = api_client.get(f"{self._subject}/{location.id}/tree/", {"depth": "0"})
+        assert resp.status_code == 400
+
+    def test_fetch_tree(
+        self,
+        api_client: Client,
+        location: Node,
+        container_with_child: Asset,
+        django_assert_max_num_queries: Callable[[int], ContextManager[None]],
+    ) -> None:
+        location.refresh_from_db()
+        container_with_child.node.move(location, pos="last-child")
+        shelf = location.add_child(node_type="L", name="shelf")
+        shelf.add_child(node_type="L", name="box").add_child(node_type="L", name="bin")
+
+        with django_assert_max_num_queries(3):
+            resp = api_client.get(f"{self._subject}/{location.id}/tree/", {"depth": "2"})
+        assert resp.status_code == 200
+
+        data = resp.json()
+        self.assert_like_node_tree(data)
+        assert data["id"] == str(location.id)
+        assert [child["display_name"] for child in data["children"]] == [
+            container_with_child.display_name,
+            "shelf",
+        ]
+
+        container, shelf_data = data["children"]
+        assert container["asset"]["asset_model"]["slug"] == "bar-model"
+        assert len(container["children"]) == 1
+        assert container["children"][0]["children"] == []
+
+        # The bin is below the requested depth
+        box = shelf_data["children"][0]
+        assert box["numchild"] == 1
+        assert box["children"] == []
+
+    def test_default_depth(self, api_client: Client, container_with_child: Asset) -> None:
+        resp = api_client.get(f"{self._subject}/{container_with_child.node.id}/tree/")
+        assert resp.status_code == 200
+
+        data = resp.json()
+        assert len(data["children"]) == 1
+        assert data["children"][0]["children"] == []
+
+
+@pytest.mark.django_db
+class TestNodeBulkMoveEndpoint(APITestCase):
+
+    _subject = "/api/v1/nodes/move/"
+    _permission = "change_node"
+
+    def test_move_no_auth(self, api_client: Client) -> None:
+        resp = api_client.post(self._subject)
+        assert resp.status_code == 403
+
+    def test_move_no_permissions(self, user_client: Client) -> None:
+        resp = user_client.post(self._subject)
+        assert resp.status_code == 403
+
+    def test_move_missing_nodes(self, user_client: Client, user: User, location: Node) -> None:
+        self._set_permission(user)
+        resp = user_client.post(self._subject, {"nodes": [str(uuid4())], "target": location.id}, format="json")
+        assert resp.status_code == 400
+        assert "nodes" in resp.json()
+
+    def test_move_into_non_container(self, user_client: Client, user: User, location: Node, asset: Asset) -> None:
+        self._set_permission(user)
+        node = Node.add_root(node_type="A", asset=asset)
+        resp = user_client.post(self._subject, {"nodes": [location.id], "target": node.id}, format="json")
+        assert resp.status_code == 400
+        assert "cannot contain other nodes" in resp.json()["target"][0]
+
+    def test_move(
+        self,
+        user_client: Client,
+        user: User,
+        location: Node,
+        container_with_child: Asset,
+    ) -> None:
+        self._set_permission(user)
+        child = container_with_child.node.get_children().get()
+        data = {"nodes": [child.id, container_with_child.node.id], "target": location.id, "comment": "Tidying"}
+        resp = user_client.post(self._subject, data, format="json")
+        assert resp.status_code == 400  # Cannot move a node along with its parent
+
+        data["nodes"] = [child.id]
+        resp = user_client.post(self._subject, data, format="json")
+        assert resp.status_code == 200
+
+        result = resp.json()
+        assert result["nodes"] == [str(child.id)]
+        self.assert_like_changeset(result["changeset"])
+        assert result["changeset"]["comment"] == "Tidying"
+
+        assert [node.id for node in Node.objects.get(pk=location.id).get_children()] == [child.id]
+        assert Node.objects.get(pk=container_with_child.node.id).numchild == 0
+
+        event = AssetEvent.objects.get(changeset_id=result["changeset"]["id"])
+        assert event.asset_id == child.asset_id
+        assert event.event_type == AssetEvent.AssetEventType.MOVE
+        assert event.data == {"old": str(container_with_child.node.id), "new": str(location.id)}
+
+    def test_move_records_assets_inside(
+        self,
+        user_client: Client,
+        user: User,
+        location: Node,
+        container_with_child: Asset,
+    ) -> None:
+        self._set_permission(user)
+        shelf = location.add_child(node_type="L", name="Shelf")
+        child = container_with_child.node.get_children().get()
+        data = {"nodes": [container_with_child.node.id], "target": shelf.id}
+        resp = user_client.post(self._subject, data, format="json")
+        assert resp.status_code == 200
+
+        events = AssetEvent.objects.filter(changeset_id=resp.json()["changeset"]["id"])
+        assert {event.asset_id: event.data for event in events} == {
+            container_with_child.id: {"old": None, "new": str(shelf.id)},
+            child.asset_id: {"old": None, "new": str(shelf.id), "moved_with": str(container_with_child.node.id)},
+        }
+
+    def test_move_too_deep(self, user_client: Client, user: User, location: Node) -> None:
+        self._set_permission(user)
+        max_depth = Node._meta.get_field('path').max_length // Node.steplen
+        deepest = location
+        for _ in range(max_depth - 2):
+            deepest = deepest.add_child(node_type="L", name="Deeper")
+        subtree = Node.add_root(node_type="L", name="Box")
+        subtree.add_child(node_type="L", name="Inside")
+
+        resp = user_client.post(self._subject, {"nodes": [subtree.id], "target": deepest.id}, format="json")
+        assert resp.status_code == 400
+        assert "this deep" in resp.json()["target"][0]
+
+
+@pytest.mark.django_db
+class TestNodeSummaryEndpoint(APITestCase):
+
+    _subject = "/api/v1/nodes"
+
+    def test_fetch_not_exists(self, api_client: Client) -> None:
+        resp = api_client.get(f"{self._subject}/000/summary/")
+        assert resp.status_code == 404
+
+    def test_empty(self, api_client: Client, location: Node) -> None:
+        resp = api_client.get(f"{self._subject}/{location.id}/summary/")
+        assert resp.status_code == 200
+        assert resp.json() == {"asset_count": 0, "asset_models": []}
+
+    def test_summary(self, api_client: Client, location: Node, container_with_child: Asset) -> None:
+        location.refresh_from_db()
+        container_with_child.node.move(location, pos="last-child")
+
+        resp = api_client.get(f"{self._subject}/{location.id}/summary/")
+        assert resp.status_code == 200
+        assert resp.json() == {
+            "asset_count": 2,
+            "asset_models": [
+                {"asset_model": {"name": "Bar Model", "slug": "bar-model"}, "count": 1},
+                {"asset_model": {"name": "Foo Model", "slug": "foo-model"}, "count": 1},
+            ],
+        }
@@ -0,0 +1,56 @@
+import os
+from typing import List
+from uuid import uuid4
+
+import pytest
+from django.conf import settings
+
+from assets.models import Node
+
+BENCHMARK_NODES = int(os.environ.get("PYINV_BENCHMARK_NODES", 500_000))
+
+
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(django_db_modify_db_settings: None) -> None:
+    """
+    Use a file for the SQLite test database.
+
+    Threads cannot wait for each other on the default shared in-memory
+    database, they fail as soon as a table is locked.
+    """
+    database = settings.DATABASES["default"]
+    if database["ENGINE"] == "django.db.backends.sqlite3" and not database["TEST"].get("NAME"):
+        database["TEST"]["NAME"] = "test_benchmark.sqlite"
+
+
+def build_tree(size: int = BENCHMARK_NODES, fanout: int = 100) -> List[List[Node]]:
+    """
+    Quickly build a tree of locations, bypassing treebeard.
+
+    :returns: The nodes at each level of the tree.
+    """
+    roots = max(1, size // (fanout * fanout))
+    levels = [[
+        Node(id=uuid4(), node_type="L", name=f"{i}", display_name=f"{i}", path=Node._get_path("", 1, i + 1), depth=1)
+        for i in range(roots)
+    ]]
+
+    total = roots
+    while total < size:
+        level: List[Node] = []
+        for parent in levels[-1]:
+            for i in range(min(fanout, size - total - len(level))):
+                level.append(Node(
+                    id=uuid4(),
+                    node_type="L",
+                    name=f"{parent.name}.{i}",
+                    display_name=f"{parent.name}.{i}",
+                    path=Node._get_path(parent.path, parent.depth + 1, i + 1),
+                    depth=parent.depth + 1,
+                ))
+                parent.numchild += 1
+        total += len(level)
+        levels.append(level)
+
+    Node.objects.bulk_create([node for level in levels for node in level], batch_size=10_000)
+    return levels
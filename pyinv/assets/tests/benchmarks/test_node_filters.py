@@ -0,0 +1,49 @@
+import time
+from typing import Callable
+
+import pytest
+from django.db import connection
+from django.db.models import QuerySet
+
+from assets.filtersets import NodeFilterSet
+from assets.models import Node
+
+from .conftest import BENCHMARK_NODES, build_tree
+
+
+def _time(func: Callable[[], object], repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def _assert_uses_path_index(queryset: QuerySet[Node]) -> None:
+    plan = queryset.explain()
+    if connection.vendor == "sqlite":
+        assert "SEARCH" in plan and "path" in plan, plan
+    else:
+        assert "Index" in plan, plan
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_descendent_of_and_parent_use_path_range_scan() -> None:
+    levels = build_tree()
+    subtree, other_subtree = levels[1][len(levels[1]) // 2], levels[1][-1]
+    node_ids = f"{subtree.id},{other_subtree.id}"
+
+    descendants = NodeFilterSet({"descendent_of": node_ids}, queryset=Node.objects.all()).qs
+    children = NodeFilterSet({"parent": node_ids}, queryset=Node.objects.all()).qs
+    _assert_uses_path_index(descendants)
+    _assert_uses_path_index(children)
+
+    assert descendants.count() == subtree.numchild + other_subtree.numchild
+    assert children.count() == subtree.numchild + other_subtree.numchild
+
+    range_scan = _time(lambda: list(descendants.all()))
+    like_scan = _time(lambda: list(subtree.get_descendants() | other_subtree.get_descendants()))
+    print(
+        f"\ndescendent_of over {BENCHMARK_NODES} nodes: "
+        f"range {range_scan * 1000:.2f}ms, LIKE {like_scan * 1000:.2f}ms",
+    )
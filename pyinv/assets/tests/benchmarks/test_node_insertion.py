@@ -0,0 +1,42 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection
+
+from assets.models import Node
+
+BENCHMARK_THREADS = int(os.environ.get("PYINV_BENCHMARK_THREADS", 8))
+BENCHMARK_INSERTS = int(os.environ.get("PYINV_BENCHMARK_INSERTS", 200))
+
+
+def _add_children(parent: Node, thread: int) -> None:
+    try:
+        parent = Node.objects.get(pk=parent.pk)
+        for i in range(BENCHMARK_INSERTS):
+            parent.add_child(node_type="L", name=f"{thread}.{i}")
+    finally:
+        connection.close()
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db(transaction=True)
+def test_add_child_under_contention() -> None:
+    intake = Node.add_root(node_type="L", name="Intake")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(BENCHMARK_THREADS) as executor:
+        for result in [executor.submit(_add_children, intake, thread) for thread in range(BENCHMARK_THREADS)]:
+            result.result()
+    elapsed = time.perf_counter() - start
+
+    total = BENCHMARK_THREADS * BENCHMARK_INSERTS
+    intake.refresh_from_db()
+    assert intake.numchild == total
+    assert intake.get_children().count() == total
+    assert Node.objects.values("path").distinct().count() == total + 1
+    print(
+        f"\nadd_child with {BENCHMARK_THREADS} threads under one parent: "
+        f"{total / elapsed:.0f} inserts/s",
+    )
@@ -0,0 +1,46 @@
+from typing import List
+
+import pytest
+from django.test import override_settings
+
+from assets.models import Node, NodeClosure
+
+from .conftest import BENCHMARK_NODES, build_tree
+from .test_node_filters import _time
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_path_and_closure_lookups() -> None:
+    levels = build_tree()
+    NodeClosure.rebuild()
+    subtree = levels[1][len(levels[1]) // 2]
+    leaves = levels[-1][::len(levels[-1]) // 100]
+
+    def get_ancestors() -> List[List[Node]]:
+        return [list(leaf.get_ancestors()) for leaf in leaves]
+
+    def get_descendants() -> List[Node]:
+        return list(subtree.get_descendants())
+
+    def filter_descendants() -> List[Node]:
+        return list(Node.objects.filter(Node.get_descendants_filter(levels[1][:10])))
+
+    results = {}
+    for backend in ('path', 'closure'):
+        with override_settings(NODE_TREE_BACKEND=backend):
+            results[backend] = (
+                get_ancestors(),
+                get_descendants(),
+                _time(get_ancestors, repeat=5) / len(leaves),
+                _time(get_descendants),
+                _time(filter_descendants),
+            )
+
+    assert results['path'][:2] == results['closure'][:2]
+    print(f"\nTree lookups over {BENCHMARK_NODES} nodes:")
+    for backend, (_, _, ancestors, descendants, filtered) in results.items():
+        print(
+            f"  {backend}: ancestors {ancestors * 1000:.3f}ms, descendants {descendants * 1000:.2f}ms, "
+            f"descendants of 10 nodes {filtered * 1000:.2f}ms",
+        )
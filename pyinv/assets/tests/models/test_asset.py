@@ -1,9 +1,18 @@
+from typing import Callable, ContextManager
+
 import pytest
 from django.db import IntegrityError
 from django.test import TestCase
 
-from assets.asset_codes import AssetCodeType
-from assets.models import Asset, AssetCode, AssetModel, Manufacturer, Node
+from assets.asset_codes import AssetCodeType, Damm32AssetCodeStrategy
+from assets.models import (
+    Asset,
+    AssetCode,
+    AssetCodeReservation,
+    AssetModel,
+    Manufacturer,
+    Node,
+)
 
 
 class TestAsset(TestCase):
@@ -64,6 +73,50 @@ class TestAsset(TestCase):
         asset = Asset.objects.create(asset_model=self.asset_model)
         self.assertEqual(str(asset), f"bar ({asset.id})")
 
+    def test_display_name_updated_on_asset_code_added(self) -> None:
+        """Test that the stored display name uses a new asset code."""
+        asset = Asset.objects.create(asset_model=self.asset_model)
+        AssetCode.objects.create(code_type="A", code="foo", asset=asset)
+        asset.refresh_from_db()
+        self.assertEqual(asset.display_name, "bar (foo)")
+
+    def test_display_name_updated_on_node_rename(self) -> None:
+        """Test that the stored display names follow the name of the node."""
+        asset = Asset.objects.create(asset_model=self.asset_model)
+        node = Node.add_root(node_type="A", asset=asset)
+        node.name = "bees"
+        node.save()
+
+        self.assertEqual(Asset.objects.get(pk=asset.pk).display_name, "bees")
+        self.assertEqual(Node.objects.get(pk=node.pk).display_name, "bees")
+
+    def test_display_name_updated_on_node_delete(self) -> None:
+        """Test that the stored display name falls back to the model when the node is deleted."""
+        asset = Asset.objects.create(asset_model=self.asset_model)
+        Node.add_root(node_type="A", name="bees", asset=asset).delete()
+        asset.refresh_from_db()
+        self.assertEqual(asset.display_name, f"bar ({asset.id})")
+
+    def test_display_name_updated_on_asset_model_rename(self) -> None:
+        """Test that the stored display names follow the name of the asset model."""
+        asset = Asset.objects.create(asset_model=self.asset_model)
+        node = Node.add_root(node_type="A", asset=asset)
+        self.asset_model.name = "baz"
+        self.asset_model.save()
+
+        self.assertEqual(Asset.objects.get(pk=asset.pk).display_name, f"baz ({asset.id})")
+        self.assertEqual(Node.objects.get(pk=node.pk).display_name, f"baz ({asset.id})")
+
+    def test_display_name_updated_on_manufacturer_rename(self) -> None:
+        """Test that the stored display name includes the manufacturer of a duplicate model name."""
+        asset = Asset.objects.create(asset_model=self.asset_model)
+        AssetModel.objects.create(name="bar", manufacturer=Manufacturer.objects.create(name="other"))
+        self.manufacturer.name = "wasps"
+        self.manufacturer.save()
+
+        asset.refresh_from_db()
+        self.assertEqual(asset.display_name, f"wasps bar ({asset.id})")
+
 
 @pytest.mark.django_db
 class TestAssetCodeGeneration:
@@ -84,6 +137,34 @@ class TestAssetCodeGeneration:
         code = asset.add_asset_code(AssetCodeType.DAMM32, None)
         assert code.code in asset.asset_codes
 
+    def test_generate_many_asset_codes(
+        self,
+        asset_model: AssetModel,
+        django_assert_max_num_queries: Callable[[int], ContextManager[None]],
+    ) -> None:
+        assets = Asset.objects.bulk_create(Asset(asset_model=asset_model) for _ in range(100))
+        with django_assert_max_num_queries(21):
+            codes = Asset.add_asset_codes(assets, AssetCodeType.DAMM32)
+
+        assert [code.asset for code in codes] == assets
+        assert len({code.code for code in codes}) == 100
+        assert AssetCode.objects.filter(code__in=[code.code for code in codes], code_type="D").count() == 100
+
+    def test_generate_many_asset_codes_with_collisions(self, asset: Asset, asset_model: AssetModel) -> None:
+        strategy = Damm32AssetCodeStrategy()
+        taken = asset.add_asset_code(AssetCodeType.DAMM32, strategy.generate_code_at_index("INV", 1)).code
+
+        assets = Asset.objects.bulk_create(Asset(asset_model=asset_model) for _ in range(3))
+        codes = {code.code for code in Asset.add_asset_codes(assets, AssetCodeType.DAMM32)}
+
+        assert taken not in codes
+        assert codes == {strategy.generate_code_at_index("INV", index) for index in (0, 2, 3)}
+
+    def test_unable_to_generate_many_asset_codes(self, asset: Asset) -> None:
+        with pytest.raises(ValueError, match="Unable to generate an asset code of that type."):
+            Asset.add_asset_codes([asset], AssetCodeType.SROBO)
+        assert asset.asset_codes == [str(asset.id)]
+
     def test_unable_to_generate_asset_code(self, asset: Asset) -> None:
         with pytest.raises(ValueError, match="Unable to generate an asset code of that type."):
             asset.add_asset_code(AssetCodeType.SROBO, None)
@@ -94,3 +175,45 @@ class TestAssetCodeGeneration:
             match=r"Provided asset code is not valid: \['The check digit was invalid.'\]",
         ):
             asset.add_asset_code(AssetCodeType.SROBO, "srABCABC")
+
+
+@pytest.mark.django_db
+class TestAssetBulkAdd:
+    """Test the Asset.bulk_add function."""
+
+    def test_bulk_add_generated_codes(
+        self,
+        asset_model: AssetModel,
+        location: Node,
+        django_assert_max_num_queries: Callable[[int], ContextManager[None]],
+    ) -> None:
+        # Generating codes, inserting the assets, codes and nodes, and updating the counts and search documents
+        with django_assert_max_num_queries(34):
+            codes = Asset.bulk_add(asset_model, location, AssetCodeType.DAMM32, count=100)
+
+        assert len({code.code for code in codes}) == 100
+        nodes = list(location.get_children().select_related('asset').prefetch_related('asset__assetcode_set'))
+        assert [node.asset_id for node in nodes] == [code.asset_id for code in codes]
+        for node in nodes:
+            assert node.asset.display_name == f"{asset_model.display_name} ({node.asset.first_asset_code})"
+            assert node.display_name == node.asset.display_name
+        location.refresh_from_db()
+        assert location.numchild == 100
+        assert location.asset_counts.get().count == 100
+
+    def test_bulk_add_given_codes(self, asset_model: AssetModel, location: Node) -> None:
+        strategy = Damm32AssetCodeStrategy()
+        given = [strategy.generate_code_at_index("INV", index) for index in range(3)]
+        AssetCodeReservation.objects.create(code=given[0], prefix="INV")
+
+        codes = Asset.bulk_add(asset_model, location, AssetCodeType.DAMM32, codes=given)
+
+        assert [code.code for code in codes] == given
+        assert not AssetCodeReservation.objects.exists()
+
+    def test_bulk_add_taken_code(self, asset: Asset, asset_model: AssetModel, location: Node) -> None:
+        asset.add_asset_code(AssetCodeType.ARBITRARY, "ABC")
+        with pytest.raises(IntegrityError):
+            Asset.bulk_add(asset_model, location, AssetCodeType.ARBITRARY, codes=["DEF", "ABC"])
+        assert Asset.objects.count() == 1
+        assert location.get_children_count() == 0
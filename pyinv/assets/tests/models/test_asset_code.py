@@ -69,3 +69,40 @@ class TestAssetCodeModel(TestCase):
         code = AssetCode(code_type="?", code="foo", asset=self.asset)
         with self.assertRaises(ValueError):
             code.full_clean()
+
+    def test_normalised_code(self) -> None:
+        """Test that codes are indexed by the normalisation of their type."""
+        damm32 = AssetCode.objects.create(code_type="D", code="inv-ase-sej", asset=self.asset)
+        srobo = AssetCode.objects.create(code_type="S", code="sr2UT29", asset=self.asset)
+        arbitrary = AssetCode.objects.create(code_type="A", code=" foo ", asset=self.asset)
+        self.assertEqual(damm32.normalised_code, "INV-ASE-SEJ")
+        self.assertEqual(srobo.normalised_code, "2UT29")
+        self.assertEqual(arbitrary.normalised_code, "foo")
+
+    def test_get_suggestions(self) -> None:
+        """Test that mistyped codes are corrected from their check digits, with one query."""
+        damm32 = AssetCode.objects.create(code_type="D", code="INV-ASE-SEJ", asset=self.asset)
+        srobo = AssetCode.objects.create(code_type="S", code="SR2UT29", asset=self.asset)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(AssetCode.get_suggestions("INV-ASE-SEK"), [damm32])
+        with self.assertNumQueries(1):
+            self.assertEqual(AssetCode.get_suggestions("invsaesej"), [damm32])
+        self.assertEqual(AssetCode.get_suggestions("sr2TU29"), [srobo])
+        self.assertEqual(AssetCode.get_suggestions("INV-ASE-SEJ"), [])
+
+    def test_lookup(self) -> None:
+        """Test that scanned codes are found in any spelling, with one query, preferring exact matches."""
+        damm32 = AssetCode.objects.create(code_type="D", code="INV-ASE-SEJ", asset=self.asset)
+        srobo = AssetCode.objects.create(code_type="S", code="SR2UT29", asset=self.asset)
+        arbitrary = AssetCode.objects.create(code_type="A", code="2UT29", asset=self.asset)
+
+        with self.assertNumQueries(1):
+            found = AssetCode.lookup([" invasesej", "inv-ase-sej", "2ut29", "SR2UT29", "2UT29", "bees"])
+        self.assertEqual(found, {
+            " invasesej": damm32,
+            "inv-ase-sej": damm32,
+            "2ut29": arbitrary,
+            "SR2UT29": srobo,
+            "2UT29": arbitrary,
+        })
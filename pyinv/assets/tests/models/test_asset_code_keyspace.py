@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+import pytest
+from django.test import override_settings
+
+from assets.asset_codes import AssetCodeType, Damm32AssetCodeStrategy
+from assets.models import Asset, AssetCodePrefix, AssetCodeReservation
+from assets.models.asset_code_keyspace import generate_unused_damm32_codes
+
+
+@pytest.mark.django_db
+class TestAssetCodePrefix:
+    """Test generating Damm32 codes from the counter of each prefix."""
+
+    def test_generate_codes(self) -> None:
+        strategy = Damm32AssetCodeStrategy()
+        codes = AssetCodePrefix.generate_codes("INV", 5)
+        assert set(codes) == {strategy.generate_code_at_index("INV", index) for index in range(5)}
+        assert AssetCodePrefix.objects.get(prefix="INV").next_index == 5
+
+        assert len(set(codes) | set(AssetCodePrefix.generate_codes("INV", 5))) == 10
+        assert AssetCodePrefix.objects.get(prefix="INV").next_index == 10
+        assert not AssetCodePrefix.objects.filter(prefix="ABC").exists()
+
+    def test_generate_codes_skips_used(self, asset: Asset) -> None:
+        strategy = Damm32AssetCodeStrategy()
+        asset.add_asset_code(AssetCodeType.DAMM32, strategy.generate_code_at_index("INV", 0))
+        AssetCodeReservation.objects.create(code=strategy.generate_code_at_index("INV", 1), prefix="INV")
+
+        codes = AssetCodePrefix.generate_codes("INV", 3)
+        assert set(codes) == {strategy.generate_code_at_index("INV", index) for index in range(2, 5)}
+
+    @patch.object(Damm32AssetCodeStrategy, "KEYSPACE_SIZE", 16)
+    def test_generate_codes_exhausted(self, caplog: pytest.LogCaptureFixture) -> None:
+        AssetCodePrefix.generate_codes("INV", 14)
+        assert not caplog.records
+
+        AssetCodePrefix.generate_codes("INV", 1)
+        assert "15 of 16 asset codes with the prefix INV" in caplog.text
+
+        with pytest.raises(ValueError, match="All asset codes with the prefix INV have been used"):
+            AssetCodePrefix.generate_codes("INV", 2)
+        assert AssetCodePrefix.objects.get(prefix="INV").next_index == 15
+
+    def test_generated_asset_codes_use_counter(self, asset: Asset) -> None:
+        code = asset.add_asset_code(AssetCodeType.DAMM32, None)
+        assert code.code == Damm32AssetCodeStrategy().generate_code_at_index("INV", 0)
+
+    @override_settings(DAMM32_ASSET_CODE_GENERATION="random")
+    def test_random_generation(self) -> None:
+        assert len(set(generate_unused_damm32_codes("INV", 5))) == 5
+        assert not AssetCodePrefix.objects.exists()
+
+    @override_settings(DAMM32_ASSET_CODE_PREFIXES=["INV", "ABC"])
+    @patch.object(Damm32AssetCodeStrategy, "KEYSPACE_SIZE", 32)
+    def test_get_occupancy(self, asset: Asset) -> None:
+        asset.add_asset_code(AssetCodeType.DAMM32, None)
+        AssetCodeReservation.fill("INV", 3)
+        AssetCodeReservation.reserve("INV", 1)
+        AssetCodeReservation.fill("XYZ", 24)
+
+        assert AssetCodePrefix.get_occupancy() == [
+            {
+                "prefix": "ABC", "capacity": 32, "assigned": 0, "pooled": 0, "reserved": 0,
+                "generated": 0, "remaining": 32, "occupancy": 0.0, "nearly_full": False,
+            },
+            {
+                "prefix": "INV", "capacity": 32, "assigned": 1, "pooled": 2, "reserved": 1,
+                "generated": 4, "remaining": 28, "occupancy": 0.125, "nearly_full": False,
+            },
+            {
+                "prefix": "XYZ", "capacity": 32, "assigned": 0, "pooled": 24, "reserved": 0,
+                "generated": 24, "remaining": 8, "occupancy": 0.75, "nearly_full": False,
+            },
+        ]
+
+        AssetCodePrefix.objects.filter(prefix="XYZ").update(next_index=29)
+        assert AssetCodePrefix.get_occupancy()[2]["nearly_full"]
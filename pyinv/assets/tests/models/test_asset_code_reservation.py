@@ -0,0 +1,73 @@
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+from assets.asset_codes import AssetCodeType, Damm32AssetCodeStrategy
+from assets.models import Asset, AssetCode, AssetCodeReservation, AssetModel
+from assets.models.asset_code_keyspace import generate_unused_codes
+
+
+@pytest.mark.django_db
+class TestAssetCodeReservation:
+    """Test the pool of pre-generated asset codes."""
+
+    def test_fill(self) -> None:
+        assert AssetCodeReservation.fill("INV", 50) == 50
+        assert AssetCodeReservation.fill("INV", 50) == 0
+        assert AssetCodeReservation.fill("INV", 60) == 10
+
+        strategy = Damm32AssetCodeStrategy()
+        for reservation in AssetCodeReservation.objects.all():
+            assert reservation.prefix == "INV"
+            assert reservation.reserved_at is None
+            strategy.validate(reservation.code)
+
+    def test_take_from_pool(self, asset: Asset, asset_model: AssetModel) -> None:
+        AssetCodeReservation.fill("INV", 5)
+        pooled = set(AssetCodeReservation.objects.values_list('code', flat=True))
+
+        code = asset.add_asset_code(AssetCodeType.DAMM32, None)
+        assert code.code in pooled
+        assert AssetCodeReservation.get_available("INV").count() == 4
+
+        assets = Asset.objects.bulk_create(Asset(asset_model=asset_model) for _ in range(6))
+        codes = {code.code for code in Asset.add_asset_codes(assets, AssetCodeType.DAMM32)}
+        assert len(codes & pooled) == 4
+        assert len(codes) == 6
+        assert not AssetCodeReservation.objects.exists()
+
+    def test_reserve(self, asset: Asset) -> None:
+        AssetCodeReservation.fill("INV", 3)
+        reserved = AssetCodeReservation.reserve("INV", 5)
+        assert len({reservation.code for reservation in reserved}) == 5
+        assert all(reservation.reserved_at is not None for reservation in reserved)
+        assert AssetCodeReservation.objects.filter(reserved_at__isnull=False).count() == 5
+        assert not AssetCodeReservation.get_available("INV").exists()
+
+        # Reserved codes are only used when given explicitly
+        generated = asset.add_asset_code(AssetCodeType.DAMM32, None)
+        assert generated.code not in {reservation.code for reservation in reserved}
+
+        asset.add_asset_code(AssetCodeType.DAMM32, reserved[0].code)
+        assert not AssetCodeReservation.objects.filter(code=reserved[0].code).exists()
+
+    def test_generated_codes_skip_reserved(self, asset: Asset) -> None:
+        AssetCodeReservation.fill("INV", 1)
+        AssetCodeReservation.fill("ABC", 1)
+        reserved = AssetCodeReservation.objects.get(prefix="ABC").code
+        used = asset.add_asset_code(AssetCodeType.DAMM32, None).code
+        unused = Damm32AssetCodeStrategy().generate_new_code()
+
+        candidates = iter([reserved, used, unused])
+        assert generate_unused_codes(lambda: next(candidates), 1) == [unused]
+
+    @override_settings(DAMM32_ASSET_CODE_PREFIXES=["INV", "ABC"])
+    def test_fill_command(self) -> None:
+        call_command("fill_asset_code_pool", "--size", "10")
+        assert AssetCodeReservation.get_available("INV").count() == 10
+        assert AssetCodeReservation.get_available("ABC").count() == 10
+
+        call_command("fill_asset_code_pool", "--size", "20", "--prefix", "ABC")
+        assert AssetCodeReservation.get_available("INV").count() == 10
+        assert AssetCodeReservation.get_available("ABC").count() == 20
+        assert not AssetCode.objects.exists()
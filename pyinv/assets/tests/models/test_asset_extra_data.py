@@ -0,0 +1,73 @@
+from typing import List
+
+import pytest
+from django.apps import apps
+from django.db import connection
+from django.test import override_settings
+
+from assets.apps import sync_database_objects
+from assets.models import Asset, AssetModel
+from assets.models.asset_extra_data import (
+    filter_by_extra_data,
+    get_json_path,
+    sync_extra_data_indexes,
+)
+
+sqlite_only = pytest.mark.skipif(connection.vendor != 'sqlite', reason="Hot key indexes are only used on SQLite")
+
+
+class TestJSONPath:
+    """Test building the JSON paths of extra data keys."""
+
+    def test_json_path(self) -> None:
+        assert get_json_path(["serial"]) == '$."serial"'
+        assert get_json_path(["power", "voltage"]) == '$."power"."voltage"'
+
+    @pytest.mark.parametrize("keys", [[], ["serial-no"], ["power", "'"]])
+    def test_invalid_key(self, keys: List[str]) -> None:
+        with pytest.raises(ValueError):
+            get_json_path(keys)
+
+
+@pytest.mark.django_db
+class TestExtraDataIndexes:
+    """Test filtering by extra data, and the indexes of hot keys."""
+
+    def test_filter_by_extra_data(self, asset_model: AssetModel) -> None:
+        asset = Asset.objects.create(asset_model=asset_model, extra_data={"serial": "12", "power": {"on": True}})
+        Asset.objects.create(asset_model=asset_model, extra_data={"serial": 12})
+
+        assert filter_by_extra_data(Asset.objects.all(), ["serial"], ["12"]).count() == 2
+        assert filter_by_extra_data(Asset.objects.all(), ["serial"], ["13", "12"]).count() == 2
+        assert list(filter_by_extra_data(Asset.objects.all(), ["power", "on"], ["true"])) == [asset]
+        assert not filter_by_extra_data(Asset.objects.all(), ["power"], ["on"]).exists()
+
+    @sqlite_only
+    def test_filter_uses_index(self) -> None:
+        sql, params = filter_by_extra_data(Asset.objects.all(), ["serial"], ["XYZ"]).query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        assert "USING INDEX asset_extra_data_serial" in plan
+
+    @sqlite_only
+    def test_sync_indexes(self) -> None:
+        assert sync_extra_data_indexes(connection, Asset._meta.db_table) == ([], [])
+
+        with override_settings(ASSET_EXTRA_DATA_INDEXED_KEYS=["mac_address", "serial"]):
+            assert sync_extra_data_indexes(connection, Asset._meta.db_table) == (["asset_extra_data_mac_address"], [])
+
+        with override_settings(ASSET_EXTRA_DATA_INDEXED_KEYS=[]):
+            assert sync_extra_data_indexes(connection, Asset._meta.db_table) == (
+                [],
+                ["asset_extra_data_mac_address", "asset_extra_data_serial"],
+            )
+
+    @sqlite_only
+    def test_sync_after_migrating(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute('DROP INDEX "asset_extra_data_serial"')
+
+        sync_database_objects(apps.get_app_config('assets'), connection.alias)
+        with connection.cursor() as cursor:
+            assert "asset_extra_data_serial" in connection.introspection.get_constraints(cursor, Asset._meta.db_table)
@@ -1,7 +1,7 @@
 from django.db.models.deletion import ProtectedError
 from django.test import TestCase
 
-from assets.models import AssetModel, Manufacturer
+from assets.models import Asset, AssetModel, Manufacturer, Node
 
 
 class TestAssetModel(TestCase):
@@ -28,6 +28,52 @@ class TestAssetModel(TestCase):
     def test_str(self) -> None:
         self.assertEqual(str(self.container), "Hive")
 
+    def test_is_container_copied_to_nodes(self) -> None:
+        """Test that nodes follow changes to whether their asset model is a container."""
+        node = Node.add_root(node_type="A", asset=Asset.objects.create(asset_model=self.not_container))
+        self.assertFalse(node.is_container)
+
+        self.not_container.is_container = True
+        self.not_container.save()
+        node.refresh_from_db()
+        self.assertTrue(node.is_container)
+
+    def test_display_name_of_duplicate_names(self) -> None:
+        """Test that the manufacturer is included in the display name if the name is ambiguous."""
+        other = AssetModel.objects.create(
+            name="Hive",
+            manufacturer=Manufacturer.objects.create(name="WaspCorp"),
+        )
+        self.container.refresh_from_db()
+        self.assertEqual(self.container.display_name, "BeeCorp Hive")
+        self.assertEqual(other.display_name, "WaspCorp Hive")
+
+        other.name = "Nest"
+        other.save()
+        self.container.refresh_from_db()
+        self.assertEqual(self.container.display_name, "Hive")
+        self.assertEqual(other.display_name, "Nest")
+
+    def test_display_name_after_duplicate_deleted(self) -> None:
+        """Test that the manufacturer is left out of the display name once the name is no longer ambiguous."""
+        other = AssetModel.objects.create(
+            name="Hive",
+            manufacturer=Manufacturer.objects.create(name="WaspCorp"),
+        )
+        self.container.refresh_from_db()
+        asset = Asset.objects.create(asset_model=self.container)
+        node = Node.add_root(node_type="A", asset=asset)
+        asset.refresh_from_db()
+        self.assertEqual(asset.display_name, f"BeeCorp Hive ({asset.id})")
+
+        other.delete()
+        self.container.refresh_from_db()
+        asset.refresh_from_db()
+        node.refresh_from_db()
+        self.assertEqual(self.container.display_name, "Hive")
+        self.assertEqual(asset.display_name, f"Hive ({asset.id})")
+        self.assertEqual(node.display_name, asset.display_name)
+
     def test_protected_from_manufacturer_delete(self) -> None:
         """Test that deleting the manager does not casade."""
         with self.assertRaisesRegex(ProtectedError, "Hive"):
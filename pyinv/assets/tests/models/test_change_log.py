@@ -0,0 +1,97 @@
+from typing import List, Tuple
+
+import pytest
+from django.apps import apps
+from django.db import connection
+
+from assets.apps import sync_database_objects
+from assets.models import Asset, AssetModel, ChangeLogEntry, Manufacturer, Node
+from assets.models.change_log import (
+    drop_change_log_triggers,
+    get_logged_tables,
+    sync_change_log_triggers,
+)
+
+
+def get_log() -> List[Tuple[str, str]]:
+    return [(entry.object_type, entry.action) for entry in ChangeLogEntry.objects.order_by('id')]
+
+
+class TestChangeCursor:
+    """Test formatting and parsing the cursors of the change log."""
+
+    def test_round_trip(self) -> None:
+        assert ChangeLogEntry.format_cursor((12, 345)) == "12.345"
+        assert ChangeLogEntry.parse_cursor("12.345") == (12, 345)
+
+    @pytest.mark.parametrize("value", ["", "12", "a.b", "1.-1", "1.2.3"])
+    def test_invalid_cursor(self, value: str) -> None:
+        with pytest.raises(ValueError):
+            ChangeLogEntry.parse_cursor(value)
+
+
+@pytest.mark.django_db
+class TestChangeLog:
+    """Test that changes are logged by the database."""
+
+    def test_log_changes(self, manufacturer: Manufacturer) -> None:
+        ChangeLogEntry.objects.all().delete()
+        asset_model = AssetModel.objects.create(name="Widget", manufacturer=manufacturer)
+        asset = Asset.objects.create(asset_model=asset_model)
+        assert ("asset-model", "C") in get_log()
+        assert ("asset", "C") in get_log()
+
+        entry = ChangeLogEntry.objects.filter(object_type="asset").latest('id')
+        assert entry.object_id == asset.pk
+
+        ChangeLogEntry.objects.all().delete()
+        Asset.objects.filter(pk=asset.pk).update(extra_data={"serial": "1"})
+        asset.delete()
+        # The asset model is shown with the number of its assets.
+        assert get_log() == [("asset", "U"), ("asset", "D"), ("asset-model", "U")]
+
+    def test_log_tree_moves(self, location: Node) -> None:
+        shelf = Node.add_root(node_type="L", name="Shelf")
+        ChangeLogEntry.objects.all().delete()
+
+        shelf.move(location, "last-child")
+        logged = set(ChangeLogEntry.objects.values_list('object_id', flat=True))
+        assert shelf.pk in logged
+
+    def test_sync_triggers(self, manufacturer: Manufacturer) -> None:
+        drop_change_log_triggers(connection, get_logged_tables())
+        ChangeLogEntry.objects.all().delete()
+        Manufacturer.objects.create(name="Acme")
+        assert get_log() == []
+
+        sync_change_log_triggers(connection, get_logged_tables())
+        Manufacturer.objects.create(name="Globex")
+        assert get_log() == [("manufacturer", "C")]
+
+    def test_restore_triggers_after_migrating(self, manufacturer: Manufacturer) -> None:
+        drop_change_log_triggers(connection, [Manufacturer._meta.db_table])
+        ChangeLogEntry.objects.all().delete()
+
+        # The manufacturer may have changed while its table was not logged.
+        sync_database_objects(apps.get_app_config('assets'), connection.alias)
+        assert get_log() == [("manufacturer", "U")]
+        assert ChangeLogEntry.objects.get().object_id == manufacturer.pk
+        Manufacturer.objects.create(name="Globex")
+        assert get_log() == [("manufacturer", "U"), ("manufacturer", "C")]
+
+        ChangeLogEntry.objects.all().delete()
+        sync_database_objects(apps.get_app_config('assets'), connection.alias)
+        assert get_log() == []
+
+    def test_get_page(self, manufacturer: Manufacturer) -> None:
+        ChangeLogEntry.objects.all().delete()
+        for name in ("A", "B", "C"):
+            Manufacturer.objects.create(name=name)
+
+        entries, more = ChangeLogEntry.get_page((0, 0), 2)
+        assert len(entries) == 2
+        assert more
+        entries, more = ChangeLogEntry.get_page(entries[-1].cursor, 2)
+        assert len(entries) == 1
+        assert not more
+        assert ChangeLogEntry.get_page(entries[-1].cursor, 2) == ([], False)
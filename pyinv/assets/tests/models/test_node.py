@@ -1,6 +1,10 @@
-from django.db import IntegrityError
+from unittest.mock import patch
+
+from django.db import IntegrityError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
+from assets.asset_codes import AssetCodeType
 from assets.models import Asset, AssetModel, Manufacturer, Node
 
 
@@ -52,6 +56,220 @@ class TestNode(TestCase):
 
         self.assertEqual(str(grandchild), "baz")
 
+    def test_prefetch_ancestors(self) -> None:
+        """Test that the ancestors of several nodes can be fetched at once."""
+        root = Node.add_root(node_type="L", name="foo")
+        child = root.add_child(node_type="L", name="bar")
+        grandchild = child.add_child(node_type="L", name="baz")
+        other = root.add_child(node_type="L", name="qux")
+
+        nodes = list(Node.objects.order_by("path"))
+        with self.assertNumQueries(1):
+            Node.prefetch_ancestors(nodes)
+        with self.assertNumQueries(0):
+            ancestors = {node.name: node.ancestors for node in nodes}
+            parents = {node.name: node.parent for node in nodes}
+
+        self.assertEqual(ancestors, {"foo": [], "bar": [root], "baz": [root, child], "qux": [root]})
+        self.assertEqual(parents, {"foo": None, "bar": root, "baz": child, "qux": root})
+        self.assertEqual(list(grandchild.ancestors), [root, child])
+        self.assertEqual(other.parent, root)
+
+    def test_prefetch_parents(self) -> None:
+        """Test that the parents of several nodes can be fetched at once."""
+        root = Node.add_root(node_type="L", name="foo")
+        child = root.add_child(node_type="L", name="bar")
+        child.add_child(node_type="L", name="baz")
+
+        nodes = list(Node.objects.order_by("path"))
+        with self.assertNumQueries(1):
+            Node.prefetch_parents(nodes)
+        with self.assertNumQueries(0):
+            self.assertEqual([node.parent for node in nodes], [None, root, child])
+
+    def test_path_upper_bound(self) -> None:
+        """Test the first path after a subtree."""
+        self.assertEqual(Node._get_path_upper_bound("00010002"), "00010003")
+        self.assertEqual(Node._get_path_upper_bound("0001000Z"), "0001001")
+        self.assertEqual(Node._get_path_upper_bound("000ZZZZZ"), "001")
+        self.assertIsNone(Node._get_path_upper_bound("ZZZZ"))
+
+    def test_get_descendants_filter(self) -> None:
+        """Test selecting the descendants of several nodes at once."""
+        foo = Node.add_root(node_type="L", name="foo")
+        bar = foo.add_child(node_type="L", name="bar")
+        baz = bar.add_child(node_type="L", name="baz")
+        qux = Node.add_root(node_type="L", name="qux")
+        quux = qux.add_child(node_type="L", name="quux")
+        Node.add_root(node_type="L", name="corge").add_child(node_type="L", name="grault")
+
+        self.assertEqual(list(Node.objects.filter(Node.get_descendants_filter([]))), [])
+        self.assertEqual(list(Node.objects.filter(Node.get_descendants_filter([foo, qux]))), [bar, baz, quux])
+        self.assertEqual(
+            list(Node.objects.filter(Node.get_descendants_filter([foo, qux], children_only=True))),
+            [bar, quux],
+        )
+
+    def test_add_child_with_stale_parent(self) -> None:
+        """Test that children are added after the children in the database, not in memory."""
+        root = Node.add_root(node_type="L", name="foo")
+        stale_root = Node.objects.get(pk=root.pk)
+        first = root.add_child(node_type="L", name="bar")
+        second = stale_root.add_child(node_type="L", name="baz")
+        third = root.add_child(node_type="L", name="qux")
+
+        self.assertEqual([first.path, second.path, third.path], ["00010001", "00010002", "00010003"])
+        self.assertEqual(list(root.get_children()), [first, second, third])
+        root.refresh_from_db()
+        self.assertEqual(root.numchild, 3)
+
+    def test_add_child_to_deleted_node(self) -> None:
+        """Test that a child cannot be added to a node that has been deleted."""
+        root = Node.add_root(node_type="L", name="foo")
+        Node.objects.filter(pk=root.pk).delete()
+        with self.assertRaises(Node.DoesNotExist):
+            root.add_child(node_type="L", name="bar")
+        self.assertFalse(Node.objects.exists())
+
+    def test_add_children(self) -> None:
+        """Test that many children are added after the existing children, with their counts, locations and search."""
+        root = Node.add_root(node_type="L", name="foo")
+        stale_root = Node.objects.get(pk=root.pk)
+        first = root.add_child(node_type="L", name="bar")
+        assets = Asset.objects.bulk_create(Asset(asset_model=self.asset_model, display_name="baz") for _ in range(3))
+
+        with CaptureQueriesContext(connection) as queries:
+            children = stale_root.add_children(Node(node_type="A", asset=asset) for asset in assets)
+        self.assertLessEqual(len(queries), 18)
+
+        self.assertEqual([child.path for child in children], ["00010002", "00010003", "00010004"])
+        self.assertEqual(list(root.get_children()), [first, *children])
+        for child in Node.objects.filter(pk__in=[child.pk for child in children]):
+            self.assertEqual((child.display_name, child.is_container), ("baz", False))
+            self.assertEqual((child.location_path, child.location_ids), ("foo", [str(root.pk)]))
+            self.assertTrue(child.search_document.startswith("baz\nfoo\n"))
+        root.refresh_from_db()
+        self.assertEqual(root.numchild, 4)
+        self.assertEqual(root.asset_counts.get().count, 3)
+
+    def test_add_children_to_non_container(self) -> None:
+        """Test that children cannot be added to an asset that is not a container."""
+        node = Node.add_root(node_type="A", asset=self.asset)
+        with self.assertRaises(ValueError):
+            node.add_children([Node(node_type="L", name="foo")])
+        self.assertEqual(Node.objects.count(), 1)
+
+    def test_add_root_retries_taken_path(self) -> None:
+        """Test that a root is added at the next path if another writer takes its path first."""
+        first = Node.add_root(node_type="L", name="foo")
+        get_next_child_path = Node._get_next_child_path
+        with patch.object(Node, "_get_next_child_path", side_effect=[first.path, get_next_child_path(None)]):
+            second = Node.add_root(node_type="L", name="bar")
+        self.assertEqual(second.path, "0002")
+        self.assertEqual(list(Node.get_root_nodes()), [first, second])
+
+    def test_locations(self) -> None:
+        """Test that the locations of nodes are kept up to date as the tree changes."""
+        warehouse = Node.add_root(node_type="L", name="warehouse")
+        shelf = warehouse.add_child(node_type="L", name="shelf")
+        self.asset_model.is_container = True
+        self.asset_model.save()
+        crate = shelf.add_child(node_type="A", asset=self.asset)
+        item = crate.add_child(node_type="L", name="item")
+        other = Node.add_root(node_type="L", name="other")
+
+        def assertLocation(node: Node, *ancestors: Node) -> None:
+            node.refresh_from_db()
+            self.assertEqual(node.location_path, " / ".join(ancestor.display_name for ancestor in ancestors))
+            self.assertEqual(node.location_ids, [str(ancestor.pk) for ancestor in ancestors])
+
+        assertLocation(warehouse)
+        assertLocation(item, warehouse, shelf, crate)
+
+        shelf.name = "bay"
+        shelf.save()
+        assertLocation(item, warehouse, shelf, crate)
+
+        self.asset.add_asset_code(AssetCodeType.DAMM32, None)
+        crate.refresh_from_db()
+        assertLocation(item, warehouse, shelf, crate)
+
+        self.asset_model.name = "baz"
+        self.asset_model.save()
+        crate.refresh_from_db()
+        assertLocation(item, warehouse, shelf, crate)
+
+        crate.move(other, pos="last-child")
+        assertLocation(crate, other)
+        assertLocation(item, other, crate)
+
+        Node.bulk_move([crate], warehouse)
+        assertLocation(item, warehouse, crate)
+
+    def test_bulk_move(self) -> None:
+        """Test that several subtrees can be moved at once."""
+        old = Node.add_root(node_type="L", name="old")
+        target = Node.add_root(node_type="L", name="target")
+        target.add_child(node_type="L", name="existing")
+        box = old.add_child(node_type="L", name="box")
+        box.add_child(node_type="A", asset=self.asset)
+        crate = Node.add_root(node_type="L", name="crate")
+        old.add_child(node_type="L", name="left-behind")
+
+        moves = Node.bulk_move([box, crate], target)
+        self.assertEqual(moves, [(box, old), (crate, None)])
+
+        self.assertEqual(Node.find_problems(), ([], [], [], [], []))
+        target.refresh_from_db()
+        old.refresh_from_db()
+        self.assertEqual(old.numchild, 1)
+        self.assertEqual(
+            [(node.name, node.depth) for node in target.get_descendants()],
+            [("existing", 2), ("box", 2), (None, 3), ("crate", 2)],
+        )
+
+    def test_move_forgets_ancestors(self) -> None:
+        """Test that moved nodes do not keep their cached ancestors and parents."""
+        old = Node.add_root(node_type="L", name="old")
+        target = Node.add_root(node_type="L", name="target")
+        box = old.add_child(node_type="L", name="box")
+        crate = old.add_child(node_type="L", name="crate")
+        Node.prefetch_ancestors([box, crate])
+        self.assertEqual(box.parent, old)
+
+        box.move(target, pos="last-child")
+        self.assertEqual((box.ancestors, box.parent, box.depth), ([target], target, 2))
+        self.assertEqual(box.location_path, "target")
+
+        Node.bulk_move([box, crate], old)
+        for node in (box, crate):
+            self.assertEqual((node.ancestors, node.parent, node.depth), ([old], old, 2))
+            self.assertEqual(node.location_path, "old")
+
+    def test_bulk_move_query_count(self) -> None:
+        """Test that the number of queries does not depend on the number of nodes moved."""
+        old = Node.add_root(node_type="L", name="old")
+        nodes = [old.add_child(node_type="L", name=f"node-{i}") for i in range(10)]
+
+        with CaptureQueriesContext(connection) as few:
+            Node.bulk_move(nodes[:2], Node.add_root(node_type="L", name="a"))
+        with CaptureQueriesContext(connection) as many:
+            Node.bulk_move(nodes[2:], Node.add_root(node_type="L", name="b"))
+        self.assertEqual(len(few), len(many))
+
+    def test_bulk_move_invalid(self) -> None:
+        """Test that nodes cannot be moved somewhere invalid."""
+        root = Node.add_root(node_type="L", name="foo")
+        child = root.add_child(node_type="L", name="bar")
+        asset = root.add_child(node_type="A", asset=self.asset)
+
+        with self.assertRaisesRegex(ValueError, "cannot contain other nodes"):
+            Node.bulk_move([child], asset)
+        with self.assertRaisesRegex(ValueError, "inside itself"):
+            Node.bulk_move([root], child)
+        with self.assertRaisesRegex(ValueError, "one of its ancestors"):
+            Node.bulk_move([root, child], Node.add_root(node_type="L", name="baz"))
+
     def test_location_must_have_name(self) -> None:
         """Test that a location must have a name."""
         with self.assertRaises(IntegrityError):
@@ -65,15 +283,32 @@ class TestNode(TestCase):
     def test_asset_link(self) -> None:
         """Test that we can link a node to an asset info."""
         node = Node.add_root(node_type="A", asset=self.asset)
+        assert node.asset is not None
         self.assertEqual(node.asset.asset_model, self.asset.asset_model)
         self.assertEqual(str(node), f"bar ({node.asset.first_asset_code})")
 
     def test_asset_link_with_name(self) -> None:
         """Test that we can link a node to an asset info with a name."""
         node = Node.add_root(node_type="A", asset=self.asset, name="foobar")
+        assert node.asset is not None
         self.assertEqual(node.asset.display_name, "foobar")
         self.assertEqual(str(node), "foobar")
 
+    def test_is_container(self) -> None:
+        """Test that locations and container assets can contain other nodes."""
+        self.assertTrue(Node.add_root(node_type="L", name="foo").is_container)
+        node = Node.add_root(node_type="A", asset=self.asset)
+        self.assertFalse(node.is_container)
+
+        self.asset.asset_model = AssetModel.objects.create(
+            name="baz",
+            manufacturer=self.manufacturer,
+            is_container=True,
+        )
+        self.asset.save()
+        node.refresh_from_db()
+        self.assertTrue(node.is_container)
+
     def test_location_cannot_be_linked_to_asset(self) -> None:
         """Test that a location cannot be linked to an asset."""
         with self.assertRaises(IntegrityError):
@@ -0,0 +1,93 @@
+from typing import Dict, Tuple
+from uuid import UUID
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError
+from django.test import TestCase
+
+from assets.models import Asset, AssetModel, Manufacturer, Node, NodeAssetCount
+
+
+class TestNodeAssetCount(TestCase):
+    """Test that the asset counts are maintained as the tree changes."""
+
+    def setUp(self) -> None:
+        manufacturer = Manufacturer.objects.create(name="foo")
+        self.model_a = AssetModel.objects.create(name="a", manufacturer=manufacturer, is_container=True)
+        self.model_b = AssetModel.objects.create(name="b", manufacturer=manufacturer)
+
+        self.warehouse = Node.add_root(node_type="L", name="warehouse")
+        self.shelf = self.warehouse.add_child(node_type="L", name="shelf")
+        self.crate = self.shelf.add_child(node_type="A", asset=Asset.objects.create(asset_model=self.model_a))
+        for _ in range(3):
+            self.crate.add_child(node_type="A", asset=Asset.objects.create(asset_model=self.model_b))
+        self.other = Node.add_root(node_type="L", name="other")
+
+    def _counts(self) -> Dict[Tuple[UUID, UUID], int]:
+        return {
+            (row.node_id, row.asset_model_id): row.count
+            for row in NodeAssetCount.objects.all()
+        }
+
+    def assertCountsCorrect(self) -> None:
+        self.assertEqual(self._counts(), NodeAssetCount.recount())
+
+    def test_add(self) -> None:
+        self.assertCountsCorrect()
+        self.assertEqual(self._counts(), {
+            (self.warehouse.pk, self.model_a.pk): 1,
+            (self.warehouse.pk, self.model_b.pk): 3,
+            (self.shelf.pk, self.model_a.pk): 1,
+            (self.shelf.pk, self.model_b.pk): 3,
+            (self.crate.pk, self.model_b.pk): 3,
+        })
+
+    def test_move(self) -> None:
+        self.crate.move(self.other, pos="last-child")
+        self.assertCountsCorrect()
+        self.assertFalse(NodeAssetCount.objects.filter(node=self.warehouse).exists())
+
+    def test_move_sibling(self) -> None:
+        self.crate.move(self.warehouse, pos="left")
+        self.assertCountsCorrect()
+
+    def test_bulk_move(self) -> None:
+        Node.bulk_move([self.other, *self.crate.get_children()[:2]], self.warehouse)
+        self.assertCountsCorrect()
+
+    def test_change_asset_model(self) -> None:
+        asset = self.crate.get_children()[0].asset
+        assert asset is not None
+        asset.asset_model = self.model_a
+        asset.save()
+        self.assertCountsCorrect()
+        self.assertEqual(self._counts()[self.crate.pk, self.model_a.pk], 1)
+        self.assertEqual(self._counts()[self.warehouse.pk, self.model_b.pk], 2)
+
+    def test_delete(self) -> None:
+        self.crate.get_children()[0].delete()
+        self.assertCountsCorrect()
+        Node.objects.filter(pk__in=[self.shelf.pk, self.crate.pk]).delete()
+        self.assertCountsCorrect()
+        self.assertFalse(NodeAssetCount.objects.exists())
+
+    def test_drift_fails(self) -> None:
+        """Test that removing more assets than are counted fails, rather than storing a wrong count."""
+        NodeAssetCount.objects.filter(node=self.shelf, asset_model=self.model_b).update(count=0)
+        with self.assertRaises(IntegrityError):
+            self.crate.get_children()[0].delete()
+
+        NodeAssetCount.objects.filter(node=self.shelf).delete()
+        with self.assertRaises(IntegrityError):
+            self.crate.get_children()[0].delete()
+
+    def test_rebuild_command(self) -> None:
+        call_command("rebuild_node_asset_counts", "--check")
+
+        NodeAssetCount.objects.filter(node=self.shelf).delete()
+        with self.assertRaisesRegex(CommandError, "do not match"):
+            call_command("rebuild_node_asset_counts", "--check")
+
+        call_command("rebuild_node_asset_counts")
+        self.assertCountsCorrect()
@@ -0,0 +1,83 @@
+from typing import Set
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from assets.models import Node, NodeClosure
+from assets.models.node_closure import Link
+
+
+@override_settings(NODE_TREE_BACKEND='closure')
+class TestNodeClosure(TestCase):
+    """Test that the closure table is maintained and used as the tree changes."""
+
+    def setUp(self) -> None:
+        self.warehouse = Node.add_root(node_type="L", name="warehouse")
+        self.shelf = self.warehouse.add_child(node_type="L", name="shelf")
+        self.crate = self.shelf.add_child(node_type="L", name="crate")
+        self.items = [self.crate.add_child(node_type="L", name=f"item {i}") for i in range(3)]
+        self.other = Node.add_root(node_type="L", name="other")
+
+    def _links(self) -> Set[Link]:
+        return {
+            (link.ancestor_id, link.descendant_id, link.distance)
+            for link in NodeClosure.objects.all()
+        }
+
+    def assertLinksCorrect(self) -> None:
+        self.assertEqual(self._links(), NodeClosure.get_expected_links())
+
+    def test_add(self) -> None:
+        self.assertLinksCorrect()
+        self.assertEqual(NodeClosure.objects.filter(descendant=self.items[0]).count(), 4)
+        self.assertEqual(NodeClosure.objects.filter(ancestor=self.warehouse).count(), 6)
+
+    def test_move(self) -> None:
+        self.crate.move(self.other, pos="last-child")
+        self.assertLinksCorrect()
+        self.assertEqual(list(self.items[0].get_ancestors()), [self.other, self.crate])
+
+    def test_move_sibling(self) -> None:
+        self.crate.move(self.warehouse, pos="left")
+        self.assertLinksCorrect()
+
+    def test_bulk_move(self) -> None:
+        Node.bulk_move([self.crate], self.other)
+        Node.bulk_move([self.shelf, self.items[1]], self.other)
+        self.assertLinksCorrect()
+
+    def test_maintained_with_path_backend(self) -> None:
+        """Test that the links stay correct while paths are used for lookups, so that the backend can be switched."""
+        with self.settings(NODE_TREE_BACKEND='path'):
+            self.crate.move(self.other, pos="last-child")
+            Node.bulk_move([self.items[1]], self.warehouse)
+            self.shelf.add_child(node_type="L", name="box")
+        self.assertLinksCorrect()
+        self.assertEqual(list(self.items[0].get_ancestors()), [self.other, self.crate])
+
+    def test_delete(self) -> None:
+        self.items[0].delete()
+        self.assertLinksCorrect()
+        Node.objects.filter(pk__in=[self.shelf.pk, self.crate.pk]).delete()
+        self.assertLinksCorrect()
+        self.assertEqual(self._links(), {(self.warehouse.pk, self.warehouse.pk, 0), (self.other.pk, self.other.pk, 0)})
+
+    def test_lookups(self) -> None:
+        self.assertEqual(list(self.items[0].get_ancestors()), [self.warehouse, self.shelf, self.crate])
+        self.assertEqual(list(self.shelf.get_descendants()), [self.crate, *self.items])
+        self.assertEqual(
+            list(Node.objects.filter(Node.get_descendants_filter([self.shelf, self.crate], children_only=True))),
+            [self.crate, *self.items],
+        )
+        self.assertEqual(self.shelf.get_subtree(depth=1).children, [self.crate])
+
+    def test_rebuild_command(self) -> None:
+        call_command("rebuild_node_closure", "--check")
+
+        NodeClosure.objects.filter(descendant=self.crate).delete()
+        with self.assertRaisesRegex(CommandError, "do not match"):
+            call_command("rebuild_node_closure", "--check")
+
+        call_command("rebuild_node_closure")
+        self.assertLinksCorrect()
@@ -0,0 +1,81 @@
+import pytest
+from django.apps import apps
+from django.db import connection
+
+from assets.apps import sync_database_objects
+from assets.asset_codes import AssetCodeType
+from assets.models import Asset, AssetModel, Manufacturer, Node
+from assets.models.search import (
+    get_search_table,
+    get_search_triggers,
+    search,
+    sync_search_indexes,
+)
+
+
+def get_document(asset: Asset) -> str:
+    return Asset.objects.get(pk=asset.pk).search_document
+
+
+@pytest.mark.django_db
+class TestSearchDocuments:
+    """Test that the search documents of assets and nodes are kept up to date."""
+
+    def test_asset_document(self, asset: Asset) -> None:
+        code = asset.add_asset_code(AssetCodeType.DAMM32, None).code.lower()
+        assert get_document(asset).split("\n") == [f"foo model ({code})", "foo model", "foo-model", "foo", "foo", code]
+
+    def test_asset_document_in_tree(self, asset: Asset, location: Node) -> None:
+        node = location.add_child(node_type="A", asset=asset, name="Spare")
+        assert get_document(asset).split("\n")[:2] == ["spare", "location"]
+        assert Node.objects.get(pk=node.pk).search_document == get_document(asset)
+
+        location.name = "Warehouse"
+        location.save()
+        assert get_document(asset).split("\n")[:2] == ["spare", "warehouse"]
+
+        node.move(Node.add_root(node_type="L", name="Shelf"), "last-child")
+        assert get_document(asset).split("\n")[:2] == ["spare", "shelf"]
+
+        Node.objects.filter(pk=node.pk).delete()
+        assert get_document(asset).split("\n")[:2] == ["foo model (" + str(asset.id) + ")", "foo model"]
+
+    def test_asset_model_and_manufacturer_changes(self, asset: Asset, manufacturer: Manufacturer) -> None:
+        asset.asset_model.name = "Renamed Model"
+        asset.asset_model.save()
+        assert "renamed model" in get_document(asset).split("\n")
+
+        manufacturer.name = "Acme"
+        manufacturer.save()
+        assert "acme" in get_document(asset).split("\n")
+
+    def test_search(self, asset_model: AssetModel, location: Node) -> None:
+        found = Asset.objects.create(asset_model=asset_model)
+        location.add_child(node_type="A", asset=found)
+        Asset.objects.create(asset_model=asset_model)
+
+        assert list(search(Asset.objects.all(), ["LOCATION", "foo"])) == [found]
+        assert list(search(Asset.objects.all(), ["cat", "fo"])) == [found]
+        assert list(search(Node.objects.all(), ["location"])) == [location, found.node]
+        assert not search(Asset.objects.all(), ['"location"']).exists()
+
+    @pytest.mark.skipif(connection.vendor != 'sqlite', reason="The full-text index is only used on SQLite")
+    def test_rebuild_index(self, asset: Asset) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {get_search_table(Asset._meta.db_table)}")
+        assert not search(Asset.objects.all(), ["foo"]).exists()
+
+        sync_search_indexes(connection, [Asset._meta.db_table], rebuild=True)
+        assert list(search(Asset.objects.all(), ["foo"])) == [asset]
+
+    @pytest.mark.skipif(connection.vendor != 'sqlite', reason="The full-text index is only used on SQLite")
+    def test_sync_after_migrating(self, asset: Asset, asset_model: AssetModel) -> None:
+        # Rebuilding a table in a migration drops its triggers.
+        with connection.cursor() as cursor:
+            for trigger in get_search_triggers(Asset._meta.db_table):
+                cursor.execute(f"DROP TRIGGER {trigger}")
+        other = Asset.objects.create(asset_model=asset_model)
+        Asset.objects.filter(pk=asset.pk).delete()
+
+        sync_database_objects(apps.get_app_config('assets'), connection.alias)
+        assert list(search(Asset.objects.all(), ["foo"])) == [other]
@@ -5,6 +5,7 @@ from django.core.exceptions import ValidationError
 
 from assets.asset_codes import (
     AssetCodeStrategy,
+    AssetCodeType,
     Damm32AssetCodeStrategy,
     StudentRoboticsAssetCodeStrategy,
 )
@@ -23,6 +24,18 @@ class TestDamm32AssetCode(unittest.TestCase):
             code = self.strategy.generate_new_code() or "Failed to generate"
             self.strategy.validate(code)
 
+    def test_generate_code_at_index(self) -> None:
+        indexes = [*range(1000), *range(self.strategy.KEYSPACE_SIZE - 1000, self.strategy.KEYSPACE_SIZE)]
+        codes = {self.strategy.generate_code_at_index("INV", index) for index in indexes}
+        self.assertEqual(len(codes), len(indexes))
+        for code in codes:
+            self.strategy.validate(code)
+
+    def test_generate_code_at_index_out_of_range(self) -> None:
+        for index in (-1, self.strategy.KEYSPACE_SIZE):
+            with self.assertRaises(ValueError):
+                self.strategy.generate_code_at_index("INV", index)
+
     def test_validate_good_asset_codes(self) -> None:
         for code in self.VALID_CODES:
             self.strategy.validate(code)
@@ -32,6 +45,29 @@ class TestDamm32AssetCode(unittest.TestCase):
             with self.assertRaises(ValidationError):
                 self.strategy.validate(code)
 
+    def test_get_corrections(self) -> None:
+        for code in self.VALID_CODES:
+            self.assertEqual(self.strategy.get_corrections(code), set())
+
+            typo = code[:5] + ("A" if code[5] != "A" else "B") + code[6:]
+            self.assertIn(code, self.strategy.get_corrections(typo))
+
+            swapped = code[:8] + code[9] + code[8] + code[10:]
+            if swapped != code:
+                self.assertIn(code, self.strategy.get_corrections(swapped))
+
+        for corrections in map(self.strategy.get_corrections, ["INV-DRE-XYZ", "inv-dr0-xy2", "invdrexy1"]):
+            self.assertTrue(corrections)
+            for code in corrections:
+                self.strategy.validate(code)
+
+        self.assertEqual(self.strategy.get_corrections("INV-DRE"), set())
+
+    def test_normalise(self) -> None:
+        self.assertEqual(self.strategy.normalise(" inv-dre-xy2 "), "INV-DRE-XY2")
+        self.assertEqual(self.strategy.normalise("invdrexy2"), "INV-DRE-XY2")
+        self.assertEqual(self.strategy.normalise("inv-dre"), "INV-DRE")
+
 
 class TestStudentRoboticsAssetCodes():
 
@@ -55,3 +91,22 @@ class TestStudentRoboticsAssetCodes():
 
     def test_generate(self, strategy: AssetCodeStrategy) -> None:
         assert strategy.generate_new_code() is None
+
+    def test_normalise(self, strategy: AssetCodeStrategy) -> None:
+        assert strategy.normalise(" sr2ut29") == "2UT29"
+
+    @pytest.mark.parametrize("code", ["sr2UT27", "sr2TU29", "2UTZ9", "sr1VBV"])
+    def test_get_corrections(self, code: str, strategy: AssetCodeStrategy) -> None:
+        corrections = strategy.get_corrections(code)
+        assert corrections
+        for correction in corrections:
+            strategy.validate(correction)
+        assert "2UT29" in corrections or "1VBC" in corrections
+
+    def test_get_corrections_valid(self, strategy: AssetCodeStrategy) -> None:
+        assert strategy.get_corrections("sr2UT29") == set()
+
+
+def test_strategies_are_shared() -> None:
+    for code_type in AssetCodeType:
+        assert code_type.get_strategy() is code_type.get_strategy()
@@ -3,9 +3,11 @@
 from rest_framework.routers import SimpleRouter
 
 from .views import (
+    asset_codes,
     asset_events,
     asset_models,
     assets,
+    changes,
     changesets,
     manufacturers,
     nodes,
@@ -13,8 +15,10 @@ from .views import (
 
 router = SimpleRouter()
 router.register('assets', assets.AssetViewSet, basename='assets')
+router.register('asset-codes', asset_codes.AssetCodeViewSet, basename='asset-codes')
 router.register('asset-events', asset_events.AssetEventViewSet, basename="asset-events")
 router.register('asset-models', asset_models.AssetModelViewSet, basename='asset-models')
+router.register('changes', changes.ChangeFeedViewSet, basename='changes')
 router.register('changesets', changesets.ChangeSetViewSet, basename='changesets')
 router.register('manufacturers', manufacturers.ManufacturerViewSet, basename='manufacturers')
 router.register('nodes', nodes.NodeViewSet, basename='nodes')
@@ -0,0 +1,62 @@
+from drf_spectacular.utils import extend_schema
+from rest_framework import permissions, request, response, viewsets
+from rest_framework.decorators import action
+
+from assets.models import AssetCode, AssetCodePrefix
+from assets.serializers import (
+    AssetCodeKeyspaceSerializer,
+    AssetCodeReserveSerializer,
+    AssetCodeSuggestionQuerySerializer,
+    AssetCodeSuggestionSerializer,
+    AssetCodeValidateSerializer,
+)
+
+
+class AssetCodeValidatePermissions(permissions.DjangoModelPermissions):
+    """Validating asset codes only requires permission to view them."""
+
+    perms_map = {
+        **permissions.DjangoModelPermissions.perms_map,
+        'POST': ['%(app_label)s.view_%(model_name)s'],
+    }
+
+
+class AssetCodeViewSet(viewsets.GenericViewSet):
+    """Manage asset codes that are not yet assigned to assets."""
+
+    queryset = AssetCode.objects.all()
+
+    @extend_schema(request=AssetCodeReserveSerializer, responses=AssetCodeReserveSerializer)
+    @action(detail=False, methods=['post'])
+    def reserve(self, request: request.Request) -> response.Response:
+        """Reserve asset codes to be printed on labels, before the assets are registered."""
+        serializer = AssetCodeReserveSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return response.Response(serializer.data)
+
+    @extend_schema(responses=AssetCodeKeyspaceSerializer(many=True))
+    @action(detail=False, methods=['get'])
+    def keyspace(self, request: request.Request) -> response.Response:
+        """How many of the Damm32 asset codes with each prefix have been used."""
+        serializer = AssetCodeKeyspaceSerializer(AssetCodePrefix.get_occupancy(), many=True)
+        return response.Response(serializer.data)
+
+    @extend_schema(request=AssetCodeValidateSerializer, responses=AssetCodeValidateSerializer)
+    @action(detail=False, methods=['post'], permission_classes=[AssetCodeValidatePermissions])
+    def validate(self, request: request.Request) -> response.Response:
+        """Check whether many asset codes are valid, and whether assets already have them."""
+        serializer = AssetCodeValidateSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return response.Response(serializer.data)
+
+    @extend_schema(parameters=[AssetCodeSuggestionQuerySerializer], responses=AssetCodeSuggestionSerializer(many=True))
+    @action(detail=False)
+    def suggestions(self, request: request.Request) -> response.Response:
+        """Suggest the asset codes that a mistyped code may have been meant to be."""
+        query = AssetCodeSuggestionQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        serializer = AssetCodeSuggestionSerializer(AssetCode.get_suggestions(query.validated_data["code"]), many=True)
+        return response.Response(serializer.data)
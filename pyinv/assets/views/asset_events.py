@@ -4,9 +4,13 @@ from rest_framework import filters, permissions, viewsets
 from assets.filtersets import AssetEventFilterSet
 from assets.models import AssetEvent
 from assets.serializers import AssetEventWithAssetSerializer
+from pyinv.pagination import LimitOffsetOrCursorPagination
 
+from .mixins import SparseFieldsetViewSetMixin, sparse_fieldset_schema
 
-class AssetEventViewSet(viewsets.ReadOnlyModelViewSet):
+
+@sparse_fieldset_schema
+class AssetEventViewSet(SparseFieldsetViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """Fetch information about asset events."""
 
     # Require user to be logged in and have permissions, as this endpoint
@@ -15,6 +19,7 @@ class AssetEventViewSet(viewsets.ReadOnlyModelViewSet):
 
     queryset = AssetEvent.objects.all()
     serializer_class = AssetEventWithAssetSerializer
+    pagination_class = LimitOffsetOrCursorPagination
     filterset_class = AssetEventFilterSet
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     ordering_fields = ['changeset__timestamp']
@@ -7,15 +7,23 @@ from assets.models import AssetModel
 from assets.serializers import AssetModelSerializer
 from pyinv.api_exceptions import UnableToDelete
 
+from .mixins import (
+    ConditionalGetViewSetMixin,
+    SparseFieldsetViewSetMixin,
+    sparse_fieldset_schema,
+)
 
-class AssetModelViewSet(viewsets.ModelViewSet):
+
+@sparse_fieldset_schema
+class AssetModelViewSet(ConditionalGetViewSetMixin, SparseFieldsetViewSetMixin, viewsets.ModelViewSet):
     """Fetch information about asset models."""
 
+    queryset = AssetModel.objects.all()
     lookup_field = "slug"
     serializer_class = AssetModelSerializer
     filterset_class = AssetModelFilterSet
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    ordering_fields = ['name', 'asset_count', 'created_at', 'updated_at']
+    ordering_fields = ['name', 'display_name', 'asset_count', 'created_at', 'updated_at']
     search_fields = [
         'name',
         'slug',
@@ -24,7 +32,7 @@ class AssetModelViewSet(viewsets.ModelViewSet):
     ]
 
     def get_queryset(self) -> query.QuerySet[AssetModel]:
-        return AssetModel.objects.annotate(asset_count=Count('asset')).all()
+        return super().get_queryset().annotate(asset_count=Count('asset'))
 
     def perform_destroy(self, instance: AssetModel) -> None:
         try:
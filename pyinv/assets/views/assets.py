@@ -1,24 +1,102 @@
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, viewsets
+from drf_spectacular.utils import extend_schema
+from rest_framework import (
+    exceptions,
+    filters,
+    permissions,
+    request,
+    response,
+    status,
+    viewsets,
+)
+from rest_framework.decorators import action
 
-from assets.filtersets import AssetFilterSet
+from assets.filtersets import AssetFilterSet, SearchDocumentFilter
 from assets.models import Asset
-from assets.serializers import AssetWithNodeSerializer
+from assets.serializers import (
+    AssetBulkCreateSerializer,
+    AssetCodeGenerateSerializer,
+    AssetResolveSerializer,
+    AssetWithLocationSerializer,
+    AssetWithNodeSerializer,
+)
+from pyinv.pagination import LimitOffsetOrCursorPagination
 
+from .mixins import (
+    ConditionalGetViewSetMixin,
+    SparseFieldsetViewSetMixin,
+    sparse_fieldset_schema,
+)
 
-class AssetViewSet(viewsets.ReadOnlyModelViewSet):
+
+class AssetCodeGeneratePermissions(permissions.DjangoModelPermissions):
+    """Generating asset codes requires permission to add them."""
+
+    perms_map = {
+        **permissions.DjangoModelPermissions.perms_map,
+        'POST': ['%(app_label)s.add_assetcode'],
+    }
+
+
+class AssetResolvePermissions(permissions.DjangoModelPermissions):
+    """Resolving asset codes only requires permission to view assets."""
+
+    perms_map = {
+        **permissions.DjangoModelPermissions.perms_map,
+        'POST': ['%(app_label)s.view_%(model_name)s'],
+    }
+
+
+@sparse_fieldset_schema
+class AssetViewSet(ConditionalGetViewSetMixin, SparseFieldsetViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """Fetch information about assets."""
 
     queryset = Asset.objects.all()
     serializer_class = AssetWithNodeSerializer
+    pagination_class = LimitOffsetOrCursorPagination
     filterset_class = AssetFilterSet
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    ordering_fields = ['created_at', 'updated_at']
-    search_fields = [
-        'asset_model__name',
-        'asset_model__slug',
-        'asset_model__manufacturer__name',
-        'asset_model__manufacturer__slug',
-        'node__name',
-        'assetcode__code',
-    ]
+    filter_backends = [DjangoFilterBackend, SearchDocumentFilter, filters.OrderingFilter]
+    ordering_fields = ['display_name', 'created_at', 'updated_at']
+
+    @extend_schema(request=AssetBulkCreateSerializer, responses=AssetBulkCreateSerializer)
+    @action(detail=False, methods=['post'])
+    def bulk(self, request: request.Request) -> response.Response:
+        """Add many assets of a model to a node, each with an asset code, in a single changeset."""
+        serializer = AssetBulkCreateSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return response.Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(request=AssetCodeGenerateSerializer, responses=AssetCodeGenerateSerializer)
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='generate-codes',
+        permission_classes=[AssetCodeGeneratePermissions],
+    )
+    def generate_codes(self, request: request.Request) -> response.Response:
+        """Generate a new asset code for each of many assets."""
+        serializer = AssetCodeGenerateSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return response.Response(serializer.data)
+
+    @extend_schema(responses=AssetWithLocationSerializer)
+    @action(detail=False, methods=['get'], url_path='by-code/(?P<code>[^/]+)')
+    def by_code(self, request: request.Request, code: str) -> response.Response:
+        """Fetch the asset with an asset code, in any of the spellings that scanners send."""
+        asset = Asset.resolve([code]).get(code)
+        if asset is None:
+            raise exceptions.NotFound(f"No asset has the code {code}.")
+
+        self.check_object_permissions(request, asset)
+        return response.Response(AssetWithLocationSerializer(asset).data)
+
+    @extend_schema(request=AssetResolveSerializer, responses=AssetResolveSerializer)
+    @action(detail=False, methods=['post'], permission_classes=[AssetResolvePermissions])
+    def resolve(self, request: request.Request) -> response.Response:
+        """Find the assets that many scanned asset codes or asset IDs refer to, in the order they were given."""
+        serializer = AssetResolveSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return response.Response(serializer.data)
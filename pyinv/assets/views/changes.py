@@ -0,0 +1,103 @@
+from typing import Any, Dict, List, Set, Tuple, Type
+from uuid import UUID
+
+from django.db.models import Count, QuerySet
+from drf_spectacular.utils import extend_schema
+from rest_framework import request, response, viewsets
+from rest_framework.utils.urls import replace_query_param
+
+from assets.models import Asset, AssetModel, ChangeLogEntry, Manufacturer, Node
+from assets.serializers import (
+    AssetModelSerializer,
+    AssetWithNodeSerializer,
+    ChangeFeedQuerySerializer,
+    ChangeFeedSerializer,
+    ManufacturerSerializer,
+    NodeSerializer,
+)
+from assets.serializers.mixins import SparseFieldsetMixin
+
+ObjectKey = Tuple[str, UUID]
+
+
+class ChangeFeedViewSet(viewsets.GenericViewSet):
+    """
+    Fetch the assets, nodes, asset models and manufacturers that have changed since a cursor.
+
+    A page reads the next entries of the change log. Each object that they
+    changed is given once, with its latest action and its current data, so
+    a client that syncs often only fetches what has changed. Keep the cursor
+    of each page, and give it as since to fetch the changes after it.
+    """
+
+    queryset = ChangeLogEntry.objects.all()
+    pagination_class = None
+    filter_backends: List[Any] = []
+
+    @extend_schema(parameters=[ChangeFeedQuerySerializer], responses=ChangeFeedSerializer)
+    def list(self, request: request.Request) -> response.Response:  # noqa: A003
+        """Get the changes since a cursor."""
+        query = ChangeFeedQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        since = query.validated_data['since']
+
+        entries, more = ChangeLogEntry.get_page(since, query.validated_data['limit'])
+        cursor = ChangeLogEntry.format_cursor(entries[-1].cursor if entries else since)
+        serializer = ChangeFeedSerializer({
+            'cursor': cursor,
+            'more': more,
+            'next': replace_query_param(request.build_absolute_uri(), 'since', cursor) if more else None,
+            'results': self.get_changes(entries),
+        })
+        return response.Response(serializer.data)
+
+    def get_changes(self, entries: List[ChangeLogEntry]) -> List[Dict[str, Any]]:
+        """The latest change to each object in the entries, in the order of their latest changes."""
+        first: Dict[ObjectKey, ChangeLogEntry] = {}
+        latest: Dict[ObjectKey, ChangeLogEntry] = {}
+        for entry in entries:
+            key = (entry.object_type, entry.object_id)
+            first.setdefault(key, entry)
+            latest.pop(key, None)
+            latest[key] = entry
+
+        data = self.get_object_data(set(latest))
+        return [
+            {
+                'object_type': object_type,
+                'id': object_id,
+                'action': (
+                    'deleted' if (object_type, object_id) not in data
+                    else 'created' if first[object_type, object_id].action == ChangeLogEntry.Action.CREATE
+                    else 'updated'
+                ),
+                'timestamp': entry.timestamp,
+                'data': data.get((object_type, object_id)),
+            }
+            for (object_type, object_id), entry in latest.items()
+        ]
+
+    def get_object_serializers(self) -> Dict[str, Tuple['QuerySet[Any]', Type[SparseFieldsetMixin]]]:
+        """The objects of each type, and the serializer used for them by their own endpoint."""
+        return {
+            ChangeLogEntry.ObjectType.ASSET: (Asset.objects.all(), AssetWithNodeSerializer),
+            ChangeLogEntry.ObjectType.NODE: (Node.objects.all(), NodeSerializer),
+            ChangeLogEntry.ObjectType.ASSET_MODEL: (
+                AssetModel.objects.annotate(asset_count=Count('asset')),
+                AssetModelSerializer,
+            ),
+            ChangeLogEntry.ObjectType.MANUFACTURER: (Manufacturer.objects.all(), ManufacturerSerializer),
+        }
+
+    def get_object_data(self, keys: Set[ObjectKey]) -> Dict[ObjectKey, Dict[str, Any]]:
+        """Serialize the objects that still exist, with a few queries for each type of object."""
+        data = {}
+        for object_type, (queryset, serializer_class) in self.get_object_serializers().items():
+            ids = [object_id for key_type, object_id in keys if key_type == object_type]
+            if not ids:
+                continue
+            objects = list(serializer_class.setup_eager_loading(queryset.filter(pk__in=ids)))
+            serializer = serializer_class(objects, many=True, context=self.get_serializer_context())
+            serialized = getattr(serializer, 'data')
+            data.update({(object_type, obj.pk): obj_data for obj, obj_data in zip(objects, serialized)})
+        return data
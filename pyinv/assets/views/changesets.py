@@ -9,15 +9,20 @@ from assets.serializers import (
     AssetEventTimelineSerializer,
     ChangeSetSerializerWithCountSerializer,
 )
+from pyinv.pagination import LimitOffsetOrCursorPagination
 
+from .mixins import SparseFieldsetViewSetMixin, sparse_fieldset_schema
 
-class ChangeSetViewSet(viewsets.ReadOnlyModelViewSet):
+
+@sparse_fieldset_schema
+class ChangeSetViewSet(SparseFieldsetViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """Fetch information about asset events."""
 
     # Require user to be logged in and have permissions, as this endpoint
     # returns some information about users.
     permission_classes = [permissions.DjangoModelPermissions]
     serializer_class = ChangeSetSerializerWithCountSerializer
+    pagination_class = LimitOffsetOrCursorPagination
     queryset = ChangeSet.objects.all()
     filterset_class = ChangeSetFilterSet
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -28,7 +33,7 @@ class ChangeSetViewSet(viewsets.ReadOnlyModelViewSet):
 
     def get_queryset(self) -> query.QuerySet[ChangeSet]:
         """Enable sorting by event_count."""
-        return ChangeSet.objects.annotate(event_count=Count('assetevent')).all()
+        return super().get_queryset().annotate(event_count=Count('assetevent'))
 
     @action(detail=True)
     def events(self, request: request.Request, pk: int = 0) -> response.Response:
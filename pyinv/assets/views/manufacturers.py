@@ -5,8 +5,15 @@ from assets.models import Manufacturer
 from assets.serializers import ManufacturerSerializer
 from pyinv.api_exceptions import UnableToDelete
 
+from .mixins import (
+    ConditionalGetViewSetMixin,
+    SparseFieldsetViewSetMixin,
+    sparse_fieldset_schema,
+)
 
-class ManufacturerViewSet(viewsets.ModelViewSet):
+
+@sparse_fieldset_schema
+class ManufacturerViewSet(ConditionalGetViewSetMixin, SparseFieldsetViewSetMixin, viewsets.ModelViewSet):
     """Fetch information about manufacturers."""
 
     queryset = Manufacturer.objects.all()
@@ -0,0 +1,106 @@
+"""Behaviour shared by viewsets."""
+
+import hashlib
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from django.db import models
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from rest_framework import mixins, request, response, serializers, viewsets
+
+from assets.serializers import SparseFieldsetQuerySerializer
+from assets.serializers.mixins import SparseFieldsetMixin
+
+# Document the sparse fieldset parameters on the list and retrieve actions of a viewset.
+sparse_fieldset_schema = extend_schema_view(
+    list=extend_schema(parameters=[SparseFieldsetQuerySerializer]),
+    retrieve=extend_schema(parameters=[SparseFieldsetQuerySerializer]),
+)
+
+
+class SparseFieldsetViewSetMixin(viewsets.GenericViewSet):
+    """
+    Choose the fields of the results with the ``fields`` and ``expand`` query parameters.
+
+    The parameters apply to the list and retrieve actions. They are given to
+    the serializer to choose the fields that are serialized, and to its eager
+    loading to choose the relations that are fetched.
+    """
+
+    def get_sparse_fieldset(self) -> Dict[str, List[str]]:
+        if self.action not in ('list', 'retrieve'):
+            return {}
+        query = SparseFieldsetQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        return dict(query.validated_data)
+
+    def get_queryset(self) -> 'models.QuerySet[Any]':
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if issubclass(serializer_class, SparseFieldsetMixin):
+            queryset = serializer_class.setup_eager_loading(queryset, **self.get_sparse_fieldset())
+        return queryset
+
+    def get_serializer(self, *args: Any, **kwargs: Any) -> serializers.BaseSerializer:
+        if issubclass(self.get_serializer_class(), SparseFieldsetMixin):
+            kwargs = {**self.get_sparse_fieldset(), **kwargs}
+        return super().get_serializer(*args, **kwargs)
+
+
+class ConditionalGetViewSetMixin(mixins.RetrieveModelMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Answer the list and retrieve actions with 304 Not Modified when nothing has changed.
+
+    A list is versioned by the number of results and their latest
+    ``updated_at``, found with a single aggregate query of the filtered
+    queryset, and an object by its ``updated_at``. The version is sent as a
+    weak ETag and as Last-Modified, and a request with a matching
+    If-None-Match or a later If-Modified-Since is answered before anything
+    else is fetched or serialized.
+
+    Changes to the related objects that a row is shown with must update
+    its ``updated_at``, as assets do for their codes, model and node, and
+    asset models do for the number of their assets.
+    """
+
+    def get_etag(self, *version: Any) -> str:
+        # The browsable API and JSON are different representations of the same version.
+        key = repr((self.request.accepted_renderer.format, *version)).encode()
+        return f'W/"{hashlib.sha256(key).hexdigest()[:32]}"'
+
+    def get_conditional_response(
+        self,
+        etag: str,
+        last_modified: Optional[datetime],
+        get_response: Callable[[], response.Response],
+    ) -> response.Response:
+        timestamp = None if last_modified is None else int(last_modified.timestamp())
+        conditional = get_conditional_response(self.request, etag=etag, last_modified=timestamp)
+        resp = get_response() if conditional is None else response.Response(status=conditional.status_code)
+        resp['ETag'] = etag
+        if timestamp is not None:
+            resp['Last-Modified'] = http_date(timestamp)
+        # Without this, browsers may reuse a response with Last-Modified without asking whether it has changed.
+        patch_cache_control(resp, no_cache=True)
+        return resp
+
+    def list(self, request: request.Request, *args: Any, **kwargs: Any) -> response.Response:  # noqa: A003
+        queryset = self.filter_queryset(self.get_queryset())
+        version = queryset.aggregate(count=models.Count('pk'), last_modified=models.Max('updated_at'))
+        # The paginator uses the count rather than counting the results again.
+        self.result_count = version['count']
+        return self.get_conditional_response(
+            self.get_etag(*version.values()),
+            version['last_modified'],
+            lambda: super(ConditionalGetViewSetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request: request.Request, *args: Any, **kwargs: Any) -> response.Response:
+        instance = self.get_object()
+        return self.get_conditional_response(
+            self.get_etag(instance.pk, instance.updated_at),
+            instance.updated_at,
+            lambda: response.Response(self.get_serializer(instance).data),
+        )
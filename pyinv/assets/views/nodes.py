@@ -1,24 +1,81 @@
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, mixins, viewsets
+from drf_spectacular.utils import extend_schema
+from rest_framework import (
+    filters,
+    mixins,
+    permissions,
+    request,
+    response,
+    viewsets,
+)
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 
-from assets.filtersets import NodeFilterSet
+from assets.filtersets import NodeFilterSet, SearchDocumentFilter
 from assets.models import Node
-from assets.serializers import NodeSerializer
+from assets.serializers import (
+    NodeBulkMoveSerializer,
+    NodeSerializer,
+    NodeSummarySerializer,
+    NodeTreeQuerySerializer,
+    NodeTreeSerializer,
+)
+from pyinv.pagination import LimitOffsetOrCursorPagination
 
+from .mixins import SparseFieldsetViewSetMixin, sparse_fieldset_schema
 
-class NodeViewSet(mixins.UpdateModelMixin, viewsets.ReadOnlyModelViewSet):
+
+class NodeMovePermissions(permissions.DjangoModelPermissions):
+    """Moving nodes requires permission to change them."""
+
+    perms_map = {
+        **permissions.DjangoModelPermissions.perms_map,
+        'POST': ['%(app_label)s.change_%(model_name)s'],
+    }
+
+
+@sparse_fieldset_schema
+class NodeViewSet(SparseFieldsetViewSetMixin, mixins.UpdateModelMixin, viewsets.ReadOnlyModelViewSet):
     """Fetch information about nodes."""
 
     queryset = Node.objects.all()
     serializer_class = NodeSerializer
+    pagination_class = LimitOffsetOrCursorPagination
     filterset_class = NodeFilterSet
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    ordering_fields = ['name', 'created_at', 'updated_at', 'numchild', 'depth']
-    search_fields = [
-        'name',
-        'asset__asset_model__name',
-        'asset__asset_model__slug',
-        'asset__asset_model__manufacturer__name',
-        'asset__asset_model__manufacturer__slug',
-        'asset__assetcode__code',
-    ]
+    filter_backends = [DjangoFilterBackend, SearchDocumentFilter, filters.OrderingFilter]
+    ordering_fields = ['name', 'display_name', 'created_at', 'updated_at', 'numchild', 'depth']
+
+    @extend_schema(parameters=[NodeTreeQuerySerializer], responses=NodeTreeSerializer)
+    @action(detail=True)
+    def tree(self, request: request.Request, pk: str = "") -> response.Response:
+        """Get the node and its descendants as a nested tree."""
+        query = NodeTreeQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        # The depth parameter is also a filter, so don't filter the queryset.
+        node = get_object_or_404(self.get_queryset(), pk=pk)
+        self.check_object_permissions(request, node)
+
+        serializer = NodeTreeSerializer(instance=node.get_subtree(query.validated_data["depth"]))
+        return response.Response(serializer.data)
+
+    @extend_schema(responses=NodeSummarySerializer)
+    @action(detail=True)
+    def summary(self, request: request.Request, pk: str = "") -> response.Response:
+        """Get the number of assets of each asset model below the node."""
+        node = self.get_object()
+        counts = list(node.asset_counts.select_related('asset_model').order_by('-count', 'asset_model__name'))
+        serializer = NodeSummarySerializer(instance={
+            "asset_count": sum(count.count for count in counts),
+            "asset_models": counts,
+        })
+        return response.Response(serializer.data)
+
+    @extend_schema(request=NodeBulkMoveSerializer, responses=NodeBulkMoveSerializer)
+    @action(detail=False, methods=['post'], permission_classes=[NodeMovePermissions])
+    def move(self, request: request.Request) -> response.Response:
+        """Move many nodes to be children of a target node."""
+        serializer = NodeBulkMoveSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return response.Response(serializer.data)
@@ -44,6 +44,11 @@ ADMINS: List[Tuple[str, str]] = [
     # ('John Doe', 'jdoe@example.com'),
 ]
 
+# Keys of the extra data of assets that are filtered on often, such as serial numbers. On SQLite each key is given its
+# own index. On PostgreSQL a single index covers every key, so this is not used. The indexes are updated by
+# `./manage.py migrate`, or by `./manage.py sync_extra_data_indexes`.
+ASSET_EXTRA_DATA_INDEXED_KEYS = ['serial']
+
 # Base URL path if accessing PyInv within a directory. For example, if installed at https://example.com/pyinv/, set:
 # BASE_PATH = 'pyinv/'
 BASE_PATH = ''
@@ -67,6 +72,11 @@ EMAIL: Dict[str, Union[str, int, bool]] = {
     # 'FROM_EMAIL': 'pyinv@example.com',
 }
 
+# How ancestor and descendant lookups in the asset tree are made. 'path' uses prefixes of the materialized path of each
+# node. 'closure' uses the stored link between every node and each of its ancestors, making lookups a single indexed
+# join. The links are kept up to date with either backend, so it can be switched at any time.
+NODE_TREE_BACKEND = 'path'
+
 # Title of the System
 SYSTEM_TITLE = "PyInv"
 
@@ -85,3 +95,7 @@ SHORT_DATETIME_FORMAT = 'Y-m-d H:i'
 # Settings for Damm 32 Asset Codes
 DAMM32_ASSET_CODE_DEFAULT_PREFIX = 'INV'
 DAMM32_ASSET_CODE_PREFIXES = ['INV']
+
+# How new Damm 32 Asset Codes are generated. 'sequence' walks a counter through a fixed shuffle of the codes of each
+# prefix, so generation stays fast as a prefix fills up. 'random' picks codes at random, retrying any that are taken.
+DAMM32_ASSET_CODE_GENERATION = 'sequence'
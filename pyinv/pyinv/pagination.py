@@ -0,0 +1,249 @@
+"""Pagination of API list endpoints."""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from django.db import connections, models
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import APIView
+
+# A field to order by, and whether the order is descending.
+OrderingTerm = Tuple[str, bool]
+
+
+def estimate_count(queryset: 'models.QuerySet[Any]') -> int:
+    """
+    Estimate the number of rows in a queryset from the query plan.
+
+    Only PostgreSQL gives a row estimate, so other databases count exactly.
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class LimitOffsetOrCursorPagination(LimitOffsetPagination):
+    """
+    Paginate by limit and offset, or by cursor when the cursor parameter is given.
+
+    Deep offsets make the database read and discard every row before the
+    page. A cursor instead holds the ordering fields and id of the row at the
+    edge of a page, and the next page is filtered to the rows after it, so
+    every page is as cheap as the first. Pass an empty cursor to start.
+
+    The count is exact by default when paginating by offset, and skipped when
+    paginating by cursor. Either can be changed with the count parameter. A
+    view that has already counted the results can give the exact count as
+    its ``result_count``.
+    """
+
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    COUNT_MODES = ('exact', 'estimate', 'none')
+
+    def paginate_queryset(
+        self,
+        queryset: 'models.QuerySet[Any]',
+        request: Request,
+        view: Optional[APIView] = None,
+    ) -> Optional[List[Any]]:
+        self.request = request
+        self.url = request.build_absolute_uri()
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None  # pragma: nocover
+
+        self.known_count: Optional[int] = getattr(view, 'result_count', None)
+        self.use_cursor = self.cursor_query_param in request.query_params
+        if self.use_cursor and not isinstance(queryset, models.QuerySet):
+            raise ValidationError({self.cursor_query_param: ["This list cannot be paginated by cursor."]})
+        self.count = self.get_count_for_mode(queryset, self.get_count_mode(request))
+
+        if self.use_cursor:
+            return self.paginate_by_cursor(queryset, request, self.limit)
+
+        self.offset = self.get_offset(request)
+        self.next_offset = self.offset + self.limit
+        if self.count is not None and self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+
+        # Fetch one extra row to find whether there is a next page without the count.
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        return rows[:self.limit]
+
+    def get_count_mode(self, request: Request) -> str:
+        default = 'none' if self.use_cursor else 'exact'
+        mode = request.query_params.get(self.count_query_param, default)
+        if mode not in self.COUNT_MODES:
+            raise ValidationError({self.count_query_param: [f"Must be one of: {', '.join(self.COUNT_MODES)}."]})
+        return mode
+
+    def get_count_for_mode(self, queryset: 'models.QuerySet[Any]', mode: str) -> Optional[int]:
+        if mode == 'none':
+            return None
+        if mode == 'exact' and self.known_count is not None:
+            return self.known_count
+        if mode == 'estimate' and isinstance(queryset, models.QuerySet):
+            return estimate_count(queryset)
+        return int(self.get_count(queryset))
+
+    def paginate_by_cursor(self, queryset: 'models.QuerySet[Any]', request: Request, limit: int) -> List[Any]:
+        position, reverse = self.decode_cursor(request.query_params.get(self.cursor_query_param, ''))
+        self.ordering = self.get_ordering(queryset)
+        if position is not None and len(position) != len(self.ordering):
+            raise NotFound("Invalid cursor.")
+
+        # A previous page is found by reading backwards from its last row.
+        ordering = [(field, descending != reverse) for field, descending in self.ordering]
+        queryset = queryset.order_by(*(
+            models.F(field).desc(nulls_first=True) if descending else models.F(field).asc(nulls_last=True)
+            for field, descending in ordering
+        ))
+        if position is not None:
+            queryset = queryset.filter(self.get_rows_after(ordering, position))
+
+        rows = list(queryset[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = position is not None if reverse else has_more
+        self.has_previous = has_more if reverse else position is not None
+        self.first_position = self.get_position(rows[0]) if rows else None
+        self.last_position = self.get_position(rows[-1]) if rows else None
+        return rows
+
+    def get_ordering(self, queryset: 'models.QuerySet[Any]') -> List[OrderingTerm]:
+        """
+        The ordering of the queryset, made unique by ordering by id last.
+
+        The ordering filter has already been applied, so this is the ordering
+        that was asked for, or the default ordering of the endpoint.
+        """
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        terms: List[OrderingTerm] = []
+        for term in ordering:
+            if not isinstance(term, str) or term.startswith('?'):
+                raise ValidationError({self.cursor_query_param: ["This ordering cannot be paginated by cursor."]})
+            terms.append((term.lstrip('-'), term.startswith('-')))
+        if not any(field in ('pk', 'id') for field, _ in terms):
+            terms.append(('pk', False))
+        return terms
+
+    @staticmethod
+    def get_rows_after(ordering: Sequence[OrderingTerm], position: Sequence[Any]) -> models.Q:
+        """
+        Filter to the rows after a position in the ordering.
+
+        Nulls sort after every value, as they do by default in PostgreSQL.
+        """
+        after = models.Q(pk__in=[])
+        equal = models.Q()
+        for (field, descending), value in zip(ordering, position):
+            if value is None:
+                after |= equal & models.Q(**{f"{field}__isnull": False}) if descending else models.Q(pk__in=[])
+                equal &= models.Q(**{f"{field}__isnull": True})
+            else:
+                later = models.Q(**{f"{field}__{'lt' if descending else 'gt'}": value})
+                if not descending:
+                    later |= models.Q(**{f"{field}__isnull": True})
+                after |= equal & later
+                equal &= models.Q(**{field: value})
+        return after
+
+    def get_position(self, row: models.Model) -> List[Any]:
+        """The values of the ordering fields of a row."""
+        position = []
+        for field, _ in self.ordering:
+            value: Any = row
+            for attribute in field.split('__'):
+                value = None if value is None else getattr(value, attribute)
+            if isinstance(value, (date, UUID, Decimal)):
+                value = value.isoformat() if isinstance(value, date) else str(value)
+            position.append(value)
+        return position
+
+    def encode_cursor(self, position: List[Any], reverse: bool) -> str:
+        url = replace_query_param(self.url, self.limit_query_param, self.limit)
+        url = remove_query_param(url, self.offset_query_param)
+        cursor = urlsafe_b64encode(json.dumps({"p": position, "r": reverse}).encode()).decode()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[Optional[List[Any]], bool]:
+        if not cursor:
+            return None, False
+        try:
+            data: Dict[str, Any] = json.loads(urlsafe_b64decode(cursor.encode()))
+            return list(data["p"]), bool(data["r"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound("Invalid cursor.")
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        if self.use_cursor:
+            return None if self.last_position is None else self.encode_cursor(self.last_position, False)
+
+        # The count may be unknown, so whether there is a next page was found from the rows.
+        url = replace_query_param(self.url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.next_offset)
+
+    def get_previous_link(self) -> Optional[str]:
+        if self.use_cursor:
+            if not self.has_previous or self.first_position is None:
+                return None
+            return self.encode_cursor(self.first_position, True)
+        return super().get_previous_link()
+
+    def get_paginated_response(self, data: Any) -> Response:
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        paginated_schema: Dict[str, Any] = super().get_paginated_response_schema(schema)
+        paginated_schema['properties']['count']['nullable'] = True
+        return paginated_schema
+
+    def get_schema_operation_parameters(self, view: APIView) -> List[Dict[str, Any]]:
+        parameters: List[Dict[str, Any]] = super().get_schema_operation_parameters(view)
+        return parameters + [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': "Paginate by cursor rather than offset. Empty for the first page.",
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': "How to count the results: exact, estimate or none.",
+                'schema': {'type': 'string', 'enum': list(self.COUNT_MODES)},
+            },
+        ]
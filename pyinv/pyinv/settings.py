@@ -1,4 +1,5 @@
 import platform
+import re
 from datetime import timedelta
 from pathlib import Path
 
@@ -54,6 +55,7 @@ SECRET_KEY = getattr(configuration, 'SECRET_KEY')
 
 # Set optional parameters
 ADMINS = getattr(configuration, 'ADMINS', [])
+ASSET_EXTRA_DATA_INDEXED_KEYS = getattr(configuration, 'ASSET_EXTRA_DATA_INDEXED_KEYS', ['serial'])
 BASE_PATH = getattr(configuration, 'BASE_PATH', '')
 if BASE_PATH:
     BASE_PATH = BASE_PATH.strip('/') + '/'  # Enforce trailing slash only  # pragma: nocover
@@ -61,6 +63,7 @@ DATE_FORMAT = getattr(configuration, 'DATE_FORMAT', 'N j, Y')
 DATETIME_FORMAT = getattr(configuration, 'DATETIME_FORMAT', 'N j, Y g:i a')
 DEBUG = getattr(configuration, 'DEBUG', False)
 EMAIL = getattr(configuration, 'EMAIL', {})
+NODE_TREE_BACKEND = getattr(configuration, 'NODE_TREE_BACKEND', 'path')
 SHORT_DATE_FORMAT = getattr(configuration, 'SHORT_DATE_FORMAT', 'Y-m-d')
 SHORT_DATETIME_FORMAT = getattr(configuration, 'SHORT_DATETIME_FORMAT', 'Y-m-d H:i')
 SHORT_TIME_FORMAT = getattr(configuration, 'SHORT_TIME_FORMAT', 'H:i:s')
@@ -68,6 +71,17 @@ SYSTEM_TITLE = getattr(configuration, 'SYSTEM_TITLE', 'PyInv')
 TIME_FORMAT = getattr(configuration, 'TIME_FORMAT', 'g:i a')
 TIME_ZONE = getattr(configuration, 'TIME_ZONE', 'UTC')
 
+if NODE_TREE_BACKEND not in ('path', 'closure'):
+    raise ImproperlyConfigured(  # pragma: nocover
+        f"NODE_TREE_BACKEND must be 'path' or 'closure', not {NODE_TREE_BACKEND!r}."
+    )
+
+for key in ASSET_EXTRA_DATA_INDEXED_KEYS:
+    if not re.match(r'^\w+$', key):
+        raise ImproperlyConfigured(  # pragma: nocover
+            f"ASSET_EXTRA_DATA_INDEXED_KEYS must only contain letters, digits and underscores, not {key!r}."
+        )
+
 
 #
 # Database
@@ -228,3 +242,9 @@ SIMPLE_JWT = {
 
 DAMM32_ASSET_CODE_DEFAULT_PREFIX = getattr(configuration, 'DAMM32_ASSET_CODE_DEFAULT_PREFIX', 'INV')
 DAMM32_ASSET_CODE_PREFIXES = getattr(configuration, 'DAMM32_ASSET_CODE_PREFIXES', ['INV'])
+DAMM32_ASSET_CODE_GENERATION = getattr(configuration, 'DAMM32_ASSET_CODE_GENERATION', 'sequence')
+
+if DAMM32_ASSET_CODE_GENERATION not in ('sequence', 'random'):
+    raise ImproperlyConfigured(  # pragma: nocover
+        f"DAMM32_ASSET_CODE_GENERATION must be 'sequence' or 'random', not {DAMM32_ASSET_CODE_GENERATION!r}."
+    )